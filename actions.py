@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
 from copy import copy
+import logging
+
 import logs
 from vectors import Vector
 from actors import Level
@@ -21,6 +23,10 @@ def register_action(klass):
 
 
 class Action:
+
+    attribute = None  # Propiedad del actor que modifica la acción
+    target_level = None  # Nivel al que pasa el actor al empezar la acción
+
     def __init__(self, actor, from_frame, to_frame=None):
         self.actor = actor
         self.lower_bound = from_frame
@@ -41,6 +47,16 @@ class Action:
             self.actor
             )
 
+    @property
+    def closed_form(self):
+        """Indica si el efecto de la acción depende solo del frame.
+
+        Es el caso de las acciones que definen `attribute` o
+        `target_level`: su resultado se calcula con `value_at`
+        sin necesidad de haber ejecutado los pasos anteriores.
+        """
+        return self.attribute is not None or self.target_level is not None
+
     def is_last(self, item):
         if item < self.lower_bound or item > self.upper_bound:
             raise ValueError(
@@ -51,234 +67,217 @@ class Action:
     def get_relative_frame(self, frame):
         return frame - self.lower_bound + 1
 
+    def value_at(self, frame, initial):
+        """Valor de `attribute` tras procesar el frame indicado.
+
+        `initial` es el valor que tenía la propiedad al empezar la
+        acción. El cálculo no depende del estado del actor ni de
+        los frames anteriores.
+        """
+        if frame < self.lower_bound:
+            return initial
+        if frame >= self.upper_bound:
+            return self.final_value(initial)
+        return self.interpolate(frame, initial)
+
+    def interpolate(self, frame, initial):
+        return initial
+
+    def final_value(self, initial):
+        return self.interpolate(self.upper_bound - 1, initial)
+
     def start(self, frame):
-        logger.debug('Action {} stars at frame {}'.format(
-            self.__class__.__name__,
-            frame,
-            ))
+        logger.debug(
+            'Action %s stars at frame %s', type(self).__name__, frame,
+            )
+        if self.target_level is not None:
+            self.actor.level = self.target_level
+        if self.attribute:
+            self.initial = copy(getattr(self.actor, self.attribute))
 
     def end(self, frame):
-        logger.debug('Action {} ends at frame {}'.format(
-            self.__class__.__name__,
-            frame,
-            ))
+        logger.debug(
+            'Action %s ends at frame %s', type(self).__name__, frame,
+            )
+        if self.attribute:
+            setattr(self.actor, self.attribute, self.final_value(self.initial))
 
     def step(self, frame):
-        logger.debug('Action {} called for frame {}'.format(
-            self.__class__.__name__,
-            frame,
-            ))
+        logger.debug(
+            'Action %s called for frame %s', type(self).__name__, frame,
+            )
+        if self.attribute:
+            setattr(
+                self.actor,
+                self.attribute,
+                self.value_at(frame, self.initial),
+                )
 
 
 @register_action
 class Blink(Action):
 
-    def start(self, frame):
-        self.src_color = self.actor.color
-        self.inv_color = self.actor.color.inverse()
+    attribute = 'color'
 
-    def step(self, frame):
-        self.actor.color = self.src_color if frame % 2 else self.inv_color
+    def interpolate(self, frame, initial):
+        return initial if frame % 2 else initial.inverse()
 
-    def end(self, frame):
-        self.actor.color = self.src_color
+    def final_value(self, initial):
+        return initial
 
 
 @register_action
 class Colorize(Action):
 
+    attribute = 'color'
+
     def __init__(self, actor, from_frame, to_frame, new_color):
         super().__init__(actor, from_frame, to_frame)
         if isinstance(new_color, str):
             new_color = colors.Color(new_color)
         self.new_color = new_color
 
-    def start(self, frame):
-        logger.info('Action {} start method called on frame {}'.format(
-            self, frame
-            ))
-        self.original_color = copy(self.actor.color)
-        self.delta_r = self.new_color.red - self.original_color.red
-        self.delta_g = self.new_color.g - self.original_color.g
-        self.delta_b = self.new_color.b - self.original_color.b
-
-    def step(self, frame):
-        logger.info('Action {} step method called on frame {}'.format(
-            self, frame
-            ))
+    def interpolate(self, frame, initial):
+        logger.info(
+            'Action %s interpolate method called on frame %s', self, frame,
+            )
         t = self.get_relative_frame(frame)
-        _inc_r = int(round(self.delta_r * t / self.num_steps))
-        self.actor.color.red = self.original_color.red + _inc_r
-        _inc_g = int(round(self.delta_g * t / self.num_steps))
-        self.actor.color.g = self.original_color.g + _inc_g
-        _inc_b = int(round(self.delta_b * t / self.num_steps))
-        self.actor.color.b = self.original_color.b + _inc_b
+        delta_r = self.new_color.red - initial.red
+        delta_g = self.new_color.g - initial.g
+        delta_b = self.new_color.b - initial.b
+        return colors.Color(
+            initial.red + int(round(delta_r * t / self.num_steps)),
+            initial.g + int(round(delta_g * t / self.num_steps)),
+            initial.b + int(round(delta_b * t / self.num_steps)),
+            )
 
-    def end(self, frame):
-        self.actor.color = self.new_color
+    def final_value(self, initial):
+        return copy(self.new_color)
 
 
 @register_action
 class FadeOut(Action):
 
-    def __init__(self, actor, from_frame, to_frame):
-        super().__init__(actor, from_frame, to_frame)
-        self.initial_alpha = self.actor.alpha
-        self.delta_alpha = self.initial_alpha / self.num_steps
+    attribute = 'alpha'
 
-    def step(self, frame):
-        self.actor.alpha -= self.delta_alpha
+    def interpolate(self, frame, initial):
+        t = self.get_relative_frame(frame) / self.num_steps
+        return initial * (1.0 - t)
 
-    def end(self, frame):
-        self.actor.alpha = 0.0
+    def final_value(self, initial):
+        return 0.0
 
 
 @register_action
 class FadeIn(Action):
 
-    def __init__(self, actor, from_frame, to_frame):
-        super().__init__(actor, from_frame, to_frame)
-        self.delta_alpha = 1.0 / self.num_steps
-
-    def star(self, frame):
-        self.actor.alpha = 0.0
+    attribute = 'alpha'
 
-    def step(self, frame):
-        self.actor.alpha += self.delta_alpha
+    def interpolate(self, frame, initial):
+        # Suma 1/num_steps por frame, partiendo del alfa que tenga
+        t = self.get_relative_frame(frame) / self.num_steps
+        return min(initial + t, 1.0)
 
-    def end(self, frame):
-        self.actor.alpha = 1.0
+    def final_value(self, initial):
+        return 1.0
 
 
 @register_action
 class Exit(Action):
 
-    def start(self, frame):
-        self.actor.level = Level.OFF_STAGE
+    target_level = Level.OFF_STAGE
 
 
 @register_action
 class Background(Action):
 
-    def start(self, frame):
-        self.actor.level = Level.ON_BACKGROUND
+    target_level = Level.ON_BACKGROUND
 
 
 @register_action
 class Foreground(Action):
 
-    def start(self, frame):
-        self.actor.level = Level.ON_FOREGROUND
+    target_level = Level.ON_FOREGROUND
 
 
 class MoveAction(Action):
 
+    attribute = 'pos'
+
     def __init__(self, actor, from_frame, to_frame, new_position):
         super().__init__(actor, from_frame, to_frame)
         self.new_position = Vector(new_position)
 
-    def start(self, frame):
-        super().start(frame)
-        self.initial_position = copy(self.actor.pos)
-        self.change_value = self.new_position - self.initial_position
+    def ease(self, t):
+        """Fracción del recorrido realizada en el instante t (de 0 a 1).
+        """
+        return t
+
+    def interpolate(self, frame, initial):
+        t = self.get_relative_frame(frame) / self.num_steps
+        k = self.ease(t)
+        return Vector(
+            (self.new_position.x - initial.x) * k + initial.x,
+            (self.new_position.y - initial.y) * k + initial.y,
+            )
 
-    def end(self, frame):
-        self.actor.pos = self.new_position
+    def final_value(self, initial):
+        return self.new_position
 
 
 @register_action
 class Enter(MoveAction):
 
-    def step(self, frame):
-        self.actor.pos = self.new_position
-        self.actor.level = Level.ON_STAGE
+    target_level = Level.ON_STAGE
+
+    def interpolate(self, frame, initial):
+        return self.new_position
 
 
 @register_action
 class Move(MoveAction):
-
-    def start(self, frame):
-        super().start(frame)
-        self.delta = self.change_value / self.num_steps
-
-    def step(self, frame):
-        super().step(frame)
-        t = self.get_relative_frame(frame)
-        self.actor.pos = self.initial_position + self.delta * t
+    pass
 
 
 @register_action
 class Fall(MoveAction):
 
-    def step(self, frame):
-        logger.info('Fall {} step({})'.format(self.actor, frame))
-        relative_frame = self.get_relative_frame(frame)
-        t = relative_frame / self.num_steps
-        self.actor.pos = Vector(
-            self.change_value.x * t**2 + self.initial_position.x,
-            self.change_value.y * t**2 + self.initial_position.y,
-            )
+    def ease(self, t):
+        return t**2
 
 
 @register_action
 class Land(MoveAction):
 
-    def step(self, frame):
-        relative_frame = self.get_relative_frame(frame)
-        t = relative_frame / self.num_steps
-        self.actor.pos = Vector(
-            -self.change_value.x * t * (t-2) + self.initial_position.x,
-            -self.change_value.y * t * (t-2) + self.initial_position.y,
-            )
+    def ease(self, t):
+        return -t * (t-2)
 
 
 @register_action
 class EaseIn(MoveAction):
 
-    def step(self, frame):
-        logger.info('EasingIn {} step({})'.format(self.actor, frame))
-        relative_frame = self.get_relative_frame(frame)
-        t = relative_frame / self.num_steps
-        self.actor.pos = Vector(
-            self.change_value.x * t**3 + self.initial_position.x,
-            self.change_value.y * t**3 + self.initial_position.y,
-            )
+    def ease(self, t):
+        return t**3
 
 
 @register_action
 class EaseOut(MoveAction):
 
-    def step(self, frame):
-        logger.info('EasingIn {} step({})'.format(self.actor, frame))
-        relative_frame = self.get_relative_frame(frame)
-        t = relative_frame / self.num_steps
+    def ease(self, t):
         t -= 1
-        ipx, ipy = self.initial_position
-        self.actor.pos = Vector(
-            self.change_value.x * (t**3 + 1) + ipx,
-            self.change_value.y * (t**3 + 1) + ipy,
-            )
+        return t**3 + 1
 
 
 @register_action
 class Swing(MoveAction):
 
-    def step(self, frame):
-        logger.info('EasingIn {} step({})'.format(self.actor, frame))
-        relative_frame = self.get_relative_frame(frame)
-        t = relative_frame / (self.num_steps / 2)
-        ipx, ipy = self.initial_position
+    def ease(self, t):
+        t *= 2
         if t < 1:
-            self.actor.pos = Vector(
-                self.change_value.x / 2 * t**3 + ipx,
-                self.change_value.y / 2 * t**3 + ipy,
-                )
+            return t**3 / 2
         else:
             t -= 2
-            self.actor.pos = Vector(
-                self.change_value.x / 2 * (t**3 + 2) + ipx,
-                self.change_value.y / 2 * (t**3 + 2) + ipy,
-                )
+            return (t**3 + 2) / 2
 
 
 @register_action
@@ -286,11 +285,10 @@ class Timer(Action):
 
     FPS = 25
 
-    def start(self, frame):
-        self.actor.text = '00:00.00'
+    attribute = 'text'
 
-    def step(self, frame):
-        self.actor.text = '{mins:02d}:{secs:02d}.{frac:02d}'.format(
+    def interpolate(self, frame, initial):
+        return '{mins:02d}:{secs:02d}.{frac:02d}'.format(
             mins=frame // (60*Timer.FPS),  # 60 s/frame * 25 frame/s
             secs=frame // Timer.FPS,
             frac=frame % Timer.FPS,
@@ -300,16 +298,17 @@ class Timer(Action):
 def create_action(action_name, actor, from_frame, to_frame, *args):
     global _map_actions
 
-    buff = ['called create_action("{}", {}, {}, {}'.format(
-        action_name,
-        actor,
-        from_frame,
-        to_frame,
-        )]
-    for _ in args:
-        buff.append(', {}'.format(_))
-    buff.append(')')
-    logger.info(''.join(buff))
+    if logger.isEnabledFor(logging.INFO):
+        buff = ['called create_action("{}", {}, {}, {}'.format(
+            action_name,
+            actor,
+            from_frame,
+            to_frame,
+            )]
+        for _ in args:
+            buff.append(', {}'.format(_))
+        buff.append(')')
+        logger.info(''.join(buff))
 
     key = action_name.lower()
     if key not in _map_actions:
@@ -322,16 +321,12 @@ def create_action(action_name, actor, from_frame, to_frame, *args):
 @register_action
 class Arrow(Action):
 
+    attribute = 'pos'
+    target_level = Level.ON_STAGE
+
     def __init__(self, actor, from_frame, to_frame, target_position):
         super().__init__(actor, from_frame, to_frame)
         self.target_position = Vector(target_position)
 
-    def start(self, frame):
-        super().start(frame)
-        self.initial_position = copy(self.actor.pos)
-        self.change_value = self.target_position - self.initial_position
-        self.delta = self.change_value / self.num_steps
-
-    def step(self, frame):
-        self.actor.pos = self.new_position
-        self.actor.level = Level.ON_STAGE
+    def interpolate(self, frame, initial):
+        return self.target_position
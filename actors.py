@@ -1,13 +1,16 @@
 #!/usr/bni/env python3
 
 import math
+import logging
+from copy import copy
 
-from vectors import Vector, zero
+from vectors import Vector
 import colors
 from colors import Color, white
 import logs
 from enum import IntEnum
 import fileutils
+from spatial import UNBOUNDED, EMPTY, union, centered
 
 logger = logs.create(__name__)
 
@@ -21,6 +24,12 @@ class Level(IntEnum):
 
 class Actor():
 
+    dirty = True  # Ha cambiado desde la última vez que se dibujó
+    parent = None
+    _level = None
+    _bounds = None
+    stages = ()  # Escenarios en los que está, para avisarles
+
     def _save_state(self, **kwargs):
         result = {
             'pos': self._pos,
@@ -36,21 +45,22 @@ class Actor():
 
     def _load_state(self, state):
         for k in state:
-            setattr(self, k, state[k])
+            setattr(self, k, copy(state[k]))
 
     def __init__(self, name, **kwargs):
         self.name = name
         self.level = Level.ON_STAGE if 'pos' in kwargs else Level.OFF_STAGE
-        self._pos = kwargs.pop('pos', zero)
+        self._pos = kwargs.pop('pos', None) or Vector(0, 0)
         if isinstance(self._pos, tuple):
             self._pos = Vector(self.pos[0], self.pos[1])
         self._color = kwargs.pop('color', Color('silver'))
         if isinstance(self._color, str):
             self._color = Color(self.color)
-        self.scale = kwargs.pop('scale', Vector(1, 1))
+        self._scale = kwargs.pop('scale', None) or Vector(1, 1)
         self._alpha = kwargs.pop('alpha', 1.0)
         self.sons = []
         self.parent = None
+        self._world_pos = None
         self.debug = False
         self.initial_state = self._save_state()
         self.reset()
@@ -61,11 +71,58 @@ class Actor():
         for son in self.sons:
             son.reset()
 
+    def snapshot(self):
+        """Copia del estado actual del actor y de sus hijos.
+        """
+        state = self._save_state()
+        return {
+            'state': {k: copy(state[k]) for k in state},
+            'sons': [son.snapshot() for son in self.sons],
+            }
+
+    def restore(self, snapshot):
+        """Recupera un estado obtenido previamente con `snapshot`.
+        """
+        self._load_state(snapshot['state'])
+        for son, son_snapshot in zip(self.sons, snapshot['sons']):
+            son.restore(son_snapshot)
+
+    def mark_dirty(self):
+        """Indica que hay que volver a dibujar el actor.
+
+        Lo llaman los setters de las propiedades animadas. La marca se
+        propaga a los ancestros, porque el escenario solo sigue a los
+        actores de primer nivel.
+        """
+        self.dirty = True
+        if self.parent:
+            self.parent.mark_dirty()
+
+    def clean(self):
+        """Marca el actor y sus hijos como ya dibujados.
+        """
+        self.dirty = False
+        for son in self.sons:
+            son.clean()
+
+    def get_level(self):
+        return self._level
+
+    def set_level(self, level):
+        if level != self._level:
+            for stage in self.stages:
+                stage.level_changed(self)
+        self._level = level
+        self.mark_dirty()
+
+    level = property(get_level, set_level)
+
     def get_pos(self):
         return self._pos
 
     def set_alpha(self, alpha):
         self._alpha = alpha
+        self.mark_dirty()
 
     def get_alpha(self):
         return self._alpha
@@ -76,9 +133,21 @@ class Actor():
         if isinstance(new_pos, tuple):
             new_pos = Vector(new_pos[0], new_pos[1])
         self._pos = new_pos
+        self._invalidate_world_pos()
+        self.invalidate_bounds()
+        self.mark_dirty()
 
     pos = property(get_pos, set_pos)
 
+    def get_scale(self):
+        return self._scale
+
+    def set_scale(self, scale):
+        self._scale = scale
+        self.invalidate_bounds()
+
+    scale = property(get_scale, set_scale)
+
     def get_color(self):
         return self._color
 
@@ -86,18 +155,80 @@ class Actor():
         if isinstance(new_color, str):
             new_color = Color(new_color)
         self._color = new_color
+        self.mark_dirty()
 
     color = property(get_color, set_color)
 
     def get_offset(self):
         if self.parent:
-            return self.parent.get_offset() + self.parent.pos
+            return self.parent.get_world_pos()
         else:
-            return zero
+            return Vector(0, 0)
+
+    def get_world_pos(self):
+        """Posición absoluta del actor (la suya más la de sus ancestros).
+
+        Se guarda en caché hasta que cambie la posición del actor o la
+        de alguno de sus ancestros. El vector devuelto es compartido:
+        no se debe modificar.
+        """
+        if self._world_pos is None:
+            self._world_pos = self._pos + self.get_offset()
+        return self._world_pos
+
+    def _invalidate_world_pos(self):
+        if self._world_pos is not None:
+            self._world_pos = None
+            for son in self.sons:
+                son._invalidate_world_pos()
+
+    def get_own_bounds(self):
+        """Rectángulo que ocupa lo que dibuja el actor, sin sus hijos.
+
+        Las subclases que no lo definen ocupan todo (`UNBOUNDED`), y
+        nunca se recortan.
+        """
+        return UNBOUNDED
+
+    def get_bounds(self):
+        """Rectángulo (izquierda, arriba, derecha, abajo) que ocupa el
+        actor con sus hijos.
+
+        Es una estimación por exceso, para poder descartar sin miedo
+        los actores que quedan fuera de la pantalla. Se guarda en caché
+        hasta que cambie la posición, la escala o el texto del actor o
+        de alguno de sus hijos.
+        """
+        if self._bounds is None:
+            bounds = self.get_own_bounds()
+            for son in self.sons:
+                bounds = union(bounds, son.get_bounds())
+            self._bounds = bounds
+        return self._bounds
+
+    def invalidate_bounds(self):
+        """Descarta el rectángulo guardado del actor, de sus hijos y
+        de sus ancestros.
+
+        Hay que llamarlo a mano si se cambian atributos que afectan al
+        tamaño y que no lo hacen solos (`width`, `radius`...).
+        """
+        self._clear_bounds()
+        parent = self.parent
+        while parent is not None and parent._bounds is not None:
+            parent._bounds = None
+            parent = parent.parent
+
+    def _clear_bounds(self):
+        self._bounds = None
+        for son in self.sons:
+            son._clear_bounds()
 
     def add_son(self, actor):
         actor.parent = self
+        actor._invalidate_world_pos()
         self.sons.append(actor)
+        self.invalidate_bounds()
 
     def __repr__(self):
         return '{}("{}", pos={}, color="{}")'.format(
@@ -130,7 +261,7 @@ class Actor():
             )
 
     def spot_center(self, engine):
-        pos = self.get_offset() + self.pos
+        pos = self.get_world_pos()
         engine.line(pos.x, pos.y-15, pos.x, pos.y+15, color='red')
         engine.line(pos.x-15, pos.y, pos.x+15, pos.y, color='red')
         engine.polygon(pos.x, pos.y-5, [
@@ -144,8 +275,12 @@ class Square(Actor):
         super().__init__(name, **kwargs)
         self.width = self.height = side
 
+    def get_own_bounds(self):
+        pos = self.get_world_pos()
+        return centered(pos.x, pos.y, self.width, self.height)
+
     def draw(self, engine):
-        pos = self.pos + self.get_offset()
+        pos = self.get_world_pos()
         x = pos.x - self.width / 2
         y = pos.y - self.height / 2
         engine.rect(
@@ -171,8 +306,12 @@ class Box(Actor):
             self.height,
             )
 
+    def get_own_bounds(self):
+        pos = self.get_world_pos()  # Más el grosor del borde
+        return centered(pos.x, pos.y, self.width + 4, self.height + 4)
+
     def draw(self, engine):
-        pos = self.pos + self.get_offset()
+        pos = self.get_world_pos()
         x = pos.x - self.width / 2
         y = pos.y - self.height / 2
         engine.box(
@@ -198,8 +337,12 @@ class Rect(Actor):
             self.height,
             )
 
+    def get_own_bounds(self):
+        pos = self.get_world_pos()
+        return centered(pos.x, pos.y, self.width, self.height)
+
     def draw(self, engine):
-        pos = self.pos + self.get_offset()
+        pos = self.get_world_pos()
         x = pos.x - self.width / 2
         y = pos.y - self.height / 2
         engine.rect(
@@ -215,8 +358,13 @@ class Circle(Actor):
         super().__init__(name, **kwargs)
         self.radius = radius
 
+    def get_own_bounds(self):
+        pos = self.get_world_pos()
+        side = 2 * self.radius + 2
+        return centered(pos.x, pos.y, side, side)
+
     def draw(self, engine):
-        pos = self.pos + self.get_offset()
+        pos = self.get_world_pos()
         engine.circle(
             pos.x, pos.y, self.radius,
             color=self.color,
@@ -229,11 +377,16 @@ class Path(Actor):
     def __init__(self, name, points=None, **kwargs):
         super().__init__(name, **kwargs)
         self.points = points[:]
-        total = zero
+        total = Vector(0, 0)
         for p in points:
             total += p
         self.centroid = total / len(points)
 
+    def get_own_bounds(self):
+        xs = [p.x for p in self.points]
+        ys = [p.y for p in self.points]
+        return (min(xs), min(ys), max(xs) + 1, max(ys) + 1)
+
     def draw(self, engine):
         p1 = self.points[0]
         for p2 in self.points[1:]:
@@ -249,15 +402,32 @@ class Polygon(Actor):
 
     def __init__(self, name, points=None, **kwargs):
         super().__init__(name, **kwargs)
-        acc = total = zero
+        acc = total = Vector(0, 0)
         for p in points:
             acc += p
             total += acc
         self.centroid = total / (len(points) + 1)
         self.points = points or []
+        # Extremos de los vértices respecto al primero
+        x = y = left = top = right = bottom = 0
+        for p in self.points:
+            x += p[0]
+            y += p[1]
+            left = min(left, x)
+            right = max(right, x)
+            top = min(top, y)
+            bottom = max(bottom, y)
+        self.extent = (left, top, right + 1, bottom + 1)
+
+    def get_own_bounds(self):
+        pos = self.get_world_pos()
+        x = pos.x - self.centroid.x
+        y = pos.y - self.centroid.y
+        left, top, right, bottom = self.extent
+        return (x + left, y + top, x + right, y + bottom)
 
     def draw(self, engine):
-        pos = self.pos + self.get_offset() - self.centroid
+        pos = self.get_world_pos() - self.centroid
         engine.polygon(
             pos.x, pos.y, self.points,
             color=self.color,
@@ -312,8 +482,12 @@ class RoundRect(Actor):
         else:
             self.radius = int(round(min(self.width, self.height) // 12))
 
+    def get_own_bounds(self):
+        pos = self.get_world_pos()
+        return centered(pos.x, pos.y, self.width, self.height)
+
     def draw(self, engine):
-        pos = self.pos + self.get_offset()
+        pos = self.get_world_pos()
         x = pos.x - self.width / 2
         y = pos.y - self.height / 2
         engine.roundrect(
@@ -342,7 +516,7 @@ class Dice(RoundRect):
         y = self.height // 4
         default_dot_radius = self.width // 10
         if num == 1:
-            self.add_dot(zero, r=2*default_dot_radius)
+            self.add_dot(Vector(0, 0), r=2*default_dot_radius)
         elif num == 2:
             self.add_dot(Vector(0, -y))
             self.add_dot(Vector(0, y))
@@ -389,13 +563,26 @@ class Dice(RoundRect):
 class Text(Actor):
 
     def __init__(self, name, text='', **kwargs):
-        self.text = text or name
+        self._text = text or name
         self.font_size = kwargs.pop('fontsize', 32)
         scale = 90/72.  # 90dpi / 72 points in one inch
         self.height = self.font_size * scale
         self.width = len(text) * self.height / 2.0
         super().__init__(name, **kwargs)
 
+    def _save_state(self, **kwargs):
+        return super()._save_state(text=self.text, **kwargs)
+
+    def get_text(self):
+        return self._text
+
+    def set_text(self, text):
+        self._text = text
+        self.invalidate_bounds()
+        self.mark_dirty()
+
+    text = property(get_text, set_text)
+
     def __str__(self):
         return 'Actor {} as Text [text:"{}"|font_size:{}]'.format(
             self.name,
@@ -403,9 +590,20 @@ class Text(Actor):
             self.font_size,
             )
 
+    def get_own_bounds(self):
+        # Sin medir el texto con una fuente concreta: ningún carácter
+        # ocupa más de un cuadratín de ancho ni dos de alto
+        pos = self.get_world_pos()
+        width = len(self.text) * self.font_size
+        height = 2 * self.font_size
+        if self.debug:
+            width = max(width, 61)
+            height = max(height, 61)
+        return centered(pos.x, pos.y, width, height)
+
     def draw(self, engine):
-        logger.info('Text.draw method called'.format(self.name))
-        pos = self.pos + self.get_offset()
+        logger.info('Text.draw method called for %s', self.name)
+        pos = self.get_world_pos()
         x = pos.x
         y = pos.y
         if self.debug:
@@ -426,6 +624,14 @@ class Bitmap(Actor):
         self.width, self.height = fileutils.get_image_size(filename)
         self.filename = filename
 
+    def get_own_bounds(self):
+        # Como en draw, en su posición propia; más las marcas de 20
+        # pixels que añade PyGame alrededor del centro
+        return centered(
+            self.pos.x, self.pos.y,
+            max(self.width, 40) + 1, max(self.height, 40) + 1,
+            )
+
     def draw(self, engine):
         engine.bitmap(
             self.pos.x, self.pos.y,
@@ -456,10 +662,15 @@ class Label(Actor):
             color=self._background,
             pos=(0, 0),
             )
-        super().__init__(name, **kwargs)
+        background = self._background
+        super().__init__(name, color=color, **kwargs)
+        self._frame.color = self._background = background
         self.add_son(self._frame)
         self.add_son(self._text)
 
+    def _save_state(self, **kwargs):
+        return super()._save_state(text=self.text, **kwargs)
+
     def set_text(self, text):
         self._text.text = text
 
@@ -489,6 +700,9 @@ class Label(Actor):
 
     color = property(get_color, set_color)
 
+    def get_own_bounds(self):
+        return EMPTY  # Lo que dibuja son sus hijos
+
     def draw(self, engine):
         self._frame.draw(engine)
         self._text.draw(engine)
@@ -496,10 +710,11 @@ class Label(Actor):
 
 def create_actor(name, role, **kwargs):
     import actors
-    buff = ['called create_actor({}, {}'.format(name, role)]
-    for k in kwargs:
-        buff.append(', {}={}'.format(k, repr(kwargs[k])))
-    buff.append(')')
-    logger.info(''.join(buff))
+    if logger.isEnabledFor(logging.INFO):
+        buff = ['called create_actor({}, {}'.format(name, role)]
+        for k in kwargs:
+            buff.append(', {}={}'.format(k, repr(kwargs[k])))
+        buff.append(')')
+        logger.info(''.join(buff))
     _Klass = getattr(actors, role)
     return _Klass(name, **kwargs)
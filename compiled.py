@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Scripts compilados: lo que deja el parser, guardado en JSON.
+
+El compilado está al lado del script y puede venir de cualquier sitio,
+así que solo se guardan datos (nunca pickle) y al leerlo se comprueba
+todo antes de crear ningún actor: si algo no encaja se ignora y se
+vuelve a parsear el script.
+"""
+
+import os
+import json
+import hashlib
+
+from vectors import Vector
+from colors import Color
+import language
+import fastparse
+import logs
+
+logger = logs.create(__name__)
+
+EXTENSION = '.grafelc'
+
+# Analizadores de scripts, por nombre. Dejan lo mismo en `language`
+PARSERS = {
+    'fast': fastparse.parse,
+    'pyparsing': language.parse,
+    }
+
+
+def get_compiled_filename(filename):
+    """Fichero en el que se guarda el script compilado (al lado).
+    """
+    return os.path.splitext(filename)[0] + EXTENSION
+
+
+def get_key(source):
+    """Clave del compilado: versión de la gramática y hash del fuente.
+    """
+    return '{}:{}'.format(
+        language.GRAMMAR_VERSION,
+        hashlib.sha256(source.encode('utf-8')).hexdigest(),
+        )
+
+
+def encode(value):
+    """Valor de un parámetro o acción, en tipos de JSON.
+    """
+    if isinstance(value, Vector):
+        return {'vector': [value.x, value.y]}
+    if isinstance(value, Color):
+        return {'color': str(value)}
+    if isinstance(value, list):
+        return [encode(_) for _ in value]
+    return value
+
+
+def decode(value):
+    """Valor de un parámetro o acción guardado con `encode`.
+    """
+    if isinstance(value, dict):
+        if list(value) == ['vector']:
+            x, y = value['vector']
+            return Vector(float(x), float(y))
+        if list(value) == ['color']:
+            return Color(str(value['color']))
+    elif isinstance(value, list):
+        return [decode(_) for _ in value]
+    elif isinstance(value, (int, float, str)):
+        return value
+    raise ValueError('Valor no válido: {!r}'.format(value))
+
+
+def check_name(name):
+    if not (isinstance(name, str) and fastparse.IDENTIFIER.fullmatch(name)):
+        raise ValueError('Nombre no válido: {!r}'.format(name))
+    return name
+
+
+def decode_cast(cast):
+    """Líneas del reparto (nombre, rol, parámetros) del compilado.
+
+    Los parámetros se devuelven como los deja el parser: nombre y
+    valor, alternados.
+    """
+    roles = language.ROLES.split()
+    result = []
+    for name, role, options in cast:
+        if role not in roles:
+            raise ValueError('Rol no válido: {!r}'.format(role))
+        params = []
+        for option, value in options.items():
+            if option not in fastparse.ATTRS:
+                raise ValueError('Atributo no válido: {!r}'.format(option))
+            params.extend((option, decode(value)))
+        result.append((check_name(name), role, params))
+    return result
+
+
+def decode_actions(action_lines):
+    result = []
+    for interval, action_name, actor_name, *args in action_lines:
+        from_frame, to_frame = interval
+        if action_name not in fastparse.ACTIONS:
+            raise ValueError('Acción no válida: {!r}'.format(action_name))
+        if len(args) != (fastparse.ACTIONS[action_name] is not None):
+            raise ValueError('Argumentos no válidos: {!r}'.format(args))
+        interval = (int(from_frame), int(to_frame))
+        result.append(
+            (interval, action_name, check_name(actor_name))
+            + tuple(decode(_) for _ in args)
+            )
+    return result
+
+
+def read(filename, key):
+    """Escena compilada guardada en el fichero.
+
+    Devuelve el reparto y las acciones, o `None` si no existe, no se
+    puede leer, no es válida o corresponde a otra versión del fuente
+    o de la gramática.
+    """
+    try:
+        with open(filename, encoding='utf-8') as f:
+            scene = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as err:
+        logger.warning('No se puede leer %s: %s', filename, err)
+        return None
+    if not isinstance(scene, dict) or scene.get('key') != key:
+        logger.info('%s no corresponde al fuente actual', filename)
+        return None
+    try:
+        return decode_cast(scene['cast']), decode_actions(scene['actions'])
+    except (AttributeError, KeyError, TypeError, ValueError) as err:
+        logger.warning('%s no es válido: %s', filename, err)
+        return None
+
+
+def write(filename, scene):
+    """Guarda la escena compilada.
+
+    Se escribe primero en un temporal, para que otro proceso nunca
+    lea un fichero a medias. Si no se puede guardar (por ejemplo, en
+    un directorio de solo lectura) se sigue sin compilado.
+    """
+    tmp_filename = '{}.{}.tmp'.format(filename, os.getpid())
+    try:
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(scene, f)
+        os.replace(tmp_filename, filename)
+    except OSError as err:
+        logger.warning('No se puede guardar %s: %s', filename, err)
+        if os.path.exists(tmp_filename):
+            os.remove(tmp_filename)
+
+
+def load(filename, cache=True, parser='fast'):
+    """Analiza el script y deja sus actores y acciones en `language`.
+
+    `parser` es el nombre del analizador a usar, de `PARSERS`. Con
+    `cache`, si hay un compilado del mismo fuente y versión de la
+    gramática se carga directamente; si no, se parsea el script y se
+    guarda el compilado para la próxima vez. Devuelve `True` si se ha
+    usado el compilado.
+    """
+    with open(filename, encoding='utf-8') as f:
+        source = f.read()
+    compiled_filename = get_compiled_filename(filename)
+    key = get_key(source)
+    if cache:
+        scene = read(compiled_filename, key)
+        if scene is not None:
+            language.load_compiled(*scene)
+            return True
+    PARSERS[parser](source)
+    if cache:
+        write(compiled_filename, {
+            'key': key,
+            'cast': [
+                (name, role, {k: encode(v) for k, v in options.items()})
+                for name, role, options in language.get_cast()
+                ],
+            'actions': [encode(list(_)) for _ in language.get_actions()],
+            })
+    return False
@@ -42,6 +42,94 @@ options_parser.add_argument(
     default='./tmp'
     )
 
+options_parser.add_argument(
+    "--jobs", help="Número de procesos para exportar frames en paralelo",
+    default=defaults.JOBS, type=int,
+    )
+
+options_parser.add_argument(
+    "--checkpoint-interval",
+    help="Frames entre cada checkpoint del estado de la animación (solo"
+         " si alguna acción no admite evaluación directa)",
+    default=defaults.CHECKPOINT_INTERVAL, type=int,
+    )
+
+options_parser.add_argument(
+    "--incremental",
+    help="Redibujar solo las zonas de la pantalla que cambian (PyGame)",
+    action='store_true',
+    )
+
+options_parser.add_argument(
+    "--no-cache",
+    help="No usar ni guardar el script compilado (.grafelc)",
+    dest='cache', default=defaults.CACHE, action='store_false',
+    )
+
+options_parser.add_argument(
+    "--parser",
+    help="Analizador de los scripts: fast (el propio) o pyparsing (el"
+         " de referencia, más lento)",
+    default=defaults.PARSER, choices=['fast', 'pyparsing'],
+    )
+
+options_parser.add_argument(
+    "--vectorized",
+    help="Calcular con numpy el estado de la animación al saltar a un"
+         " frame (por ejemplo, al exportar en paralelo)",
+    default=defaults.VECTORIZED, action='store_true',
+    )
+
+options_parser.add_argument(
+    "--no-culling",
+    help="Dibujar también los actores que quedan fuera de la pantalla",
+    dest='culling', default=defaults.CULLING, action='store_false',
+    )
+
+options_parser.add_argument(
+    "--pacing",
+    help="Ritmo de PyGame: realtime (según los fps), uncapped (lo más"
+         " rápido posible) o fixed (según los fps, saltando frames si"
+         " no da tiempo)",
+    default=defaults.PACING, choices=['realtime', 'uncapped', 'fixed'],
+    )
+
+options_parser.add_argument(
+    "--link-images",
+    help="En SVG, enlazar las imágenes en vez de incrustarlas en cada frame",
+    default=defaults.LINK_IMAGES, action='store_true',
+    )
+
+options_parser.add_argument(
+    "--svg-engine",
+    help="Motor SVG: svgwrite, o stream para escribir directamente",
+    default=defaults.SVG_ENGINE, choices=['svgwrite', 'stream'],
+    )
+
+options_parser.add_argument(
+    "--movie", help="Fichero de vídeo a generar (out.mp4 por defecto)",
+    default=defaults.MOVIE,
+    )
+
+options_parser.add_argument(
+    "--encoder",
+    help="Codificador de vídeo (ffmpeg o avconv, el que se encuentre)",
+    default=None,
+    )
+
+options_parser.add_argument(
+    "--profile",
+    help="Medir tiempos de dibujo, primitivas y acciones, y guardarlos"
+         " en este fichero",
+    default=None,
+    )
+
+options_parser.add_argument(
+    "--profile-format",
+    help="Formato del perfil: json (resumen) o trace (traza de Chrome)",
+    default=defaults.PROFILE_FORMAT, choices=['json', 'trace'],
+    )
+
 
 def get_options():
     global options_parser
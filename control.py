@@ -1,43 +1,300 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 #
-# test_actors.py
+# control.py
+
+import pickle
+import heapq
+from copy import copy
+
+import logs
+
+logger = logs.create(__name__)
+
+
+def evaluate_track(track, initials, base, frame):
+    """Valor de una propiedad tras procesar el frame indicado.
+
+    `track` son las acciones que modifican la propiedad, en el
+    orden en que empiezan. El valor lo fija la última de ellas que
+    esté en curso en ese frame; si no hay ninguna, se mantiene el
+    del último frame en el que terminó alguna.
+    """
+    writer = None
+    last_end = None
+    for action in track:
+        if action.lower_bound <= frame <= action.upper_bound:
+            writer = action
+        elif action.upper_bound < frame:
+            if last_end is None or action.upper_bound > last_end:
+                last_end = action.upper_bound
+    if writer:
+        return writer.value_at(frame, initials[writer])
+    if last_end is None:
+        return base
+    return evaluate_track(track, initials, base, last_end)
+
 
 class Scheduler():
 
-    def __init__(self):
+    profiler = None  # Si se asigna, se mide el tiempo de cada step
+
+    def __init__(self, checkpoint_interval=None, vectorized=False):
         self.actions = {}
         self.actors = set()
+        self.starts = {}  # Acciones que empiezan en cada frame
         self.active_actions = []
+        self.ends = []  # Heap (frame final, posición, acción) de las activas
         self.frame = 0
+        self.timeline = []  # Todas las acciones, en orden de inserción
+        self.positions = {}  # Posición de cada acción en timeline
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = {}
+        self.tracks = None
+        self.closed_form = None  # Ver `is_closed_form`
+        self.vectorized = vectorized  # `jump` con `VectorizedTimeline`
+        self.timeline_evaluator = None
 
     def reset(self):
         for actor in self.actors:
             actor.reset()
-        self.active_actions = []
+        self.set_active_actions([])
         self.frame = 0
 
+    def set_active_actions(self, active_actions):
+        self.active_actions = active_actions
+        self.ends = [
+            (action.upper_bound, self.positions[action], action)
+            for action in active_actions
+            ]
+        heapq.heapify(self.ends)
+
     def add_action(self, action):
         start_frame = action.lower_bound
         self.actors.add(action.actor)
         key = (action.actor.name, start_frame)
         self.actions.setdefault(key, []).append(action)
+        self.starts.setdefault(start_frame, []).append(action)
+        self.positions[action] = len(self.timeline)
+        self.timeline.append(action)
+        self.checkpoints = {}  # Ya no son válidos
+        self.tracks = None
+        self.closed_form = None
+        self.timeline_evaluator = None
+
+    def compile(self):
+        """Prepara la evaluación directa de la línea de tiempo.
+
+        Agrupa las acciones de cada actor según la propiedad que
+        modifican y calcula el valor inicial con el que empieza
+        cada una, de forma que `state_at` pueda obtener el estado
+        de cualquier frame sin ejecutar los anteriores.
+        """
+        self.tracks = {}
+        self.level_tracks = {}
+        self.initials = {}
+        for action in sorted(
+                self.timeline,
+                key=lambda a: (a.lower_bound, self.positions[a]),
+                ):
+            if action.attribute:
+                key = (action.actor, action.attribute)
+                track = self.tracks.setdefault(key, [])
+                self.initials[action] = evaluate_track(
+                    track,
+                    self.initials,
+                    action.actor.initial_state[action.attribute],
+                    action.lower_bound,
+                    )
+                track.append(action)
+            if action.target_level is not None:
+                self.level_tracks.setdefault(action.actor, []).append(action)
+
+    def is_closed_form(self):
+        if self.closed_form is None:
+            self.closed_form = all(
+                action.closed_form for action in self.timeline
+                )
+        return self.closed_form
+
+    def state_at(self, frame):
+        """Valores de las propiedades animadas tras procesar el frame.
+
+        Devuelve un diccionario con un diccionario por actor
+        (propiedad -> valor).
+        """
+        if self.tracks is None:
+            self.compile()
+        result = {}
+        for (actor, attribute), track in self.tracks.items():
+            base = actor.initial_state[attribute]
+            value = evaluate_track(track, self.initials, base, frame)
+            result.setdefault(actor, {})[attribute] = copy(value)
+        for actor, track in self.level_tracks.items():
+            level = actor.initial_state['level']
+            for action in track:
+                if action.lower_bound <= frame:
+                    level = action.target_level
+            result.setdefault(actor, {})['level'] = level
+        return result
+
+    def apply(self, frame):
+        for actor, state in self.state_at(frame).items():
+            for attribute in state:
+                setattr(actor, attribute, state[attribute])
+
+    def get_evaluator(self):
+        """Objeto con el que `jump` calcula el estado de un frame.
+
+        Es el propio scheduler o, con `vectorized`, un
+        `VectorizedTimeline` (si numpy está instalado).
+        """
+        if not self.vectorized:
+            return self
+        if self.timeline_evaluator is None:
+            from vectorized import VectorizedTimeline
+            try:
+                self.timeline_evaluator = VectorizedTimeline(self)
+            except ImportError as err:
+                logger.warning('%s: se usa la evaluación escalar', err)
+                self.vectorized = False
+                return self
+        return self.timeline_evaluator
+
+    def jump(self, frame):
+        """Como `seek`, pero calculando el estado directamente a
+        partir de la línea de tiempo.
+
+        Solo es válido si todas las acciones admiten evaluación
+        directa (ver `Action.closed_form`).
+        """
+        self.reset()
+        if frame > 0:
+            self.get_evaluator().apply(frame - 1)
+            active_actions = []
+            for action in sorted(
+                    self.timeline,
+                    key=lambda a: (a.lower_bound, self.positions[a]),
+                    ):
+                if action.lower_bound < frame <= action.upper_bound:
+                    if action.attribute:
+                        action.initial = copy(self.initials[action])
+                    active_actions.append(action)
+            self.set_active_actions(active_actions)
+            self.frame = frame
+        return self.frame
+
+    def snapshot(self):
+        """Estado completo de la animación en el frame actual.
+
+        Incluye el estado de todos los actores y de las acciones
+        activas. Las acciones se identifican por su posición en
+        `timeline` y los actores por su nombre, de forma que el
+        resultado se puede guardar en disco con `pickle`.
+        """
+        return {
+            'frame': self.frame,
+            'actors': {
+                actor.name: actor.snapshot() for actor in self.actors
+                },
+            'active_actions': [
+                (self.positions[action], {
+                    k: v for k, v in vars(action).items() if k != 'actor'
+                    })
+                for action in self.active_actions
+                ],
+            }
+
+    def restore(self, snapshot):
+        actors = {actor.name: actor for actor in self.actors}
+        for name, actor_snapshot in snapshot['actors'].items():
+            actors[name].restore(actor_snapshot)
+        active_actions = []
+        for position, state in snapshot['active_actions']:
+            action = self.timeline[position]
+            vars(action).update(state)
+            active_actions.append(action)
+        self.set_active_actions(active_actions)
+        self.frame = snapshot['frame']
+
+    def seek(self, frame):
+        """Deja la animación lista para procesar el frame indicado.
+
+        Si todas las acciones admiten evaluación directa el estado
+        se calcula con `jump`. En caso contrario se parte del
+        checkpoint más cercano anterior a `frame` (o del estado
+        inicial, si no hay ninguno) y se avanza desde ahí.
+        """
+        if self.is_closed_form():
+            return self.jump(frame)
+        previous = [f for f in self.checkpoints if f <= frame]
+        nearest = max(previous) if previous else 0
+        if frame < self.frame or nearest > self.frame:
+            if previous:
+                self.restore(self.checkpoints[nearest])
+            else:
+                self.reset()
+        while self.frame < frame:
+            self.next()
+        return self.frame
+
+    def save_checkpoints(self, filename):
+        with open(filename, 'wb') as f:
+            pickle.dump(self.checkpoints, f)
+
+    def load_checkpoints(self, filename):
+        with open(filename, 'rb') as f:
+            self.checkpoints = pickle.load(f)
+
+    def timed_step(self, action, frame):
+        """Ejecuta el step de la acción midiendo su tiempo, por clase.
+        """
+        self.profiler.call(
+            'actions', type(action).__name__, action.step, frame,
+            )
 
     def next(self):
-        for action in self.active_actions[:]:
-            if action.is_last(self.frame):
-                action.end(self.frame)
-                self.active_actions.remove(action)
+        frame = self.frame
+        ends = self.ends
+        timed = self.profiler is not None
+        if ends and ends[0][0] <= frame:  # Alguna acción termina
+            while ends and ends[0][0] <= frame:
+                heapq.heappop(ends)
+            active_actions = []
+            for action in self.active_actions:
+                if action.upper_bound <= frame:
+                    action.end(frame)
+                else:
+                    if timed:
+                        self.timed_step(action, frame)
+                    else:
+                        action.step(frame)
+                    active_actions.append(action)
+            self.active_actions = active_actions
+        elif timed:
+            for action in self.active_actions:
+                self.timed_step(action, frame)
+        else:
+            for action in self.active_actions:
+                action.step(frame)
+        for action in self.starts.get(frame, ()):  # Acciones que empiezan
+            action.start(frame)
+            if timed:
+                self.timed_step(action, frame)
             else:
-                action.step(self.frame)
-        for actor in self.actors:  # New actions that must start
-            key = (actor.name, self.frame)
-            if key in self.actions:
-                for a in self.actions[key]:
-                    a.start(self.frame)
-                    a.step(self.frame)
-                    self.active_actions.append(a)
+                action.step(frame)
+            self.active_actions.append(action)
+            heapq.heappush(
+                ends,
+                (action.upper_bound, self.positions[action], action),
+                )
         self.frame += 1
+        # Con evaluación directa `seek` no usa los checkpoints
+        if self.checkpoint_interval \
+                and self.frame % self.checkpoint_interval == 0 \
+                and self.frame not in self.checkpoints \
+                and not self.is_closed_form():
+            self.checkpoints[self.frame] = self.snapshot()
         return self.frame
 
     def dump(self, num_frames=15):
@@ -46,13 +303,10 @@ class Scheduler():
             )]
         for f in range(num_frames):
             buff.append('{:5d} '.format(f))
-            for actor in self.actors:
-                pk = (actor.name, f)
-                if pk in self.actions:
-                    for action in self.actions[pk]:
-                        buff.append('Starts {}'.format(
-                            action
-                            ))
+            for action in self.starts.get(f, ()):
+                buff.append('Starts {}'.format(
+                    action
+                    ))
             buff.append('\n')
         buff.append('-------------------------------------\n')
         return ''.join(buff)
@@ -1,54 +1,75 @@
 #!/usr/bin/env python3
+# -*- coding: utf-8 -*-
 
-import os
 import sys
-import subprocess
-import glob
-
-
-def get_real_path(filename, base=os.getcwd()):
-    return os.path.join(base, filename)
-
-
-def inkscape_export(source_filename, target_filename):
-    commands = [
-        "inkscape",
-        "-e",
-        get_real_path(target_filename),
-        get_real_path(source_filename),
-        ]
-    print(" ".join(commands))
-    subprocess.call(commands)
-
-
-def rsvg_export(source_filename, target_filename):
-    commands = [
-        "rsvg",
-        "-o",
-        get_real_path(target_filename),
-        get_real_path(source_filename),
-        ]
-    print(" ".join(commands))
-    subprocess.call(commands)
-
-
-for filename in sorted(glob.glob('./tmp/frame_*.svg')):
-    target_filename = filename[:-4] + '.png'
-    if os.path.exists(target_filename):
-        print('[Skipped]', end='')
-        continue
-    else:
-        print('.', end="")
-        sys.stdout.flush()
-    inkscape_export(filename, target_filename)
-print('Preparando vídeo', end=' ')
-subprocess.call([
-    'avconv',
-    '-i',
-    './tmp/frame_%05d.png',
-    '-c:v',
-    'libx264',
-    '-pix_fmt', 'yuv420p',
-    './out.mp4',
-    ])
-print('\nvlc out.mp4')
+
+import language
+from studio import Stage, load_script
+from engines import RasterEngine
+from movie import MovieWriter
+import config
+import logs
+
+logger = logs.create(__name__)
+
+
+def build_stage(opts):
+    width, height = (int(_) for _ in opts.size.split('x'))
+    engine = RasterEngine(
+        width=width,
+        height=height,
+        fps=opts.fps,
+        incremental=opts.incremental,
+        )
+    stage = Stage(engine, options=opts)
+    return load_script(
+        stage, opts.script, cache=opts.cache, parser=opts.parser,
+        )
+
+
+def create_movie(stage, writer):
+    """Dibuja cada frame y se lo pasa directamente al codificador.
+    """
+    engine = stage.engine
+    with writer:
+        for frame in range(stage.num_frames):
+            stage.draw(frame)
+            writer.write(engine.get_frame())
+            if frame % stage.fps == 0:
+                print('.', end='')
+                sys.stdout.flush()
+    print()
+
+
+def main():
+    opts = config.get_options()
+    try:
+        stage = build_stage(opts)
+    except language.ParseException as err:
+        logger.error('Error de parseo en {}'.format(opts.script))
+        logger.error(err)
+        logger.error('num línea: {}'.format(err.lineno))
+        logger.error('>>> {}'.format(err.line))
+        logger.error('---' + '-'*err.col + '^')
+        sys.exit()
+    try:
+        writer = MovieWriter(
+            opts.movie, stage.width, stage.height, stage.fps,
+            encoder=opts.encoder,
+            pix_fmt=stage.engine.pix_fmt,
+            )
+    except ValueError as err:
+        logger.error(err)
+        sys.exit(1)
+    print('Preparando vídeo', end=' ')
+    create_movie(stage, writer)
+    if stage.profiler:
+        stage.profiler.save(opts.profile, opts.profile_format)
+        print(stage.profiler.report())
+    if writer.returncode:
+        sys.exit(1)
+    print('vlc {}'.format(opts.movie))
+
+
+if __name__ == '__main__':
+    main()
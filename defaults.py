@@ -9,3 +9,33 @@ BACKGROUND = 'black'
 FOREGROUND = 'white'
 
 GRID = False
+
+JOBS = 1
+
+CHECKPOINT_INTERVAL = 250  # Solo si hay acciones sin evaluación directa
+
+INCREMENTAL = False
+
+CACHE = True  # Guardar y reutilizar los scripts compilados (.grafelc)
+
+PARSER = 'fast'  # fast | pyparsing
+
+VECTORIZED = False  # Calcular con numpy el estado al saltar a un frame
+
+CULLING = True  # No dibujar los actores que quedan fuera de la pantalla
+
+PACING = 'realtime'  # realtime | uncapped | fixed
+
+SURFACE_POOL_SIZE = 64 * 1024 * 1024  # bytes
+
+TEXT_CACHE_SIZE = 16 * 1024 * 1024  # bytes
+
+IMAGE_CACHE_SIZE = 64 * 1024 * 1024  # bytes
+
+LINK_IMAGES = False
+
+SVG_ENGINE = 'svgwrite'  # svgwrite | stream
+
+MOVIE = 'out.mp4'
+
+PROFILE_FORMAT = 'json'  # json | trace
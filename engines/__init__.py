@@ -1,4 +1,6 @@
 #!/usr/bin/env python
 
 from .svg_engine import SVGEngine
+from .svg_stream_engine import SVGStreamEngine
 from .pygame_engine import PyGameEngine
+from .raster_engine import RasterEngine
@@ -7,9 +7,20 @@ import logs
 
 logger = logs.create(__name__)
 
+TRACE = logs.TRACE
+
+# Métodos de dibujo que implementan los motores (los que se miden
+# al perfilar)
+PRIMITIVES = (
+    'clear', 'clear_rect', 'line', 'box', 'rect', 'roundrect', 'circle',
+    'polygon', 'lines', 'text', 'bitmap', 'end',
+    )
+
 
 class BaseEngine:
 
+    incremental = False  # Redibuja solo las zonas que cambian
+
     def __init__(self, width=1280, height=720, fps=25):
         self.width = width
         self.height = height
@@ -20,16 +31,24 @@ class BaseEngine:
         self.frame = 0
         self.debug = False
 
+    def skip_frame(self, frame):
+        """Indica si hay que saltarse el dibujo del frame.
+        """
+        return False
+
     def clear(self, frame, grid=False):
-        logger.info('Clear screen; prepare for start drawing frame {}.'.format(
-            frame))
+        if TRACE:
+            logger.info(
+                'Clear screen; prepare for start drawing frame %s.', frame,
+                )
         self.frame = frame
 
     def line(self, x0, y0, x1, y1, color=colors.white, alpha=1.0):
-        logger.info('Draw line from {}x{} to {}x{} [color:{}|alpha:{}]'.format(
-            x0, y0, x1, y1,
-            color, alpha
-            ))
+        if TRACE:
+            logger.info(
+                'Draw line from %sx%s to %sx%s [color:%s|alpha:%s]',
+                x0, y0, x1, y1, color, alpha,
+                )
 
     def grid(self, step=100):
         for x in range(step, self.width, step):
@@ -38,30 +57,55 @@ class BaseEngine:
             self.line(0, y, self.width, y, alpha=0.25)
 
     def box(self, x, y, width, height, color=colors.white, alpha=1.0):
-        logger.info(
-            f'Draw box {x}x{y} width {width} height {height})'
-            f' color {color} alpha {alpha}'
-            )
+        if TRACE:
+            logger.info(
+                'Draw box %sx%s width %s height %s color %s alpha %s',
+                x, y, width, height, color, alpha,
+                )
 
     def rect(self, x, y, width, height, color=colors.white, alpha=1.0):
-        logger.info('Draw rect ({}, {}, {}, {}) [color:{}|alpha:{}]'.format(
-            x, y, width, height, color, alpha,
-            ))
+        if TRACE:
+            logger.info(
+                'Draw rect (%s, %s, %s, %s) [color:%s|alpha:%s]',
+                x, y, width, height, color, alpha,
+                )
+
+    def roundrect(self, x, y, width, height, r, color=colors.white,
+                  alpha=1.0):
+        if TRACE:
+            logger.info(
+                'Draw roundrect (%s, %s, %s, %s) radius %s'
+                ' [color:%s|alpha:%s]',
+                x, y, width, height, r, color, alpha,
+                )
 
     def circle(self, x, y, r, color=colors.white, alpha=1.0):
-        logger.info(
-            f'Draw circle at {x}x{y}'
-            f' radius {r} color {color} alpha {alpha}]'
-            )
+        if TRACE:
+            logger.info(
+                'Draw circle at %sx%s radius %s color %s alpha %s',
+                x, y, r, color, alpha,
+                )
 
     def polygon(self, x, y, rpoints, color=colors.white, alpha=1.0):
-        n_points = len(rpoints)
-        logger.info(
-            f'Draw polygon starting as {x}x{y}'
-            f' with {n_points}'
-            f' color {color}'
-            f' alpha:{alpha}'
-            )
+        if TRACE:
+            logger.info(
+                'Draw polygon starting as %sx%s with %s color %s alpha:%s',
+                x, y, len(rpoints), color, alpha,
+                )
+
+    def text(self, x, y, text, color=colors.white, alpha=1.0, font_size=32):
+        if TRACE:
+            logger.info(
+                'Draw text %r at %sx%s [color:%s|alpha:%s]',
+                text, x, y, color, alpha,
+                )
+
+    def bitmap(self, x, y, filename, alpha=1.0):
+        if TRACE:
+            logger.info(
+                'Draw bitmap %s at %sx%s [alpha:%s]', filename, x, y, alpha,
+                )
 
     def end(self):
-        logger.debug('End of drawing.')
+        if TRACE:
+            logger.debug('End of drawing.')
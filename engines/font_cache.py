@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+import pygame
+import logs
+
+logger = logs.create(__name__)
+
+FONTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'fonts',
+    )
+
+# Fuentes incluidas en el directorio fonts, por familia
+BUNDLED_FONTS = {
+    'delicious': 'Delicious-Roman.otf',
+    'chunkfive': 'Chunkfive.ttf',
+    'freesansbold': 'freesansbold.ttf',
+    }
+
+
+class FontCache:
+    """Fuentes de pygame ya cargadas, por familia, tamaño y estilo.
+
+    Las familias incluidas en el directorio `fonts` se cargan
+    directamente del fichero; el resto se buscan con
+    `pygame.font.SysFont`, que es mucho más lento.
+    """
+
+    def __init__(self):
+        self.fonts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.fonts)
+
+    def get(self, family, size, bold=False, italic=False):
+        key = (family, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            self.misses += 1
+            font = self.fonts[key] = self.load(family, size, bold, italic)
+        else:
+            self.hits += 1
+        return font
+
+    def load(self, family, size, bold=False, italic=False):
+        filename = BUNDLED_FONTS.get(family.lower())
+        if filename:
+            logger.debug('Cargando fuente %s de %s', family, filename)
+            font = pygame.font.Font(os.path.join(FONTS_DIR, filename), size)
+            font.set_bold(bold)
+            font.set_italic(italic)
+            return font
+        return pygame.font.SysFont(family, size, bold=bold, italic=italic)
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'fonts': len(self.fonts),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate(),
+            }
@@ -1,14 +1,34 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import math
+import time
+
 import pygame
 import logs
 
 import colors
+import defaults
 from .base_engine import BaseEngine
+from .surface_pool import SurfacePool
+from .font_cache import FontCache
+from .surface_cache import SurfaceCache
 
 logger = logs.create(__name__)
 
+# En modo incremental, si la zona a repintar supera esta fracción
+# de la pantalla se redibuja todo
+FULL_REPAINT_RATIO = 0.5
+
+# Modos de sincronización con el reloj
+REALTIME = 'realtime'  # Esperar en cada frame para no pasar de los fps
+UNCAPPED = 'uncapped'  # Dibujar lo más rápido posible
+FIXED = 'fixed'  # Ritmo fijo, saltándose frames si no da tiempo
+PACING_MODES = (REALTIME, UNCAPPED, FIXED)
+
+# En modo fixed, máximo de frames seguidos que se pueden saltar
+MAX_FRAME_SKIP = 5
+
 
 class PyGameEngine(BaseEngine):
 
@@ -20,17 +40,46 @@ class PyGameEngine(BaseEngine):
         # pygame.scrap.init()
         pygame.fastevent.init()
 
-    def __init__(self, width=1280, height=720, fps=25):
+    def __init__(self, width=1280, height=720, fps=25, incremental=False,
+                 surface_pool_size=defaults.SURFACE_POOL_SIZE,
+                 text_cache_size=defaults.TEXT_CACHE_SIZE,
+                 image_cache_size=defaults.IMAGE_CACHE_SIZE,
+                 pacing=defaults.PACING):
         super().__init__(width=width, height=height, fps=fps)
+        if pacing not in PACING_MODES:
+            raise ValueError(
+                'Modo de sincronización desconocido: {}'.format(pacing)
+                )
+        self.incremental = incremental
+        self.pacing = pacing
+        self.start_time = None
+        self.next_frame = None
+        self.deadline = None
+        self.num_skips = 0  # Frames saltados seguidos
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+        self.first_end_time = None
+        self.last_end_time = None
+        self._touched = None
+        self._measuring = False
+        self.surfaces = SurfacePool(surface_pool_size)
+        self.fonts = FontCache()
+        self.texts = SurfaceCache(text_cache_size)
+        self.images = SurfaceCache(image_cache_size)
         self.pygame_init()
         self.clock = pygame.time.Clock()
+        self.screen = self.create_screen()
+
+    def create_screen(self):
+        """Superficie en la que se dibujan los frames.
+        """
         mode = (
             pygame.HWSURFACE |
             pygame.DOUBLEBUF |
             pygame.SRCALPHA |
             pygame.NOFRAME
             )
-        self.screen = pygame.display.set_mode(self.size, mode)
+        return pygame.display.set_mode(self.size, mode)
 
     def get_surface(self, width=None, height=None):
         width = width or self.width
@@ -40,6 +89,14 @@ class PyGameEngine(BaseEngine):
             pygame.SRCALPHA,  # per-pixel alpha
             )
 
+    def get_scratch(self, width, height, clear=True):
+        """Superficie transparente de trabajo, tomada del pool.
+
+        Solo vale para dibujar en ella y volcarla a la pantalla de
+        inmediato: la siguiente petición del mismo tamaño la borra.
+        """
+        return self.surfaces.get(width, height, clear=clear)
+
     def add_alpha_color(self, color, alpha):
         if not isinstance(color, colors.Color):
             color = colors.Color(color)
@@ -53,30 +110,100 @@ class PyGameEngine(BaseEngine):
         if grid:
             self.grid()
 
+    def touch(self, x, y, width, height):
+        """Anota la zona de pantalla que modifica una primitiva.
+
+        Solo tiene efecto mientras se mide un actor con `measure`;
+        en ese caso devuelve `True` y la primitiva no debe dibujar.
+        """
+        if self._touched is not None:
+            self._touched.append(pygame.Rect(
+                int(x) - 2, int(y) - 2, int(width) + 4, int(height) + 4,
+                ))
+        return self._measuring
+
+    def measure(self, actor):
+        """Rectángulo de pantalla que ocupa el actor (y sus hijos).
+
+        Devuelve `None` si el actor no dibuja nada.
+        """
+        self._touched = []
+        self._measuring = True
+        try:
+            actor.start_draw(self)
+        finally:
+            self._measuring = False
+            touched, self._touched = self._touched, None
+        if touched:
+            return touched[0].unionall(touched[1:])
+
+    def merge_rects(self, rects):
+        """Une los rectángulos que se solapan.
+
+        Devuelve `None` si la zona resultante es tan grande que sale
+        más a cuenta repintar toda la pantalla.
+        """
+        screen_rect = self.screen.get_rect()
+        merged = []
+        for rect in rects:
+            rect = rect.clip(screen_rect)
+            if not rect.width or not rect.height:
+                continue
+            i = rect.collidelist(merged)
+            while i >= 0:
+                rect.union_ip(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        area = sum(rect.width * rect.height for rect in merged)
+        if area > FULL_REPAINT_RATIO * self.width * self.height:
+            return None
+        return merged
+
+    def clear_rect(self, frame, rect, grid=False):
+        """Restaura el fondo solo dentro del rectángulo.
+
+        Hasta la llamada a `end`, el dibujo queda limitado a esa zona.
+        """
+        self.frame = frame
+        self.screen.set_clip(rect)
+        self.screen.fill(self.bg_color.as_rgb(), rect)
+        if grid:
+            self.grid()
+
     def line(self, x0, y0, x1, y1, color=None, alpha=1.0):
         color = color or self.fg_color
         super().line(x0, y0, x1, y1, color, alpha)
+        if self.touch(
+                min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1,
+                ):
+            return
         color = self.add_alpha_color(color, alpha)
         pygame.draw.line(self.screen, color, (x0, y0), (x1, y1), 1)
 
     def rect(self, x, y, width, height, color=None, alpha=1.0):
+        if self.touch(x, y, width, height):
+            return
         color = color or self.fg_color
         color = self.add_alpha_color(color, alpha)
-        s = self.get_surface(width, height)
+        s = self.get_scratch(width, height, clear=False)
         s.fill(color)
         self.screen.blit(s, (x, y))
 
     def box(self, x, y, width, height, color=None, alpha=1.0):
+        if self.touch(x, y, width + 1, height + 1):
+            return
         color = color or self.fg_color
         color = self.add_alpha_color(color, alpha)
-        s = self.get_surface(width+1, height+1)
+        s = self.get_scratch(width+1, height+1)
         pygame.draw.rect(s, color, (1, 1, width-1, height-1), 3)
         self.screen.blit(s, (x, y))
 
     def roundrect(self, x, y, width, height, r, color=None, alpha=1.0):
+        if self.touch(x, y, width, height):
+            return
         color = color or self.fg_color
         color = self.add_alpha_color(color, alpha)
-        s = self.get_surface(width, height)
+        s = self.get_scratch(width, height)
         pygame.draw.circle(s, color, (r, r), r)
         pygame.draw.circle(s, color, (width-r, r), r)
         pygame.draw.circle(s, color, (r, height-r), r)
@@ -86,10 +213,12 @@ class PyGameEngine(BaseEngine):
         self.screen.blit(s, (x, y))
 
     def circle(self, x, y, r, color=None, alpha=1.0):
+        if self.touch(x - r, y - r, 2*r + 1, 2*r + 1):
+            return
         color = color or self.fg_color
         color = self.add_alpha_color(color, alpha)
-        side = r << 2
-        s = self.get_surface(side, side)
+        side = 2*r + 1
+        s = self.get_scratch(side, side)
         pygame.draw.circle(s, color, (r, r), r, 0)
         self.screen.blit(s, (x-r, y-r))
 
@@ -101,15 +230,40 @@ class PyGameEngine(BaseEngine):
             x += p[0]
             y += p[1]
             points.append((x, y))
-        s = self.get_surface()
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        if self.touch(
+                min(xs) - 3, min(ys) - 3,
+                max(xs) - min(xs) + 7, max(ys) - min(ys) + 7,
+                ):
+            return
+        # Superficie del tamaño del polígono (más margen para los
+        # puntos de depuración) recortada a la pantalla y desplazada
+        # un número entero de pixels, para que el resultado sea el
+        # mismo que dibujando en una superficie de toda la pantalla
+        left = max(0, math.floor(min(xs)) - 4)
+        top = max(0, math.floor(min(ys)) - 4)
+        width = min(self.width, math.ceil(max(xs)) + 5) - left
+        height = min(self.height, math.ceil(max(ys)) + 5) - top
+        if width <= 0 or height <= 0:  # Fuera de la pantalla
+            return
+        points = [(px - left, py - top) for px, py in points]
+        s = self.get_scratch(width, height)
         pygame.draw.polygon(s, color, points, 0)
         if self.debug:
             for p in points:
                 v = (p[0], p[1])
                 pygame.draw.circle(s, colors.red.as_rgb(), v, 3, 0)
-        self.screen.blit(s, (0, 0))
+        self.screen.blit(s, (left, top))
 
     def lines(self, points, color=None):
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        if self.touch(
+                min(xs) - 3, min(ys) - 3,
+                max(xs) - min(xs) + 7, max(ys) - min(ys) + 7,
+                ):
+            return
         color = color or self.fg_color
         pygame.draw.polygon(self.screen, color.as_rgb(), points, 0)
         pygame.draw.aalines(
@@ -122,37 +276,153 @@ class PyGameEngine(BaseEngine):
             for v in points:
                 pygame.draw.circle(self.screen, (255, 0, 0), v, 3, 0)
 
+    def render_text(self, text, color, font_size, family='Delicious'):
+        """Superficie con el texto ya renderizado, sin transparencia.
+
+        Se guarda en caché por texto, fuente, tamaño y color; la
+        transparencia se aplica al volcarla a la pantalla.
+        """
+        rgb = color.as_rgb()
+        return self.texts.get(
+            (text, family, font_size, rgb),
+            lambda: self.fonts.get(family, font_size).render(text, True, rgb),
+            )
+
+    def with_alpha(self, surface, alpha):
+        """La superficie (de una caché) con la transparencia indicada.
+
+        Las superficies de las cachés son compartidas y no se pueden
+        modificar: si hace falta transparencia se aplica a una copia.
+        """
+        alpha = min(255, int(round(alpha*255)))
+        if alpha >= 255:
+            return surface
+        surface = surface.copy()
+        surface.set_alpha(alpha)
+        return surface
+
     def text(self, x, y, text, color=None, alpha=1.0, font_size=32):
         color = color or self.fg_color
-        color = self.add_alpha_color(color, alpha)
-        f = pygame.font.SysFont(
-            'Delicious',
-            font_size,
-            bold=False,
-            italic=False,
-            )
-        s = f.render(text, True, color)
-        if alpha < 1.0:
-            s.convert_alpha()
-            s.set_alpha(alpha*255)
-            s.fill((255, 255, 255, alpha*255), None, pygame.BLEND_RGBA_MULT) 
+        if not isinstance(color, colors.Color):
+            color = colors.Color(color)
+        s = self.render_text(text, color, font_size)
+        width, height = s.get_size()
+        if self.touch(x - width / 2, y - height / 2, width, height):
+            return
+        s = self.with_alpha(s, alpha)
         rect = s.get_rect()
         rect.center = (x, y)
         self.screen.blit(s, rect)
 
-    def bitmap(self, x, y, filename, alpha=1.0):
-        img = pygame.image.load(filename)
-        if alpha < 1.0:
-            img.convert_alpha()
-            img.set_alpha(alpha*255)
-            img.fill((255, 255, 255, alpha*255), None, pygame.BLEND_RGBA_MULT) 
-        rect = img.get_rect()
-        rect.center = (x, y)
-        self.screen.blit(img, rect)
+    def load_image(self, filename, size=None):
+        """Imagen ya decodificada, guardada en caché.
+
+        Si se indica `size` (ancho, alto) se devuelve una versión
+        escalada, que también se guarda. Con la pantalla ya creada,
+        las imágenes se convierten a su formato de pixels para que
+        volcarlas sea más rápido.
+        """
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+            return self.images.get(
+                (filename, size),
+                lambda: pygame.transform.smoothscale(
+                    self.load_image(filename), size,
+                    ),
+                )
+
+        def load():
+            img = pygame.image.load(filename)
+            if pygame.display.get_surface() is not None:
+                img = img.convert_alpha()
+            return img
+
+        return self.images.get((filename, None), load)
+
+    def bitmap(self, x, y, filename, alpha=1.0, size=None):
+        img = self.load_image(filename, size)
+        width, height = img.get_size()
+        if not self.touch(x - width / 2, y - height / 2, width, height):
+            img = self.with_alpha(img, alpha)
+            rect = img.get_rect()
+            rect.center = (x, y)
+            self.screen.blit(img, rect)
         if not self.debug:
             self.line(x-20, y, x+20, y)
             self.line(x, y-20, x, y+20)
 
-    def end(self):
-        pygame.display.flip()
-        self.clock.tick(self.fps)
+    def skip_frame(self, frame):
+        """Indica si hay que saltarse el dibujo del frame.
+
+        Solo en modo `fixed`: cada frame tiene su hora, según los fps,
+        y si el dibujo va retrasado más de un frame se salta, hasta
+        un máximo de `MAX_FRAME_SKIP` seguidos. Al empezar, o tras
+        un salto en la animación, se vuelve a tomar la hora.
+        """
+        if self.pacing != FIXED or not self.fps:
+            return False
+        now = time.perf_counter()
+        if frame != self.next_frame:
+            self.start_time = now - frame / self.fps
+        self.next_frame = frame + 1
+        self.deadline = self.start_time + self.next_frame / self.fps
+        if now > self.deadline and self.num_skips < MAX_FRAME_SKIP:
+            self.num_skips += 1
+            self.frames_skipped += 1
+            return True
+        self.num_skips = 0
+        return False
+
+    def wait(self):
+        """Espera lo que indique el modo de sincronización.
+        """
+        if self.pacing == REALTIME:
+            self.clock.tick(self.fps)
+            return
+        if self.pacing == FIXED and self.deadline is not None:
+            delay = self.deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        self.clock.tick()
+
+    def count_frame(self):
+        """Anota un frame terminado, para las estadísticas.
+        """
+        self.last_end_time = time.perf_counter()
+        if self.first_end_time is None:
+            self.first_end_time = self.last_end_time
+        self.frames_drawn += 1
+
+    def get_fps(self):
+        """Frames por segundo conseguidos en los últimos frames.
+        """
+        return self.clock.get_fps()
+
+    def stats(self):
+        """Frames dibujados y saltados, y media de frames por segundo.
+        """
+        fps = 0.0
+        if self.frames_drawn > 1:
+            elapsed = self.last_end_time - self.first_end_time
+            if elapsed > 0:
+                fps = (self.frames_drawn - 1) / elapsed
+        return {
+            'pacing': self.pacing,
+            'frames': self.frames_drawn,
+            'skipped': self.frames_skipped,
+            'fps': fps,
+            }
+
+    def end(self, rects=None):
+        """Muestra el frame.
+
+        Si se indican los rectángulos modificados, solo se actualizan
+        esas zonas de la pantalla.
+        """
+        if rects is None:
+            pygame.display.flip()
+        else:
+            self.screen.set_clip(None)
+            pygame.display.update(rects)
+        self.wait()
+        self.count_frame()
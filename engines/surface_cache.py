@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+import logs
+
+logger = logs.create(__name__)
+
+
+def surface_bytes(surface):
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+class SurfaceCache:
+    """Caché LRU de superficies de pygame con límite de memoria.
+
+    `get` recibe la clave y una función sin argumentos que crea la
+    superficie si no está en la caché. Cuando la memoria ocupada
+    supera `max_bytes` se descartan las superficies usadas hace más
+    tiempo.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.size_in_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def __contains__(self, key):
+        return key in self.surfaces
+
+    def get(self, key, create):
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            surface = create()
+            self.surfaces[key] = surface
+            self.size_in_bytes += surface_bytes(surface)
+            self.evict()
+        else:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def evict(self):
+        # Nunca se descarta la última superficie pedida
+        while self.size_in_bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, surface = self.surfaces.popitem(last=False)
+            self.size_in_bytes -= surface_bytes(surface)
+            self.evictions += 1
+
+    def clear(self):
+        self.surfaces.clear()
+        self.size_in_bytes = 0
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'surfaces': len(self.surfaces),
+            'bytes': self.size_in_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate(),
+            }
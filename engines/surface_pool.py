@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pygame
+
+from .surface_cache import SurfaceCache
+
+
+class SurfacePool(SurfaceCache):
+    """Superficies de trabajo reutilizables, una por tamaño.
+
+    Las primitivas de `PyGameEngine` dibujan en una superficie
+    transparente y la vuelcan de inmediato a la pantalla, así que
+    basta con guardar una superficie por cada tamaño (ancho, alto)
+    en vez de crear una nueva en cada llamada. Cuando la memoria
+    ocupada supera `max_bytes` se descartan las usadas hace más
+    tiempo.
+    """
+
+    def get(self, width, height, clear=True):
+        """Superficie de (width x height) pixels con canal alfa.
+
+        Si `clear` es verdadero se devuelve totalmente transparente;
+        si no, con lo último que se dibujó en ella.
+        """
+        size = (int(width), int(height))
+        surface = super().get(
+            size, lambda: pygame.Surface(size, pygame.SRCALPHA),
+            )
+        if clear:
+            # Las recién creadas ya son transparentes, pero son pocas:
+            # no merece la pena distinguirlas
+            surface.fill((0, 0, 0, 0))
+        return surface
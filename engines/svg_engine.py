@@ -22,11 +22,28 @@ def as_color_svg(c):
 
 class SVGEngine(BaseEngine):
 
-    def __init__(self, width=1280, height=720, fps=25, output_dir='/tmp'):
+    def __init__(self, width=1280, height=720, fps=25, output_dir='/tmp',
+                 link_images=False):
         super().__init__(width, height, fps)
         if not os.path.isdir(output_dir):
             os.makedirs(output_dir)
         self.output_dir = output_dir
+        # Enlazar las imágenes copiadas en output_dir, en vez de
+        # incrustarlas en base64 en cada frame
+        self.link_images = link_images
+
+    def copy_asset(self, filename):
+        """Copia el fichero en el directorio de salida, si no estaba ya.
+
+        Devuelve la ruta de la copia relativa al directorio de salida.
+        """
+        target_name = os.path.join(self.output_dir, filename)
+        if not os.path.exists(target_name):
+            target_dir = os.path.dirname(target_name)
+            if not os.path.isdir(target_dir):
+                os.makedirs(target_dir)
+            shutil.copyfile(filename, target_name)
+        return os.path.relpath(target_name, self.output_dir)
 
     def clear(self, frame, grid=False):
         super().clear(frame)
@@ -87,12 +104,12 @@ class SVGEngine(BaseEngine):
 
     def bitmap(self, x, y, filename, alpha=1.0):
         (w, h) = fileutils.get_image_size(filename)
-        target_name = os.path.join(self.output_dir, filename)
-        if not os.path.exists(target_name):
-            shutil.copyfile(filename, target_name)
+        href = self.copy_asset(filename)
+        if not self.link_images:
+            href = fileutils.get_image_data(filename)
         self.dwg.add(
             self.dwg.image(
-                fileutils.get_image_data(filename),
+                href,
                 insert=(x - w / 2, y - h / 2),
                 opacity=alpha,
                 ))
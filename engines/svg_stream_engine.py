@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from xml.sax.saxutils import escape
+
+import logs
+import fileutils
+
+from .base_engine import BaseEngine
+from .svg_engine import SVGEngine, as_color_svg
+
+logger = logs.create(__name__)
+
+BUFFER_SIZE = 64 * 1024
+
+# Las plantillas reproducen la salida de svgwrite: atributos en orden
+# alfabético, números con str() y sin espacios entre elementos
+
+HEADER = (
+    '<?xml version="1.0" encoding="utf-8" ?>\n'
+    '<svg baseProfile="full" height="{height}" version="1.1"'
+    ' width="{width}" xmlns="http://www.w3.org/2000/svg"'
+    ' xmlns:ev="http://www.w3.org/2001/xml-events"'
+    ' xmlns:xlink="http://www.w3.org/1999/xlink"><defs />'
+    '<rect fill="{fill}" height="{height}" width="{width}" x="0" y="0" />'
+    )
+
+FOOTER = '</svg>'
+
+LINE = '<line stroke="{}" x1="{}" x2="{}" y1="{}" y2="{}" />'
+
+RECT = (
+    '<rect fill="{}" height="{}" opacity="{}"'
+    ' width="{}" x="{}" y="{}" />'
+    )
+
+BOX = (
+    '<rect fill-opacity="0" height="{}" opacity="{}" stroke="{}"'
+    ' stroke-width="3" width="{}" x="{}" y="{}" />'
+    )
+
+ROUNDRECT = (
+    '<rect fill="{}" height="{}" opacity="{}" rx="{}" ry="{}"'
+    ' width="{}" x="{}" y="{}" />'
+    )
+
+CIRCLE = '<circle cx="{}" cy="{}" fill="{}" opacity="{}" r="{}" />'
+
+POLYGON = '<polygon fill="{}" opacity="{}" points="{}" />'
+
+TEXT = (
+    '<text dominant-baseline="middle" dy="0.33em" fill="{}"'
+    ' font-family="Delicious" font-size="{}" opacity="{}"'
+    ' text-anchor="middle" x="{}" y="{}">{}</text>'
+    )
+
+IMAGE = '<image opacity="{}" x="{}" xlink:href="{}" y="{}" />'
+
+
+def attr(value):
+    return escape(str(value), {'"': '&quot;', '\n': '&#10;'})
+
+
+class SVGStreamEngine(SVGEngine):
+    """Motor SVG que escribe cada elemento directamente en el fichero.
+
+    Produce los mismos ficheros que `SVGEngine`, pero sin construir
+    el árbol de svgwrite ni validar cada elemento.
+    """
+
+    def clear(self, frame, grid=False):
+        BaseEngine.clear(self, frame)
+        filename = 'frame_{:05d}.svg'.format(frame)
+        full_fn = os.path.join(self.output_dir, filename)
+        self.stream = open(
+            full_fn, 'w', encoding='utf-8', buffering=BUFFER_SIZE,
+            )
+        self.stream.write(HEADER.format(
+            width=self.width,
+            height=self.height,
+            fill=self.bg_color.as_svg(),
+            ))
+        if grid:
+            self.grid()
+
+    def line(self, x0, y0, x1, y1, color=None, alpha=1.0):
+        color = color or self.fg_color
+        self.stream.write(LINE.format(as_color_svg(color), x0, x1, y0, y1))
+
+    def rect(self, x, y, width, height, color=None, alpha=1.0):
+        color = color or self.fg_color
+        self.stream.write(RECT.format(
+            as_color_svg(color), height, alpha, width, x, y,
+            ))
+
+    def box(self, x, y, width, height, color=None, alpha=1.0):
+        color = color or self.fg_color
+        self.stream.write(BOX.format(
+            height, alpha, attr(color), width, x, y,
+            ))
+
+    def roundrect(self, x, y, width, height, r, color=None, alpha=1.0):
+        color = color or self.fg_color
+        self.stream.write(ROUNDRECT.format(
+            as_color_svg(color), height, alpha, r, r, width, x, y,
+            ))
+
+    def bitmap(self, x, y, filename, alpha=1.0):
+        (w, h) = fileutils.get_image_size(filename)
+        href = self.copy_asset(filename)
+        if not self.link_images:
+            href = fileutils.get_image_data(filename)
+        self.stream.write(IMAGE.format(
+            alpha, x - w / 2, attr(href), y - h / 2,
+            ))
+        if self.debug:
+            self.line(x-10, y, x+10, y)
+            self.line(x, y-10, x, y+10)
+
+    def circle(self, x, y, r, color=None, alpha=1.0):
+        color = color or self.fg_color
+        self.stream.write(CIRCLE.format(x, y, as_color_svg(color), alpha, r))
+
+    def polygon(self, x, y, rpoints, color=None, alpha=1.0):
+        color = color or self.fg_color
+        points = ['{},{}'.format(x, y)]
+        for p in rpoints:
+            x += p[0]
+            y += p[1]
+            points.append('{},{}'.format(x, y))
+        self.stream.write(POLYGON.format(
+            as_color_svg(color), alpha, ' '.join(points),
+            ))
+
+    def text(self, x, y, text, color=None, alpha=1.0, font_size=32):
+        color = color or self.fg_color
+        self.stream.write(TEXT.format(
+            as_color_svg(color), font_size, alpha, x, y, escape(text),
+            ))
+
+    def end(self):
+        self.stream.write(FOOTER)
+        self.stream.close()
@@ -2,22 +2,97 @@
 # -*- coding: utf-8 -*-
 
 import sys
+import traceback
+import multiprocessing
 
 import language
 
-import actions
-from studio import Stage
-from engines import SVGEngine
+from studio import Stage, load_script
+from engines import SVGEngine, SVGStreamEngine
 import config
 import logs
 
 logger = logs.create(__name__)
-opts = config.get_options()
 
-if opts.script:
-    parser = language.get_parser()
+SVG_ENGINES = {
+    'svgwrite': SVGEngine,
+    'stream': SVGStreamEngine,
+    }
+
+
+def build_stage(opts):
+    engine_class = SVG_ENGINES[opts.svg_engine]
+    engine = engine_class(
+        output_dir=opts.output_dir,
+        link_images=opts.link_images,
+        )
+    stage = Stage(engine, options=opts)
+    return load_script(
+        stage, opts.script, cache=opts.cache, parser=opts.parser,
+        )
+
+
+def get_chunks(num_frames, jobs):
+    """Divide el rango de frames en `jobs` intervalos consecutivos.
+    """
+    size, rest = divmod(num_frames, jobs)
+    first_frame = 0
+    for i in range(jobs):
+        last_frame = first_frame + size + (1 if i < rest else 0)
+        if last_frame > first_frame:
+            yield (first_frame, last_frame)
+        first_frame = last_frame
+
+
+def export_chunk(args):
+    """Exporta los frames del intervalo [first_frame, last_frame).
+
+    Se ejecuta en un proceso independiente: reconstruye el escenario
+    a partir del script y lleva el planificador, sin dibujar, hasta
+    el primer frame del intervalo.
+    """
+    opts, first_frame, last_frame = args
     try:
-        tree = parser.parseFile(opts.script)
+        stage = build_stage(opts)
+        stage.seek(first_frame)
+        for frame in range(first_frame, last_frame):
+            stage.draw(frame)
+    except Exception:
+        return (first_frame, last_frame, traceback.format_exc())
+    return (first_frame, last_frame, None)
+
+
+def export_parallel(opts):
+    chunks = [
+        (opts, first_frame, last_frame)
+        for first_frame, last_frame in get_chunks(opts.num_frames, opts.jobs)
+        ]
+    errors = []
+    done = 0
+    context = multiprocessing.get_context('spawn')  # fork + SDL se bloquea
+    with context.Pool(opts.jobs) as pool:
+        for first_frame, last_frame, error in pool.imap_unordered(
+                export_chunk, chunks):
+            if error:
+                errors.append((first_frame, last_frame, error))
+            else:
+                done += last_frame - first_frame
+                logger.info(
+                    '[%d/%d] frames %d-%d',
+                    done, opts.num_frames, first_frame, last_frame - 1,
+                    )
+    for first_frame, last_frame, error in sorted(errors):
+        logger.error(
+            'Error exportando los frames %d-%d', first_frame, last_frame - 1,
+            )
+        logger.error(error)
+    return not errors
+
+
+def main():
+    opts = config.get_options()
+    try:
+        stage = build_stage(opts)
     except language.ParseException as err:
         logger.error('Error de parseo en {}'.format(opts.script))
         logger.error(err)
@@ -25,20 +100,19 @@ if opts.script:
         logger.error('>>> {}'.format(err.line))
         logger.error('---' + '-'*err.col + '^')
         sys.exit()
+    if opts.jobs > 1:
+        if opts.profile:
+            logger.warning('--profile solo se admite con --jobs 1')
+            opts.profile = None
+        if not export_parallel(opts):
+            sys.exit(1)
+    else:
+        for frame in range(stage.num_frames):
+            stage.draw(frame)
+        if stage.profiler:
+            stage.profiler.save(opts.profile, opts.profile_format)
+            print(stage.profiler.report())
 
-    actors = [language.get_actor(_) for _ in language.actors_list()]
-    engine = SVGEngine(output_dir=opts.output_dir)
-    stage = Stage(engine, options=opts)
-    stage.add_actors(*actors)
-    for t in language.get_actions():
-        interval, action_name, actor_name,  *args = t
-        from_frame, to_frame = interval
-        actor = language.get_actor(actor_name)
-        action = actions.create_action(
-            action_name, actor,
-            from_frame, to_frame,
-            *args
-            )
-        stage.add_action(action)
-    for frame in range(stage.num_frames):
-        stage.draw(frame)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Analizador rápido de scripts Grafel.
+
+Reconoce la misma gramática que `language`, pero con un analizador
+descendente escrito a mano sobre expresiones regulares, sin pasar por
+pyparsing. Deja los mismos actores y acciones en las tablas de
+`language` y, si el script tiene errores, lanza la misma
+`ParseException`: en la misma posición y con el mismo mensaje.
+
+Para eso imita cómo falla pyparsing: de varias alternativas se queda
+con el error que llega más lejos, las repeticiones terminan sin error
+en el primer elemento que no encaja, y el error se da en lo que se
+esperaba a continuación.
+"""
+
+import re
+
+from pyparsing import ParseException, Keyword, Literal, StringEnd
+
+from vectors import Vector
+from colors import Color
+import language
+
+# Espacios y comentarios // que se saltan antes de cada elemento
+SKIP = re.compile(r'(?:[ \t\n\r]*//(?:\\\n|[^\n])*)*[ \t\n\r]*')
+
+KEYWORD_CHARS = frozenset(Keyword.DEFAULT_KEYWORD_CHARS)
+WORD = re.compile('[{}]*'.format(re.escape(Keyword.DEFAULT_KEYWORD_CHARS)))
+
+IDENTIFIER = re.compile(r'[A-Za-z][A-Za-z0-9_]*')
+NUMBER = re.compile(r'[0-9]+')
+INTEGER = re.compile(r'-?[0-9]+')
+ALPHA = re.compile(r'0?\.\d+')
+COLOR_CODE = re.compile(r'#[0-9a-f]{6}', re.IGNORECASE)
+COLOR_NAME = re.compile('|'.join(language.COLOR_NAMES.split()))
+ROLE = re.compile('|'.join(language.ROLES.split()))
+DICE_NUM = re.compile('[123456]')
+SIGN = re.compile('[-+]')
+X = re.compile('x')
+EQUALS = re.compile('=')
+COLON = re.compile(':')
+COMMA = re.compile(',')
+LPAR = re.compile(r'\(')
+RPAR = re.compile(r'\)')
+DOUBLE_QUOTED = re.compile(
+    r'"(?:[^"\n\r\\]|(?:"")|(?:\\(?:[^x]|x[0-9a-fA-F]+)))*'
+    )
+SINGLE_QUOTED = re.compile(
+    r"'(?:[^'\n\r\\]|(?:'')|(?:\\(?:[^x]|x[0-9a-fA-F]+)))*"
+    )
+
+# Tipos de valor de atributos y acciones
+VECTOR, POSITIVE, DICE, QUOTED, ALPHA_VALUE, POINTS, COLOR = range(7)
+
+ATTRS = {
+    'size': VECTOR,
+    'pos': VECTOR,
+    'num': DICE,
+    'side': POSITIVE,
+    'fontsize': POSITIVE,
+    'radius': POSITIVE,
+    'width': POSITIVE,
+    'height': POSITIVE,
+    'text': QUOTED,
+    'filename': QUOTED,
+    'alpha': ALPHA_VALUE,
+    'points': POINTS,
+    'color': COLOR,
+    }
+
+# Acciones y tipo de su argumento, en el orden de `language.Action`
+ACTIONS = {
+    'Move': VECTOR,
+    'Fall': VECTOR,
+    'Land': VECTOR,
+    'EaseIn': VECTOR,
+    'EaseOut': VECTOR,
+    'Swing': VECTOR,
+    'Enter': VECTOR,
+    'Arrow': VECTOR,
+    'Colorize': COLOR,
+    'FadeIn': None,
+    'FadeOut': None,
+    'Exit': None,
+    'Background': None,
+    'Foreground': None,
+    }
+
+FOLLOWED = ', keyword was immediately followed by keyword character'
+PRECEDED = ', keyword was immediately preceded by keyword character'
+
+
+class Fail(Exception):
+    """Fallo de un elemento de la gramática, en la posición `loc`.
+
+    `msg` es el mensaje o una función que lo devuelve, para no
+    calcular los mensajes de pyparsing más que si hacen falta.
+    """
+
+    def __init__(self, loc, msg, pstr=None):
+        self.loc = loc
+        self.msg = msg
+        self.pstr = pstr
+
+    def get_message(self):
+        if callable(self.msg):
+            language.get_parser().streamline()  # Como al parsear
+            return self.msg()
+        return self.msg
+
+
+def expected(text):
+    return lambda: Literal(text).errmsg
+
+
+def keyword_message(word, suffix=''):
+    return lambda: Keyword(word).errmsg + suffix
+
+
+class Parser:
+
+    def __init__(self, text):
+        self.text = text
+        self.size = len(text)
+
+    def skip(self, loc):
+        return SKIP.match(self.text, loc).end()
+
+    def token(self, regex, loc, msg):
+        """Salta espacios y reconoce la expresión regular.
+
+        Devuelve la posición final y el texto reconocido.
+        """
+        loc = SKIP.match(self.text, loc).end()
+        m = regex.match(self.text, loc)
+        if m is None:
+            raise Fail(loc, msg)
+        return m.end(), m.group()
+
+    def keyword(self, word, loc):
+        loc = self.skip(loc)
+        end = loc + len(word)
+        if self.text.startswith(word, loc):
+            if loc > 0 and self.text[loc - 1] in KEYWORD_CHARS:
+                raise Fail(loc - 1, keyword_message(word, PRECEDED))
+            if end < self.size and self.text[end] in KEYWORD_CHARS:
+                raise Fail(end, keyword_message(word, FOLLOWED))
+            return end
+        raise Fail(loc, keyword_message(word))
+
+    def keywords(self, table, loc, msg):
+        """Alternativas que empiezan cada una por una palabra clave.
+
+        Devuelve la posición después de la palabra clave que encaja y
+        la propia palabra. Si no encaja ninguna se falla como lo haría
+        pyparsing: donde falle la palabra clave que llegue más lejos
+        o, si todas fallan al principio, con el mensaje `msg`.
+        """
+        loc = self.skip(loc)
+        word = WORD.match(self.text, loc).group()
+        if loc > 0 and self.text[loc - 1] in KEYWORD_CHARS:
+            raise Fail(loc, msg)
+        if word in table:
+            return loc + len(word), word
+        for keyword in table:
+            if word.startswith(keyword):
+                # Ninguna palabra clave empieza por otra: solo puede
+                # haber una así
+                raise Fail(
+                    loc + len(keyword), keyword_message(keyword, FOLLOWED),
+                    )
+        raise Fail(loc, msg)
+
+    def integer(self, loc):
+        loc = self.skip(loc)
+        m = INTEGER.match(self.text, loc)
+        if m is None:
+            if self.text.startswith('-', loc):
+                loc += 1
+            raise Fail(loc, lambda: language.Positive.errmsg)
+        return m.end(), int(m.group())
+
+    def vector(self, loc):
+        loc, x = self.integer(loc)
+        loc, _ = self.token(X, loc, expected('x'))
+        loc, y = self.integer(loc)
+        return loc, Vector(x, y)
+
+    def color(self, loc):
+        loc = self.skip(loc)
+        m = COLOR_CODE.match(self.text, loc) or COLOR_NAME.match(self.text, loc)
+        if m is None:
+            raise Fail(loc, lambda: language.ColorCode.errmsg)
+        return m.end(), Color(m.group())
+
+    def quoted(self, loc):
+        loc = self.skip(loc)
+        for regex, quote in ((DOUBLE_QUOTED, '"'), (SINGLE_QUOTED, "'")):
+            m = regex.match(self.text, loc)
+            if m is not None:
+                end = m.end()
+                if not self.text.startswith(quote, end):
+                    raise Fail(end, expected(quote))
+                return end + 1, self.text[loc + 1:end]
+        raise Fail(loc, None)
+
+    def points(self, loc):
+        loc, _ = self.token(LPAR, loc, expected('('))
+        loc, point = self.vector(loc)
+        points = [point]
+        while True:
+            try:
+                next_loc, _ = self.token(COMMA, loc, expected(','))
+                next_loc, point = self.vector(next_loc)
+            except Fail:
+                break
+            loc = next_loc
+            points.append(point)
+        loc, _ = self.token(RPAR, loc, expected(')'))
+        return loc, points
+
+    def value(self, kind, loc):
+        # Los errores de los valores que solo aparecen en atributos
+        # nunca llegan a verse: una línea termina en el primer
+        # atributo que no encaja. No necesitan mensaje.
+        if kind == VECTOR:
+            return self.vector(loc)
+        if kind == COLOR:
+            return self.color(loc)
+        if kind == POSITIVE:
+            loc, text = self.token(NUMBER, loc, None)
+            return loc, int(text)
+        if kind == DICE:
+            loc, text = self.token(DICE_NUM, loc, None)
+            return loc, int(text)
+        if kind == QUOTED:
+            return self.quoted(loc)
+        if kind == ALPHA_VALUE:
+            loc, text = self.token(ALPHA, loc, None)
+            return loc, float(text)
+        return self.points(loc)
+
+    def attrs(self, loc):
+        """Atributos de una línea del reparto, mientras los haya.
+        """
+        params = []
+        while True:
+            try:
+                end, word = self.keywords(ATTRS, loc, None)
+                end, value = self.value(ATTRS[word], end)
+            except Fail:
+                return loc, params
+            params.extend((word, value))
+            loc = end
+
+    def castline(self, loc):
+        loc, name = self.token(
+            IDENTIFIER, loc, lambda: language.Identifier.errmsg,
+            )
+        loc, _ = self.token(EQUALS, loc, expected('='))
+        loc, role = self.token(ROLE, loc, lambda: language.role.errmsg)
+        loc, params = self.attrs(loc)
+        try:
+            language.parse_castline((name, role, params))
+        except IndexError:
+            # pyparsing lo convierte en un fallo de la línea
+            raise Fail(0, 'exception raised in parse action', pstr='')
+        return loc
+
+    def interval(self, loc):
+        loc, left = self.integer(loc)
+        try:
+            end, sign = self.token(SIGN, loc, None)
+            end, right = self.integer(end)
+        except Fail:
+            return loc, (left, left + 1)
+        if sign == '-':
+            return end, (left, right)
+        return end, (left, left + right)
+
+    def action_line(self, loc):
+        try:
+            loc, interval = self.interval(loc)
+        except Fail as error:
+            if error.loc == self.skip(loc):
+                error.msg = lambda: language.Interval.errmsg
+            raise
+        end, word = self.keywords(
+            ACTIONS, loc, lambda: language.Action.errmsg,
+            )
+        end, name = self.token(
+            IDENTIFIER, end, lambda: language.Identifier.errmsg,
+            )
+        kind = ACTIONS[word]
+        if kind is None:
+            action = (interval, word, name)
+        else:
+            end, value = self.value(kind, end)
+            action = (interval, word, name, value)
+        language.get_actions().append(action)
+        return end
+
+    def one_or_more(self, element, loc):
+        loc = element(loc)
+        while True:
+            try:
+                loc = element(loc)
+            except Fail:
+                return loc
+
+    def script(self):
+        loc = self.keyword('Cast', 0)
+        loc, _ = self.token(COLON, loc, expected(':'))
+        loc = self.one_or_more(self.castline, loc)
+        loc = self.keyword('Actions', loc)
+        loc, _ = self.token(COLON, loc, expected(':'))
+        loc = self.one_or_more(self.action_line, loc)
+        loc = self.skip(loc)
+        if loc < self.size:
+            raise Fail(loc, lambda: StringEnd().errmsg)
+
+
+def parse(source):
+    """Analiza el texto del script, dejando en `language` sus actores
+    y acciones.
+
+    Si tiene errores lanza `language.ParseException`.
+    """
+    text = source.expandtabs()  # Como pyparsing
+    language.reset()
+    try:
+        Parser(text).script()
+    except Fail as error:
+        pstr = text if error.pstr is None else error.pstr
+        raise ParseException(pstr, error.loc, error.get_message()) from None
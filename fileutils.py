@@ -2,17 +2,78 @@
 # -*- coding: utf-8 -*-
 
 import os
+import struct
 import functools
 import base64
 
-import pygame
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Marcadores JPEG "Start Of Frame", que llevan el tamaño de la imagen
+JPEG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF,
+    }
+
+
+def read_png_size(f):
+    """Tamaño de una imagen PNG, leído de la cabecera IHDR.
+    """
+    header = f.read(24)
+    if len(header) < 24 or header[:8] != PNG_SIGNATURE:
+        return None
+    if header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+
+def read_jpeg_size(f):
+    """Tamaño de una imagen JPEG, leído del primer segmento SOF.
+    """
+    if f.read(2) != b'\xff\xd8':
+        return None
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue  # Marcadores sin datos
+        length = f.read(2)
+        if len(length) < 2:
+            return None
+        length, = struct.unpack('>H', length)
+        if marker in JPEG_SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack('>HH', data[1:5])
+            return (width, height)
+        f.seek(length - 2, os.SEEK_CUR)
+
 
 @functools.lru_cache(maxsize=None)
 def get_image_size(filename):
+    """Ancho y alto de la imagen, en pixels.
+
+    En los ficheros PNG y JPEG solo se lee la cabecera; el resto de
+    formatos se decodifican con pygame.
+    """
     if not os.path.exists(filename):
         raise ValueError(
             'No puedo encontrar el fichero: {}'.format(filename)
             )
+    with open(filename, 'rb') as f:
+        size = read_png_size(f)
+        if size is None:
+            f.seek(0)
+            size = read_jpeg_size(f)
+    if size is not None:
+        return size
+    import pygame
     return pygame.image.load(filename).get_size()
 
 @functools.lru_cache(maxsize=None)
@@ -22,4 +83,3 @@ def get_image_data(filename):
     return 'data:image/png;base64,{}'.format(
         base64.b64encode(buff).decode()
         )
-
@@ -23,13 +23,44 @@ from pyparsing import (
 
 logger = logs.create(__name__)
 
+# Versión de la gramática y de lo que devuelve el parser. Hay que
+# incrementarla si cambian, para descartar los scripts compilados
+GRAMMAR_VERSION = 1
+
 table_of_symbols = {}
+_cast = []
 _actions = []
 
 def get_actions():
     global _actions
     return _actions
 
+def get_cast():
+    """Líneas del reparto (nombre, rol, parámetros), en orden.
+    """
+    global _cast
+    return _cast
+
+def reset():
+    global table_of_symbols, _cast, _actions
+    table_of_symbols.clear()
+    del _cast[:]
+    del _actions[:]
+
+def load_compiled(cast, action_lines):
+    """Recrea los actores y acciones de un script ya analizado.
+
+    Recibe las líneas del reparto como las reconoce el parser
+    (nombre, rol y parámetros alternando nombre y valor) y las
+    acciones de `get_actions`, y deja las tablas como si se acabara
+    de parsear.
+    """
+    global _actions
+    reset()
+    for castline in cast:
+        parse_castline(castline)
+    _actions.extend(action_lines)
+
 def dump(s, loc, toks):
     logger.error('dump s: {}'.format(s))
     logger.error('dump loc: {}'.format(loc))
@@ -64,9 +95,9 @@ def add_action(s, loc, toks):
 
 
 def remove_quotes(s, loc, toks):
-    logger.info('s: {}'.format(s))
-    logger.info('loc: {}'.format(loc))
-    logger.info('toks: {}'.format(toks))
+    logger.info('s: %s', s)
+    logger.info('loc: %s', loc)
+    logger.info('toks: %s', toks)
     result = toks[0]
     return result[1:-1]  
 
@@ -82,17 +113,23 @@ def params_to_dict(sequence):
     return options
 
 def parse_castline(l):
-    logger.info('called parse_castline with l={}'.format(l))
-    global table_of_symbols
+    logger.info('called parse_castline with l=%s', l)
+    global table_of_symbols, _cast
     name, role, args = l
     options = {}
     if args:
         options = params_to_dict(args)
+        if 'points' in options:
+            options['points'] = list(options['points'])
+    _cast.append((name, role, options))
     new_actor = actors.create_actor(name, role, **options)
     table_of_symbols[name] = new_actor
     return l
 
 # Gramatica
+#
+# fastparse.py reconoce la misma gramática a mano: si se cambia aquí,
+# hay que cambiarla también allí
 
 LPAR = Suppress(Literal("("))
 RPAR = Suppress(Literal(")"))
@@ -104,8 +141,9 @@ Positive = Word(nums)
 Integer = Combine(Optional('-')+Word(nums))
 vector = Integer + Literal('x') + Integer
 
-ColorCode = Regex('#[0-9a-f]{6}', re.IGNORECASE) \
-    | oneOf("black white red blue green yellow gold silver gray purple orange") 
+COLOR_NAMES = 'black white red blue green yellow gold silver gray purple orange'
+
+ColorCode = Regex('#[0-9a-f]{6}', re.IGNORECASE) | oneOf(COLOR_NAMES)
 
 attr = (
     Keyword("size") + vector
@@ -127,10 +165,11 @@ attr = (
 
 attrs = ZeroOrMore(attr)
 Identifier = Word(alphas, alphanums+'_')
-role = oneOf(
+ROLES = (
     'Square Rect RoundRect Star Dice Label Text Circle'
     ' Box Triangle Bitmap Path'
     )
+role = oneOf(ROLES)
 castline = (
     Identifier('name')
     + Suppress('=')
@@ -182,4 +221,12 @@ def get_parser():
     return script
 
 
+def parse(source):
+    """Analiza el script con pyparsing, dejando sus actores y acciones
+    en las tablas del módulo.
+    """
+    reset()
+    get_parser().parseString(source)
+
+
 
@@ -1,9 +1,15 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
 
+import os
 import sys
 import logging
 
+# Trazas de las primitivas de dibujo de los motores. Se decide al
+# arrancar, con la variable de entorno GRAFEL_TRACE, para que cuando
+# están desactivadas no cuesten ni la llamada al logger
+TRACE = os.environ.get('GRAFEL_TRACE', '') not in ('', '0')
+
 def create(name, level=logging.WARNING):
     logger = logging.getLogger(name)
     logger.setLevel(level)
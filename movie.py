@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import shutil
+import subprocess
+
+import logs
+
+logger = logs.create(__name__)
+
+# Codificadores soportados, por orden de preferencia
+ENCODERS = ('ffmpeg', 'avconv')
+
+# Bytes por pixel de los formatos de frame admitidos
+PIXEL_FORMATS = {
+    'rgb24': 3,
+    'rgba': 4,
+    'bgra': 4,
+    }
+
+
+def find_encoder():
+    """Ruta del primer codificador de vídeo disponible, o None.
+    """
+    for name in ENCODERS:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+class MovieWriter:
+    """Codifica un vídeo a partir de frames en bruto (RGB o RGBA).
+
+    Se lanza un único proceso `ffmpeg` (o `avconv`) al principio, y
+    cada frame se le envía por su entrada estándar, sin pasar por
+    ficheros intermedios.
+    """
+
+    def __init__(self, filename, width, height, fps, encoder=None,
+                 pix_fmt='rgb24'):
+        self.filename = filename
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.pix_fmt = pix_fmt
+        self.encoder = encoder or find_encoder()
+        if not self.encoder:
+            raise ValueError(
+                'No encuentro ningún codificador de vídeo ({})'.format(
+                    ', '.join(ENCODERS),
+                    ))
+        self.frame_size = width * height * PIXEL_FORMATS[pix_fmt]
+        self.num_frames = 0
+        self.process = None
+        self.returncode = None
+
+    def get_command(self):
+        return [
+            self.encoder,
+            '-y',
+            '-loglevel', 'error',
+            '-f', 'rawvideo',
+            '-pix_fmt', self.pix_fmt,
+            '-s', '{}x{}'.format(self.width, self.height),
+            '-r', str(self.fps),
+            '-i', '-',
+            '-an',
+            '-c:v', 'libx264',
+            '-pix_fmt', 'yuv420p',
+            self.filename,
+            ]
+
+    def open(self):
+        command = self.get_command()
+        logger.info(' '.join(command))
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+        return self
+
+    def write(self, data):
+        """Añade un frame al vídeo.
+
+        `data` es cualquier objeto que soporte el protocolo buffer
+        (bytes, memoryview...) con los pixels del frame, en el
+        formato indicado en `pix_fmt`.
+        """
+        if len(data) != self.frame_size:
+            raise ValueError(
+                'El frame ocupa {} bytes, deberían ser {}'.format(
+                    len(data), self.frame_size,
+                    ))
+        self.process.stdin.write(data)
+        self.num_frames += 1
+
+    def close(self):
+        """Espera a que termine la codificación.
+
+        Devuelve el código de salida del codificador.
+        """
+        if self.process is None:
+            return self.returncode
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass  # El codificador ya había terminado
+        code = self.returncode = self.process.wait()
+        self.process = None
+        if code:
+            logger.error('El codificador terminó con código {}'.format(code))
+        return code
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,7 +1,7 @@
 #!/usr/bin/env
 
 import paver
-from paver.easy import path, task, cmdopts, sh
+from paver.easy import task, cmdopts, sh
 
 
 @task
@@ -10,8 +10,5 @@ def hola(options):
     '''Pruebas con paver.
     '''
     filename = options.hola.filename + '.grafel'
-    tmpdir = path("tmp")
-    tmpdir.rmtree()
-    sh('./export.py {}'.format(filename))
-    sh('./create_movie.py')
+    sh('./create_movie.py {}'.format(filename))
 
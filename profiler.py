@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import time
+import functools
+from contextlib import contextmanager
+
+import logs
+
+logger = logs.create(__name__)
+
+# Máximo de eventos que se guardan para la traza; a partir de ahí
+# solo se acumulan las estadísticas
+MAX_TRACE_EVENTS = 500000
+
+FORMATS = ('json', 'trace')
+
+
+class Profiler:
+    """Tiempos de ejecución, agrupados por categoría y nombre.
+
+    Cada medida suma una llamada y su duración a las estadísticas de
+    su (categoría, nombre), y se guarda como evento para poder
+    exportar una traza que se puede abrir con el visor de Chrome
+    (chrome://tracing) o con Perfetto.
+    """
+
+    def __init__(self, max_events=MAX_TRACE_EVENTS):
+        self.stats = {}  # (categoría, nombre) -> [llamadas, total, máximo]
+        self.events = []  # (categoría, nombre, inicio, fin)
+        self.max_events = max_events
+        self.dropped = 0
+        self.origin = time.perf_counter()
+
+    def add(self, category, name, start, end):
+        elapsed = end - start
+        stat = self.stats.get((category, name))
+        if stat is None:
+            self.stats[(category, name)] = [1, elapsed, elapsed]
+        else:
+            stat[0] += 1
+            stat[1] += elapsed
+            if elapsed > stat[2]:
+                stat[2] = elapsed
+        if len(self.events) < self.max_events:
+            self.events.append((category, name, start, end))
+        else:
+            self.dropped += 1
+
+    @contextmanager
+    def section(self, name, category='stage'):
+        """Mide el tiempo que tarda en ejecutarse el bloque.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(category, name, start, time.perf_counter())
+
+    def call(self, category, name, func, *args, **kwargs):
+        """Llama a la función, midiendo su tiempo.
+        """
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.add(category, name, start, time.perf_counter())
+
+    def wrap(self, func, name, category):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            return self.call(category, name, func, *args, **kwargs)
+        return timed
+
+    def instrument(self, obj, names, category=None):
+        """Sustituye los métodos indicados del objeto por versiones medidas.
+
+        Solo afecta a esa instancia. Por defecto la categoría es el
+        nombre de su clase.
+        """
+        category = category or type(obj).__name__
+        for name in names:
+            method = getattr(obj, name, None)
+            if method is not None:
+                setattr(obj, name, self.wrap(method, name, category))
+
+    def summary(self):
+        """Estadísticas por categoría y nombre (tiempos en segundos).
+        """
+        result = {}
+        for (category, name), (calls, total, maximum) in self.stats.items():
+            result.setdefault(category, {})[name] = {
+                'calls': calls,
+                'total': total,
+                'mean': total / calls,
+                'max': maximum,
+                }
+        return result
+
+    def trace(self):
+        """Eventos en el formato de traza de Chrome (tiempos en µs).
+        """
+        pid = os.getpid()
+        return {
+            'traceEvents': [
+                {
+                    'name': name,
+                    'cat': category,
+                    'ph': 'X',
+                    'ts': (start - self.origin) * 1e6,
+                    'dur': (end - start) * 1e6,
+                    'pid': pid,
+                    'tid': 0,
+                    }
+                for category, name, start, end in self.events
+                ],
+            'displayTimeUnit': 'ms',
+            }
+
+    def report(self, limit=20):
+        """Texto con las entradas que más tiempo total han consumido.
+        """
+        rows = sorted(
+            self.stats.items(), key=lambda item: item[1][1], reverse=True,
+            )
+        lines = ['{:<16} {:<24} {:>8} {:>10} {:>10}'.format(
+            'Categoría', 'Nombre', 'Llamadas', 'Total ms', 'Media µs',
+            )]
+        for (category, name), (calls, total, maximum) in rows[:limit]:
+            lines.append('{:<16} {:<24} {:>8} {:>10.2f} {:>10.2f}'.format(
+                category, name, calls, total * 1e3, total / calls * 1e6,
+                ))
+        return '\n'.join(lines)
+
+    def save(self, filename, format='json'):
+        """Guarda el resumen (json) o la traza de Chrome (trace).
+        """
+        if format not in FORMATS:
+            raise ValueError('Formato de perfil desconocido: {}'.format(format))
+        data = self.summary() if format == 'json' else self.trace()
+        if self.dropped:
+            logger.warning('Traza incompleta: {} eventos descartados'.format(
+                self.dropped,
+                ))
+        with open(filename, 'w') as f:
+            json.dump(data, f, indent=1)
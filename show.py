@@ -6,17 +6,18 @@ import sys
 import pygame
 import language
 
-import actions
-from studio import Stage
+from studio import Stage, load_script
 import config
 import logs
 
 logger = logs.create(__name__)
 opts = config.get_options()
 if opts.script:
-    parser = language.get_parser()
+    stage = Stage(options=opts)
     try:
-        parser.parseFile(opts.script)
+        load_script(
+            stage, opts.script, cache=opts.cache, parser=opts.parser,
+            )
     except language.ParseException as err:
         logger.error('Error de parseo en {}'.format(opts.script))
         logger.error(err)
@@ -25,27 +26,28 @@ if opts.script:
         logger.error('---' + '-'*err.col + '^')
         sys.exit()
 
-    actors = [language.get_actor(_) for _ in language.actors_list()]
-    stage = Stage(options=opts)
-    stage.add_actors(*actors)
-    for t in language.get_actions():
-        interval, action_name, actor_name, *args = t
-        from_frame, to_frame = interval
-        actor = language.get_actor(actor_name)
-        action = actions.create_action(
-            action_name, actor,
-            from_frame, to_frame,
-            *args
-            )
-        stage.add_action(action)
     force_exit = False
-    for frame in range(stage.num_frames):
+    frame = 0
+    while frame < stage.num_frames:
         stage.draw(frame)
+        frame += 1
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 force_exit = True
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     force_exit = True
+                elif event.key == pygame.K_LEFT:  # Retrocede un segundo
+                    frame = stage.seek(max(0, frame - stage.fps))
+                elif event.key == pygame.K_RIGHT:  # Avanza un segundo
+                    frame = stage.seek(min(
+                        stage.num_frames - 1,
+                        frame + stage.fps,
+                        ))
         if force_exit:
             break
+    print('{frames} frames dibujados, {skipped} saltados, {fps:.1f} fps'
+          .format(**stage.engine.stats()))
+    if stage.profiler:
+        stage.profiler.save(opts.profile, opts.profile_format)
+        print(stage.profiler.report())
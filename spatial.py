@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Rectángulos de recorte e índice espacial de actores.
+
+Los rectángulos son tuplas (izquierda, arriba, derecha, abajo), con
+la derecha y abajo excluidas.
+"""
+
+import math
+
+# Lo ocupa todo: nunca se recorta
+UNBOUNDED = (-math.inf, -math.inf, math.inf, math.inf)
+
+# No ocupa nada: es el neutro de `union` y no se solapa con nada
+EMPTY = (math.inf, math.inf, -math.inf, -math.inf)
+
+CELL_SIZE = 128
+
+
+def union(a, b):
+    """Rectángulo que contiene a los dos.
+    """
+    return (
+        a[0] if a[0] < b[0] else b[0],
+        a[1] if a[1] < b[1] else b[1],
+        a[2] if a[2] > b[2] else b[2],
+        a[3] if a[3] > b[3] else b[3],
+        )
+
+
+def overlaps(a, b):
+    """Indica si los dos rectángulos se solapan.
+    """
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def centered(x, y, width, height):
+    """Rectángulo de ese tamaño centrado en (x, y).
+    """
+    return (x - width / 2, y - height / 2, x + width / 2, y + height / 2)
+
+
+class GridIndex:
+    """Índice espacial sobre una rejilla uniforme.
+
+    Cada elemento se apunta en todas las celdas que toca su
+    rectángulo, así que para encontrar los que tocan una zona basta
+    con mirar las celdas de esa zona en vez de todos los elementos.
+    Solo se indexa la parte de cada rectángulo que cae dentro de la
+    zona de `width` x `height` pixels.
+    """
+
+    def __init__(self, width, height, cell_size=CELL_SIZE):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cells = {}  # (columna, fila) -> elementos
+        self.keys = {}  # elemento -> celdas en las que está
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, item):
+        return item in self.keys
+
+    def get_keys(self, rect):
+        size = self.cell_size
+        left = max(rect[0], 0)
+        top = max(rect[1], 0)
+        right = min(rect[2], self.width)
+        bottom = min(rect[3], self.height)
+        if right <= left or bottom <= top:
+            return []
+        return [
+            (col, row)
+            for col in range(int(left // size), math.ceil(right / size))
+            for row in range(int(top // size), math.ceil(bottom / size))
+            ]
+
+    def insert(self, item, rect):
+        """Añade el elemento, o lo cambia de sitio si ya estaba.
+        """
+        if item in self.keys:
+            self.remove(item)
+        keys = self.get_keys(rect)
+        for key in keys:
+            cell = self.cells.get(key)
+            if cell is None:
+                self.cells[key] = {item}
+            else:
+                cell.add(item)
+        self.keys[item] = keys
+
+    def remove(self, item):
+        for key in self.keys.pop(item, ()):
+            cell = self.cells[key]
+            cell.discard(item)
+            if not cell:
+                del self.cells[key]
+
+    def query(self, rect):
+        """Elementos de las celdas que toca el rectángulo.
+
+        Pueden incluir alguno que no lo toque, pero en la misma celda:
+        hay que comprobarlo aparte si hace falta precisión.
+        """
+        result = set()
+        cells = self.cells
+        for key in self.get_keys(rect):
+            cell = cells.get(key)
+            if cell:
+                result.update(cell)
+        return result
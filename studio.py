@@ -1,17 +1,47 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import contextlib
+
 from actors import Level
 from colors import Color
 from vectors import Vector
 from control import Scheduler
 from engines import PyGameEngine
 
+import actions
+import language
+import compiled
 import logs
 import defaults
+from profiler import Profiler
+from spatial import GridIndex, overlaps
+from engines.base_engine import PRIMITIVES
 
 logger = logs.create(__name__)
 
+NO_SECTION = contextlib.nullcontext()
+
+# Niveles que se dibujan, en orden
+DRAW_LEVELS = (Level.ON_BACKGROUND, Level.ON_STAGE, Level.ON_FOREGROUND)
+
+# Nombre de la sección de perfil en la que se dibuja cada nivel
+LEVEL_SECTIONS = {
+    level: 'draw {}'.format(level.name.lower()) for level in Level
+    }
+
+# Margen alrededor de la pantalla al recortar, por los trazos, el
+# antialiasing y las marcas de depuración
+CULL_MARGIN = 4
+
+# A partir de estos actores en escena, el modo incremental busca los
+# que hay que repintar en un índice espacial
+INDEX_MIN_ACTORS = 500
+
+
+def rect_bounds(rect):
+    return (rect.left, rect.top, rect.right, rect.bottom)
+
 
 class Stage():
 
@@ -25,6 +55,12 @@ class Stage():
             self.background = Color(options.background)
             self.foreground = Color(options.foreground)
             self.grid = options.grid
+            self.checkpoint_interval = options.checkpoint_interval
+            self.incremental = options.incremental
+            self.pacing = options.pacing
+            self.culling = options.culling
+            self.vectorized = options.vectorized
+            profile = options.profile
         else:
             self.width = defaults.WIDTH
             self.height = defaults.HEIGHT
@@ -34,15 +70,34 @@ class Stage():
             self.background = Color(defaults.BACKGROUND)
             self.foreground = Color(defaults.FOREGROUND)
             self.grid = defaults.GRID
+            self.checkpoint_interval = defaults.CHECKPOINT_INTERVAL
+            self.incremental = defaults.INCREMENTAL
+            self.pacing = defaults.PACING
+            self.culling = defaults.CULLING
+            self.vectorized = defaults.VECTORIZED
+            profile = None
         self.engine = engine if engine else PyGameEngine(
              width=self.width,
              height=self.height,
-             fps=self.fps
+             fps=self.fps,
+             incremental=self.incremental,
+             pacing=self.pacing,
              )
         self.engine.fg_color = self.foreground
         self.engine.bgcolor = self.background
-        self.scheduler = scheduler if scheduler else Scheduler()
+        self.scheduler = scheduler if scheduler else Scheduler(
+            checkpoint_interval=self.checkpoint_interval,
+            vectorized=self.vectorized,
+            )
         self.actors = []
+        self.buckets = None  # Actores en escena por nivel, en orden
+        self.visible = None
+        self.order = None  # Posición de cada actor en `visible`
+        self.drawn = None  # Zona ocupada por cada actor (modo incremental)
+        self.index = None  # Índice espacial de `drawn`
+        self.profiler = None
+        if profile:
+            self.set_profiler(Profiler())
         self.refs = {
             'center': self.size / 2,
             'top_right': Vector(self.width, 0),
@@ -52,25 +107,237 @@ class Stage():
             }
 
     def add_actor(self, actor):
-        self.actors.append(actor)
+        self.add_actors(actor)
 
     def add_actors(self, *args):
+        for actor in args:
+            if self not in actor.stages:
+                actor.stages += (self,)
         self.actors.extend(args)
+        self.buckets = None
+
+    def level_changed(self, actor):
+        """Aviso de un actor del escenario que cambia de nivel.
+        """
+        self.buckets = None
 
     def add_action(self, action):
         self.scheduler.add_action(action)
 
+    def set_profiler(self, profiler):
+        """Mide los tiempos de dibujo, de las primitivas del motor y
+        del step de las acciones.
+        """
+        self.profiler = profiler
+        self.scheduler.profiler = profiler
+        profiler.instrument(self.engine, PRIMITIVES)
+
+    def section(self, name):
+        """Contexto que mide una fase del dibujo, si se está perfilando.
+        """
+        if self.profiler is None:
+            return NO_SECTION
+        return self.profiler.section(name)
+
+    def seek(self, frame):
+        return self.scheduler.seek(frame)
+
+    def get_level_buckets(self):
+        """Actores en escena agrupados por nivel, en orden de dibujo.
+
+        Devuelve una lista de pares (nivel, actores), sin los niveles
+        vacíos. Solo se recalcula si algún actor del escenario ha
+        cambiado de nivel (avisa con `level_changed`) o se han añadido
+        actores; las listas son compartidas, y no se deben modificar.
+        """
+        if self.buckets is None:
+            buckets = {level: [] for level in DRAW_LEVELS}
+            for actor in self.actors:
+                bucket = buckets.get(actor.level)
+                if bucket is not None:
+                    bucket.append(actor)
+            self.buckets = [
+                (level, buckets[level]) for level in DRAW_LEVELS
+                if buckets[level]
+                ]
+            self.visible = [
+                actor for level, bucket in self.buckets for actor in bucket
+                ]
+            self.order = None
+        return self.buckets
+
+    def get_visible_actors(self):
+        """Actores en escena, en el orden en que hay que dibujarlos.
+        """
+        self.get_level_buckets()
+        return self.visible
+
+    def get_draw_order(self):
+        """Posición de cada actor en escena en el orden de dibujo.
+        """
+        visible = self.get_visible_actors()
+        if self.order is None:
+            self.order = {actor: i for i, actor in enumerate(visible)}
+        return self.order
+
+    def get_viewport(self):
+        """Zona de pantalla fuera de la cual no se dibujan actores.
+
+        Es `None` si no se recortan.
+        """
+        if not self.culling:
+            return None
+        return (
+            -CULL_MARGIN,
+            -CULL_MARGIN,
+            self.engine.width + CULL_MARGIN,
+            self.engine.height + CULL_MARGIN,
+            )
+
+    def measure(self, actor, viewport):
+        """Zona que ocupa el actor, o `None` si no se ve.
+        """
+        if viewport is not None and not overlaps(actor.get_bounds(), viewport):
+            return None
+        return self.engine.measure(actor)
+
+    def invalidate(self):
+        """Fuerza a repintar todo el escenario en el siguiente frame.
+
+        Solo es necesario si se cambian propiedades de los actores que
+        no marcan cambios (`width`, `radius`...): en modo incremental,
+        y para que se vuelva a calcular la zona que ocupa cada actor.
+        """
+        self.drawn = None
+        self.index = None
+        for actor in self.actors:
+            actor.invalidate_bounds()
+
     def draw(self, frame):
-        self.engine.clear(frame, grid=self.grid)
-        actives = [_ for _ in self.actors if _.level > Level.OFF_STAGE]
-        background = [_ for _ in actives if _.level == Level.ON_BACKGROUND]
-        for actor in background:
-            actor.start_draw(self.engine)
-        on_stage = [_ for _ in actives if _.level == Level.ON_STAGE]
-        for actor in on_stage:
-            actor.start_draw(self.engine)
-        foreground = [_ for _ in actives if _.level == Level.ON_FOREGROUND]
-        for actor in foreground:
-            actor.start_draw(self.engine)
-        self.engine.end()
-        self.scheduler.next()
+        with self.section('frame'):
+            if self.engine.skip_frame(frame):
+                pass  # Va con retraso: solo se avanza la animación
+            elif self.engine.incremental and self.drawn is not None:
+                self.draw_damaged(frame)
+            else:
+                self.draw_all(frame)
+            with self.section('scheduler'):
+                self.scheduler.next()
+
+    def draw_all(self, frame):
+        """Dibuja todo el escenario.
+
+        Los actores fuera de `get_viewport` se recortan comprobando
+        uno a uno su rectángulo, que cada actor guarda mientras no
+        cambie. No se usa el índice espacial: guarda lo dibujado en el
+        frame anterior, solo existe en modo incremental y se rehace
+        aquí mismo; mantener otro con la posición actual de todos los
+        actores costaría lo mismo que la comprobación.
+        """
+        with self.section('clear'):
+            self.engine.clear(frame, grid=self.grid)
+        with self.section('levels'):
+            buckets = self.get_level_buckets()
+        engine = self.engine
+        viewport = self.get_viewport()
+        for level, bucket in buckets:
+            with self.section(LEVEL_SECTIONS[level]):
+                if viewport is None:
+                    for actor in bucket:
+                        actor.start_draw(engine)
+                else:
+                    for actor in bucket:
+                        if overlaps(actor.get_bounds(), viewport):
+                            actor.start_draw(engine)
+        with self.section('end'):
+            engine.end()
+        if engine.incremental:
+            with self.section('measure'):
+                visible = self.get_visible_actors()
+                self.drawn = {}
+                self.index = None
+                if len(visible) >= INDEX_MIN_ACTORS:
+                    self.index = GridIndex(engine.width, engine.height)
+                for actor in visible:
+                    rect = self.drawn[actor] = self.measure(actor, viewport)
+                    if rect and self.index is not None:
+                        self.index.insert(actor, rect_bounds(rect))
+                for actor in self.actors:
+                    actor.clean()
+
+    def draw_damaged(self, frame):
+        """Repinta solo las zonas de los actores que han cambiado.
+
+        Cada zona dañada (la que ocupaba el actor y la que ocupa
+        ahora) se limpia y se vuelven a dibujar, en orden, todos los
+        actores que la tocan.
+        """
+        engine = self.engine
+        index = self.index
+        viewport = self.get_viewport()
+        with self.section('damage'):
+            damage = []
+            for actor in self.actors:
+                if not actor.dirty:
+                    continue
+                old_rect = self.drawn.pop(actor, None)
+                if old_rect:
+                    damage.append(old_rect)
+                    if index is not None:
+                        index.remove(actor)
+                if actor.level > Level.OFF_STAGE:
+                    new_rect = self.measure(actor, viewport)
+                    self.drawn[actor] = new_rect
+                    if new_rect:
+                        damage.append(new_rect)
+                        if index is not None:
+                            index.insert(actor, rect_bounds(new_rect))
+            damage = engine.merge_rects(damage)
+        if damage is None:
+            return self.draw_all(frame)
+        with self.section('levels'):
+            visible = self.get_visible_actors()
+            if index is not None:
+                order = self.get_draw_order()
+        with self.section('redraw'):
+            for rect in damage:
+                engine.clear_rect(frame, rect, grid=self.grid)
+                if index is None:
+                    candidates = visible
+                else:
+                    candidates = sorted(
+                        [_ for _ in index.query(rect_bounds(rect))
+                         if _ in order],
+                        key=order.__getitem__,
+                        )
+                for actor in candidates:
+                    actor_rect = self.drawn.get(actor)
+                    if actor_rect and actor_rect.colliderect(rect):
+                        actor.start_draw(engine)
+        with self.section('end'):
+            engine.end(damage)
+        for actor in self.actors:
+            actor.clean()
+
+
+def load_script(stage, filename, cache=defaults.CACHE,
+                parser=defaults.PARSER):
+    """Añade al escenario los actores y acciones definidos en el script.
+
+    Si el script tiene errores se propaga la `language.ParseException`.
+    Con `cache` se usa (o se crea) el script compilado `.grafelc`;
+    `parser` es el analizador del script: fast o pyparsing.
+    """
+    compiled.load(filename, cache=cache, parser=parser)
+    stage.add_actors(*[language.get_actor(_) for _ in language.actors_list()])
+    for t in language.get_actions():
+        interval, action_name, actor_name, *args = t
+        from_frame, to_frame = interval
+        actor = language.get_actor(actor_name)
+        action = actions.create_action(
+            action_name, actor,
+            from_frame, to_frame,
+            *args
+            )
+        stage.add_action(action)
+    return stage
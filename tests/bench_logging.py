@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Coste por frame de las trazas de las primitivas de dibujo.
+
+Dibuja una escena sintética (la de bench_scenes.py) con BaseEngine,
+que no hace más que trazar cada primitiva, en tres modos:
+
+- sin trazas: la opción por defecto (GRAFEL_TRACE sin definir)
+- trazas inactivas: con GRAFEL_TRACE, pero el logger en WARNING; se
+  llama al logger pero no se formatea ningún mensaje
+- trazas activas: el logger en INFO, escribiendo en /dev/null; todos
+  los mensajes se formatean, como ocurría siempre antes
+
+Uso:
+
+    PYTHONPATH=. python tests/bench_logging.py [actores]
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+
+from bench_scenes import create_script
+from studio import Stage, load_script
+from engines import base_engine
+from engines.base_engine import BaseEngine
+
+NUM_FRAMES = 20
+FIRST_FRAME = 40
+REPEAT = 3
+
+
+def set_level(logger, level, stream):
+    logger.setLevel(level)
+    for handler in logger.handlers:
+        handler.setLevel(level)
+        handler.setStream(stream)
+
+
+def frame_time(stage):
+    """Mejor tiempo medio por frame de varias pasadas.
+    """
+    times = []
+    for i in range(REPEAT):
+        stage.seek(FIRST_FRAME)
+        start = time.perf_counter()
+        for frame in range(FIRST_FRAME, FIRST_FRAME + NUM_FRAMES):
+            stage.draw(frame)
+        times.append((time.perf_counter() - start) / NUM_FRAMES)
+    return min(times)
+
+
+def main():
+    num_actors = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with tempfile.NamedTemporaryFile('w', suffix='.grafel') as f:
+        f.write(create_script(num_actors))
+        f.flush()
+        stage = load_script(Stage(BaseEngine()), f.name, cache=False)
+    logger = base_engine.logger
+    modes = (
+        ('sin trazas', False, logging.WARNING),
+        ('trazas inactivas', True, logging.WARNING),
+        ('trazas activas', True, logging.INFO),
+        )
+    print('{} actores, ms por frame'.format(num_actors))
+    times = []
+    with open(os.devnull, 'w') as devnull:
+        for mode, trace, level in modes:
+            base_engine.TRACE = trace
+            set_level(logger, level, devnull)
+            times.append(frame_time(stage))
+            print('{:<18} {:8.3f}'.format(mode, times[-1] * 1e3))
+        set_level(logger, logging.WARNING, sys.stderr)
+    base_engine.TRACE = False
+    print('Ahorro frente a formatear siempre: {:.3f} ms/frame'.format(
+        (times[2] - times[0]) * 1e3,
+        ))
+
+
+if __name__ == '__main__':
+    main()
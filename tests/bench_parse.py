@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Velocidad de los analizadores de scripts, en líneas por segundo.
+
+Analiza scripts sintéticos (los de bench_scenes.py) con el analizador
+propio (fastparse) y con el de pyparsing, y muestra cuántas líneas
+por segundo procesa cada uno. Se cuentan solo las líneas con algo,
+sin las vacías. Cada analizador crea también los actores, igual que
+al cargar un script.
+
+Uso:
+
+    PYTHONPATH=. python tests/bench_parse.py [actores ...]
+"""
+
+import sys
+
+from bench_scenes import create_script, best_of
+import compiled
+
+SIZES = (100, 1000, 10000)
+REPEAT = 3
+
+
+def main():
+    sizes = [int(_) for _ in sys.argv[1:]] or SIZES
+    print('{:>7} {:>7} {:<10} {:>10} {:>12}'.format(
+        'Actores', 'Líneas', 'Parser', 'ms', 'Líneas/s',
+        ))
+    for num_actors in sizes:
+        source = create_script(num_actors)
+        num_lines = len([_ for _ in source.splitlines() if _.strip()])
+        times = {}
+        for name, parse in compiled.PARSERS.items():
+            times[name] = best_of(REPEAT, lambda: parse(source))
+            print('{:>7} {:>7} {:<10} {:>10.1f} {:>12.0f}'.format(
+                num_actors, num_lines, name, times[name] * 1e3,
+                num_lines / times[name],
+                ))
+        print('{:>7} {:>7} {:<10} {:>10.1f}x'.format(
+            '', '', 'mejora', times['pyparsing'] / times['fast'],
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Frames por segundo de PyGameEngine en una escena con muchos polígonos.
+
+Dibuja, sin límite de frames por segundo, una escena con estrellas,
+triángulos y dados (círculos y rectángulos redondeados) en movimiento,
+de dos formas:
+
+- pantalla completa: como antes, cada polígono en una superficie
+  nueva del tamaño de la pantalla y cada círculo en una de 4r x 4r
+- rectángulo: en superficies del tamaño de su rectángulo, recortadas
+  a la pantalla y reutilizadas (lo que hace PyGameEngine)
+
+Uso:
+
+    SDL_VIDEODRIVER=dummy PYTHONPATH=. python tests/bench_polygons.py [estrellas]
+"""
+
+import sys
+import time
+import random
+
+import pygame
+
+from actors import Star, Triangle, Dice
+from actions import Move, Swing
+from engines import PyGameEngine
+import colors
+from studio import Stage
+from vectors import Vector
+
+NUM_FRAMES = 100
+
+
+class FullScreenEngine(PyGameEngine):
+    """PyGameEngine con el polígono y el círculo de antes.
+    """
+
+    def circle(self, x, y, r, color=None, alpha=1.0):
+        if self.touch(x - r, y - r, 2*r + 1, 2*r + 1):
+            return
+        color = color or self.fg_color
+        color = self.add_alpha_color(color, alpha)
+        side = r << 2
+        s = self.get_surface(side, side)
+        pygame.draw.circle(s, color, (r, r), r, 0)
+        self.screen.blit(s, (x-r, y-r))
+
+    def polygon(self, x, y, rpoints, color=None, alpha=1.0):
+        color = color or self.fg_color
+        color = self.add_alpha_color(color, alpha)
+        points = [(x, y)]
+        for p in rpoints:
+            x += p[0]
+            y += p[1]
+            points.append((x, y))
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        if self.touch(
+                min(xs) - 3, min(ys) - 3,
+                max(xs) - min(xs) + 7, max(ys) - min(ys) + 7,
+                ):
+            return
+        s = self.get_surface()
+        pygame.draw.polygon(s, color, points, 0)
+        if self.debug:
+            for p in points:
+                v = (p[0], p[1])
+                pygame.draw.circle(s, colors.red.as_rgb(), v, 3, 0)
+        self.screen.blit(s, (0, 0))
+
+
+def create_stage(engine, num_stars):
+    rnd = random.Random(0)
+    stage = Stage(engine)
+    for i in range(num_stars):
+        Klass = Star if i % 2 else Triangle
+        actor = Klass(
+            'polygon{}'.format(i),
+            pos=(rnd.randint(0, stage.width), rnd.randint(0, stage.height)),
+            )
+        stage.add_actor(actor)
+        stage.add_action(Move(actor, 0, NUM_FRAMES, Vector(
+            rnd.randint(0, stage.width), rnd.randint(0, stage.height),
+            )))
+    for i in range(num_stars // 10):
+        dice = Dice(
+            'dice{}'.format(i), num=1 + i % 6,
+            pos=(rnd.randint(0, stage.width), rnd.randint(0, stage.height)),
+            )
+        stage.add_actor(dice)
+        stage.add_action(Swing(dice, 0, NUM_FRAMES, Vector(
+            rnd.randint(0, stage.width), rnd.randint(0, stage.height),
+            )))
+    return stage
+
+
+def frames_per_second(engine, num_stars):
+    stage = create_stage(engine, num_stars)
+    start = time.perf_counter()
+    for frame in range(NUM_FRAMES):
+        stage.draw(frame)
+    return NUM_FRAMES / (time.perf_counter() - start)
+
+
+def main():
+    num_stars = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print('{} polígonos, {} dados, frames por segundo'.format(
+        num_stars, num_stars // 10,
+        ))
+    fps = []
+    for name, Engine in (
+            ('pantalla completa', FullScreenEngine),
+            ('rectángulo', PyGameEngine),
+            ):
+        fps.append(frames_per_second(Engine(pacing='uncapped'), num_stars))
+        print('{:<18} {:8.1f}'.format(name, fps[-1]))
+    print('Mejora: {:.1f}x'.format(fps[1] / fps[0]))
+
+
+if __name__ == '__main__':
+    main()
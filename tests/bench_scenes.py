@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Benchmark de escenas sintéticas grandes, con control de regresiones.
+
+Genera scripts Grafel al estilo de make-betsy-one.py, con 100, 1000
+y 10000 actores (etiquetas, cuadrados, círculos, estrellas...) y
+acciones de movimiento con distintas curvas, cambios de color y
+fundidos. Para cada tamaño mide:
+
+- parse: cargar el script en un escenario, parseándolo
+- load_compiled: cargarlo desde el script compilado (.grafelc)
+- schedule: avanzar el planificador por toda la animación, sin dibujar
+- render_<motor>: tiempo medio por frame dibujando con BaseEngine,
+  SVGEngine (svgwrite), SVGStreamEngine y RasterEngine
+
+De cada fase se toma el mejor de varios intentos. Los resultados se
+pueden guardar en JSON y comparar con una línea base: si alguna fase
+es más lenta que en la base en más del umbral indicado, se muestra
+como regresión y el programa termina con error.
+
+Uso:
+
+    PYTHONPATH=. python tests/bench_scenes.py [--sizes 100,1000]
+        [--output resultados.json] [--baseline base.json]
+        [--threshold 0.2]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+
+from studio import Stage, load_script
+from engines import SVGEngine, SVGStreamEngine, RasterEngine
+from engines.base_engine import BaseEngine
+
+SIZES = (100, 1000, 10000)
+NUM_FRAMES = 100
+RENDER_FROM = 40  # Primer frame que se dibuja, con la animación en marcha
+RENDER_FRAMES = 10
+REPEAT = 3
+THRESHOLD = 0.2  # Máximo empeoramiento admitido respecto a la base
+
+ROLES = (
+    ('Label', 'text "{num:.2f}"'),
+    ('Square', ''),
+    ('RoundRect', 'width 40 height 30'),
+    ('Circle', 'radius 12'),
+    ('Star', 'radius 15'),
+    )
+MOVES = ('Move', 'Fall', 'Land', 'EaseIn', 'EaseOut', 'Swing', 'Enter')
+COLORS = ('#FFF68F', '#7FFFD4', '#FF7F50', '#18838B', '#9C661F', '#FF6103')
+
+
+def create_script(num_actors, num_frames=NUM_FRAMES, seed=0):
+    """Script Grafel con `num_actors` actores y sus acciones.
+    """
+    rnd = random.Random(seed)
+    cast = ['Cast:\n']
+    actions = ['Actions:\n']
+    for i in range(num_actors):
+        role, params = ROLES[i % len(ROLES)]
+        name = 'a_{}'.format(i)
+        cast.append('    {} = {} {} pos {}x{} color {}'.format(
+            name, role, params.format(num=rnd.uniform(-1000, 1000)),
+            rnd.randrange(1280), -100, rnd.choice(COLORS),
+            ))
+        start = rnd.randrange(0, num_frames // 4)
+        finish = start + rnd.randrange(10, num_frames // 2)
+        actions.append('    {}-{} {} {} {}x{}'.format(
+            start, finish, rnd.choice(MOVES), name,
+            rnd.randrange(1280), rnd.randrange(720),
+            ))
+        if i % 3 == 0:
+            start = rnd.randrange(num_frames // 2, num_frames - 10)
+            actions.append('    {}-{} Colorize {} {}'.format(
+                start, start + 10, name, rnd.choice(COLORS),
+                ))
+        if i % 7 == 0:
+            start = rnd.randrange(num_frames // 2, num_frames - 10)
+            actions.append('    {}-{} FadeOut {}'.format(
+                start, start + 10, name,
+                ))
+    return '\n'.join(cast + [''] + actions) + '\n'
+
+
+def best_of(repeat, func, setup=None):
+    """Mejor tiempo (en segundos) de varias ejecuciones de la función.
+
+    Si se indica, `setup` se llama antes de cada una, fuera de la
+    medida.
+    """
+    times = []
+    for i in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def bench_size(num_actors, repeat, render_frames, output_dir):
+    filename = os.path.join(output_dir, 'scene_{}.grafel'.format(num_actors))
+    with open(filename, 'w') as f:
+        f.write(create_script(num_actors))
+    results = {}
+
+    def load(engine=None, cache=False):
+        return load_script(Stage(engine or BaseEngine()), filename, cache)
+
+    results['parse'] = best_of(repeat, load)
+    load(cache=True)  # Crea el compilado
+    results['load_compiled'] = best_of(repeat, lambda: load(cache=True))
+
+    stage = load()
+
+    def schedule():
+        for frame in range(NUM_FRAMES):
+            stage.scheduler.next()
+
+    results['schedule'] = best_of(repeat, schedule, stage.scheduler.reset)
+
+    engines = {
+        'base': BaseEngine,
+        'svg': lambda: SVGEngine(output_dir=output_dir),
+        'svg_stream': lambda: SVGStreamEngine(output_dir=output_dir),
+        'raster': RasterEngine,
+        }
+    for name, create_engine in engines.items():
+        stage = load(create_engine())
+
+        def render():
+            for frame in range(RENDER_FROM, RENDER_FROM + render_frames):
+                stage.draw(frame)
+
+        def seek():
+            stage.seek(RENDER_FROM)
+
+        elapsed = best_of(repeat, render, seek)
+        results['render_' + name] = elapsed / render_frames
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Compara con la línea base. Devuelve las fases que empeoran.
+    """
+    regressions = []
+    print('{:>6} {:<18} {:>12} {:>12} {:>8}'.format(
+        'Actores', 'Fase', 'Base ms', 'Ahora ms', 'Cambio',
+        ))
+    for size, phases in results.items():
+        for phase, elapsed in phases.items():
+            base = baseline.get(size, {}).get(phase)
+            if not base:
+                continue
+            change = elapsed / base - 1
+            mark = ''
+            if change > threshold:
+                mark = '  <-- REGRESIÓN'
+                regressions.append((size, phase, change))
+            print('{:>6} {:<18} {:>12.3f} {:>12.3f} {:>+7.0%}{}'.format(
+                size, phase, base * 1e3, elapsed * 1e3, change, mark,
+                ))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '--sizes', default=','.join(str(_) for _ in SIZES),
+        help='Número de actores de cada escena, separados por comas',
+        )
+    parser.add_argument('--repeat', type=int, default=REPEAT)
+    parser.add_argument('--render-frames', type=int, default=RENDER_FRAMES)
+    parser.add_argument('--output', help='Guardar los resultados en JSON')
+    parser.add_argument('--baseline', help='Resultados JSON de referencia')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    output_dir = tempfile.mkdtemp(prefix='tmp_bench')
+    results = {}
+    try:
+        for num_actors in [int(_) for _ in args.sizes.split(',')]:
+            results[str(num_actors)] = phases = bench_size(
+                num_actors, args.repeat, args.render_frames, output_dir,
+                )
+            for phase, elapsed in phases.items():
+                print('{:>6} {:<18} {:>12.3f} ms'.format(
+                    num_actors, phase, elapsed * 1e3,
+                    ))
+    finally:
+        shutil.rmtree(output_dir)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results,
+                }, f, indent=1)
+
+    if args.baseline:
+        if not os.path.exists(args.baseline):
+            print('No existe la línea base {}: no se compara'.format(
+                args.baseline,
+                ))
+            return
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print('\n{} fases más de un {:.0%} más lentas que la base'.format(
+                len(regressions), args.threshold,
+                ))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""Medida de la memoria que reservan los vectores en cada frame.
+
+Simula el camino caliente de una animación: un paso del planificador
+con acciones de movimiento para todos los actores y el cálculo de la
+posición absoluta de cada actor (y sus hijos) para dibujarlo.
+
+Uso:
+
+    PYTHONPATH=. python tests/bench_vectors.py [num_actores]
+"""
+
+import sys
+import time
+import random
+import tracemalloc
+
+import actions
+from actors import Square
+from control import Scheduler
+from vectors import Vector
+
+NUM_FRAMES = 50
+
+
+def create_scene(num_actors):
+    rnd = random.Random(0)
+    moves = (actions.Move, actions.Fall, actions.Land, actions.Swing)
+    sch = Scheduler()
+    actors = []
+    for i in range(num_actors):
+        actor = Square('bob{}'.format(i), pos=(rnd.randint(0, 800), 100))
+        actor.add_son(Square('bob{}.son'.format(i), pos=(10, 10)))
+        first_frame = rnd.randint(0, 10)
+        sch.add_action(rnd.choice(moves)(
+            actor, first_frame, first_frame + 200,
+            Vector(rnd.randint(0, 800), rnd.randint(0, 600)),
+            ))
+        actors.append(actor)
+    return sch, actors
+
+
+def draw_positions(actors):
+    result = []
+    for actor in actors:
+        result.append(actor.pos + actor.get_offset())
+        for son in actor.sons:
+            result.append(son.pos + son.get_offset())
+    return result
+
+
+def measure(num_actors):
+    sch, actors = create_scene(num_actors)
+    for _ in range(NUM_FRAMES):  # Todas las acciones en curso
+        sch.next()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    sch.next()
+    positions = draw_positions(actors)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    filters = [tracemalloc.Filter(True, '*vectors.py')]
+    stats = after.filter_traces(filters).compare_to(
+        before.filter_traces(filters), 'filename',
+        )
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    start = time.perf_counter()
+    for _ in range(NUM_FRAMES):
+        sch.next()
+        draw_positions(actors)
+    elapsed = (time.perf_counter() - start) / NUM_FRAMES
+    assert len(positions) == 2 * num_actors
+    return blocks, size, elapsed
+
+
+def main():
+    num_actors = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    blocks, size, elapsed = measure(num_actors)
+    print('{} actores'.format(num_actors))
+    print('Bloques reservados por frame: {}'.format(blocks))
+    print('Bytes reservados por frame: {}'.format(size))
+    print('Tiempo por frame: {:.2f} ms'.format(elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
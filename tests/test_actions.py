@@ -132,7 +132,7 @@ class TestColorize(unittest.TestCase):
         self.assertEqual(str(sujeto.color), '#ff9000')
        
     def test_colorize_on_pygame(self):
-        engine = PyGameEngine()
+        engine = PyGameEngine(pacing='uncapped')
         stage = Stage(engine)
         stage.num_frames = 75
         for row in range(50, 780, 100):
@@ -222,6 +222,143 @@ def test_fall_not_in_origin():
 
 
 
+# Test closed form evaluation
+
+def test_value_at_outside_interval():
+    a = actions.Land(Actor('A'), 10, 20, Vector(100, 0))
+    assert a.value_at(5, Vector(0, 0)) == Vector(0, 0)
+    assert a.value_at(20, Vector(0, 0)) == Vector(100, 0)
+    assert a.value_at(500, Vector(0, 0)) == Vector(100, 0)
+
+
+def test_value_at_does_not_change_actor():
+    sujeto = Actor('A', pos=(10, 10), alpha=0.5)
+    a = actions.Move(sujeto, 0, 10, Vector(110, 10))
+    assert a.value_at(4, Vector(10, 10)) == Vector(60, 10)
+    assert sujeto.pos == Vector(10, 10)
+    b = actions.FadeIn(sujeto, 0, 10)
+    assert math.isclose(b.value_at(2, 0.5), 0.8)
+    assert b.value_at(6, 0.5) == 1.0
+    assert sujeto.alpha == 0.5
+
+
+def test_value_at_matches_steps():
+    for Klass in (
+            actions.Move, actions.Fall, actions.Land,
+            actions.EaseIn, actions.EaseOut, actions.Swing,
+            ):
+        sujeto = Actor('A', pos=(20, 40))
+        a = Klass(sujeto, 3, 17, Vector(300, -50))
+        a.start(3)
+        for frame in range(3, 17):
+            a.step(frame)
+            assert sujeto.pos == a.value_at(frame, Vector(20, 40))
+        a.end(17)
+        assert sujeto.pos == a.value_at(17, Vector(20, 40))
+
+
+# Test vectorized evaluation
+
+def create_vectorized_scheduler(vectorized=False):
+    rnd = random.Random(1234)
+    moves = (
+        actions.Move, actions.Fall, actions.Land,
+        actions.EaseIn, actions.EaseOut, actions.Swing,
+        )
+    sch = Scheduler(vectorized=vectorized)
+    for i in range(30):
+        actor = Square('bob{}'.format(i),
+            pos=(rnd.randint(0, 600), rnd.randint(0, 400)),
+            color=colors.random_color(),
+            alpha=rnd.random(),
+            )
+        first_frame = 0
+        for _ in range(3):
+            first_frame = rnd.randint(first_frame, first_frame + 20)
+            last_frame = first_frame + rnd.randint(1, 25)
+            Klass = rnd.choice(moves)
+            target = Vector(rnd.randint(0, 600), rnd.randint(0, 400))
+            sch.add_action(Klass(actor, first_frame, last_frame, target))
+        first_frame = rnd.randint(0, 30)
+        Klass = rnd.choice((actions.FadeIn, actions.FadeOut))
+        sch.add_action(Klass(actor, first_frame, first_frame + 15))
+        sch.add_action(actions.Colorize(
+            actor, first_frame + 5, first_frame + 30, colors.random_color()
+            ))
+    sch.add_action(actions.Blink(actor, 10, 20))  # Sin versión vectorizada
+    return sch
+
+
+def get_state(actors):
+    return {
+        actor: dict(pos=actor.pos, alpha=actor.alpha, color=actor.color)
+        for actor in actors
+        }
+
+
+def assert_same_state(expected, state):
+    for actor in expected:
+        a, b = expected[actor], state[actor]
+        assert math.isclose(a['pos'].x, b['pos'].x, abs_tol=1e-6)
+        assert math.isclose(a['pos'].y, b['pos'].y, abs_tol=1e-6)
+        assert math.isclose(a['alpha'], b['alpha'], abs_tol=1e-9)
+        assert a['color'] == b['color']
+
+
+class TestVectorized(unittest.TestCase):
+
+    def setUp(self):
+        pytest.importorskip('numpy')
+
+    def test_matches_steps(self):
+        import vectorized
+        sch = create_vectorized_scheduler()
+        timeline = vectorized.VectorizedTimeline(sch)
+        self.assertEqual(len(timeline.fallback), 1)
+        for frame in range(90):
+            sch.next()
+            assert_same_state(get_state(sch.actors), timeline.state_at(frame))
+
+    def test_block_of_frames(self):
+        import numpy
+        import vectorized
+        sch = create_vectorized_scheduler()
+        timeline = vectorized.VectorizedTimeline(sch)
+        block = timeline.evaluate(range(0, 90))
+        actors, positions = block['pos']
+        self.assertEqual(positions.shape, (90, len(actors), 2))
+        for frame in (0, 7, 33, 89):
+            single = timeline.evaluate(frame)
+            for attribute in ('pos', 'alpha', 'color'):
+                self.assertTrue(numpy.allclose(
+                    block[attribute][1][frame], single[attribute][1][0],
+                    ))
+
+    def test_apply(self):
+        import vectorized
+        sch = create_vectorized_scheduler()
+        timeline = vectorized.VectorizedTimeline(sch)
+        sch.seek(41)
+        expected = get_state(sch.actors)
+        sch.reset()
+        timeline.apply(40)
+        assert_same_state(expected, get_state(sch.actors))
+
+    def test_scheduler_jump(self):
+        import vectorized
+        sch = create_vectorized_scheduler(vectorized=True)
+        self.assertIsInstance(
+            sch.get_evaluator(), vectorized.VectorizedTimeline,
+            )
+        expected = {}
+        for frame in range(60):
+            expected[frame] = get_state(sch.actors)
+            sch.next()
+        for frame in (41, 3, 59, 0):
+            sch.jump(frame)
+            assert_same_state(expected[frame], get_state(sch.actors))
+
+
 class TestLevel(unittest.TestCase):
 
     def test(self):
@@ -237,7 +374,7 @@ class TestLevel(unittest.TestCase):
         sch.add_action(actions.Background(bg, 100, 101))
         sch.add_action(actions.Foreground(fg, 125, 126))
         sch.add_action(actions.Exit(e, 50, 51))
-        engine = PyGameEngine()
+        engine = PyGameEngine(pacing='uncapped')
         studio = Stage(engine)
         studio.add_actors(t, fg, e, e1, bg)
         for frame in range(150):
@@ -269,7 +406,7 @@ class TestFadeOut(unittest.TestCase):
 
     def test_fade_out_in_pygame(self):
         sch = Scheduler()
-        engine = PyGameEngine()
+        engine = PyGameEngine(pacing='uncapped')
         studio = Stage(engine)
         for row in range(50, 780, 100):
             for col in range(50, 1280, 100):
@@ -318,7 +455,7 @@ class TestFadeIn(unittest.TestCase):
 
     def test_fade_in_in_pygame(self):
         sch = Scheduler()
-        engine = PyGameEngine()
+        engine = PyGameEngine(pacing='uncapped')
         studio = Stage(engine)
         for row in range(50, 780, 100):
             for col in range(50, 1280, 100):
@@ -9,7 +9,8 @@ import random
 
 from vectors import Vector
 import actors
-from actors import Level, Actor, Square, Star
+from actors import Level, Actor, Square, Star, Circle, Triangle, Label
+from spatial import UNBOUNDED
 import colors
 import actions
 from studio import Stage
@@ -50,7 +51,7 @@ class TestActorCenter(unittest.TestCase):
     def get_engine(self):
         from engines import PyGameEngine, SVGEngine
         #return SVGEngine(output_dir='./tmp')
-        return  PyGameEngine()
+        return  PyGameEngine(pacing='uncapped')
 
     def test_all(self):
         import actors
@@ -160,6 +161,10 @@ class TestActor(unittest.TestCase):
         self.assertEqual(a.scale.y, 1)
         self.assertEqual(a.alpha, 1.0)
 
+    def test_actors_do_not_share_scale(self):
+        a, b = Actor('A'), Actor('B')
+        self.assertIsNot(a.scale, b.scale)
+
 
     def test_move_actor(self):
         a = Actor('A')
@@ -179,6 +184,16 @@ class TestLabel(unittest.TestCase):
         self.assertEqual(label.name, 'l1')
         self.assertEqual(label.text, 'L1')
 
+    def test_label_colors_survive_reset(self):
+        label = actors.Label('l1', 'L1', color='#222222', pos=(10, 10))
+        self.assertEqual(label.color, '#222222')
+        self.assertEqual(label._text.color, '#222222')
+        self.assertEqual(label._frame.color, '#dddddd')
+        label.reset()
+        self.assertEqual(label._text.color, '#222222')
+        self.assertEqual(label._frame.color, '#dddddd')
+
+
 class TestSquare(unittest.TestCase):
 
     def test_creacion_square_bob(self):
@@ -230,11 +245,70 @@ class ComposeActors(unittest.TestCase):
         self.assertEqual(c.pos, (11, 22))
         self.assertEqual(c.get_offset(), (60, 80))
 
+    def test_world_pos_is_cached(self):
+        a = Actor('A', pos=(50, 70))
+        b = Actor('B', pos=(10, 10))
+        c = Actor('C', pos=(1, 2))
+        a.add_son(b)
+        b.add_son(c)
+        self.assertEqual(c.get_world_pos(), (61, 82))
+        self.assertIs(c.get_world_pos(), c.get_world_pos())
 
-
-
-
-
+    def test_world_pos_follows_ancestors(self):
+        a = Actor('A', pos=(50, 70))
+        b = Actor('B', pos=(10, 10))
+        c = Actor('C', pos=(1, 2))
+        a.add_son(b)
+        b.add_son(c)
+        self.assertEqual(c.get_world_pos(), (61, 82))
+        a.pos = Vector(0, 0)
+        self.assertEqual(b.get_world_pos(), (10, 10))
+        self.assertEqual(c.get_world_pos(), (11, 12))
+        c.pos = (5, 5)
+        self.assertEqual(c.get_world_pos(), (15, 15))
+        a.reset()
+        self.assertEqual(c.get_world_pos(), (61, 82))
+
+
+class TestBounds(unittest.TestCase):
+
+    def test_square(self):
+        a = Square('a', pos=(100, 50))
+        self.assertEqual(a.get_bounds(), (75, 25, 125, 75))
+
+    def test_polygon(self):
+        t = Triangle('t', pos=(100, 100))
+        left, top, right, bottom = t.get_bounds()
+        self.assertEqual((left, right), (50, 151))
+        self.assertAlmostEqual(top, 100 - 50 / 3)
+        self.assertAlmostEqual(bottom, 100 + 25 - 50 / 3 + 1)
+
+    def test_unknown_actors_are_unbounded(self):
+        self.assertEqual(Actor('a').get_bounds(), UNBOUNDED)
+
+    def test_bounds_are_cached_until_moved(self):
+        a = Square('a', pos=(100, 50))
+        bounds = a.get_bounds()
+        self.assertIs(a.get_bounds(), bounds)
+        a.pos = Vector(0, 0)
+        self.assertEqual(a.get_bounds(), (-25, -25, 25, 25))
+
+    def test_bounds_include_sons(self):
+        p = Square('p', pos=(0, 0))
+        c = Circle('c', radius=10, pos=(100, 0))
+        p.add_son(c)
+        self.assertEqual(p.get_bounds(), (-25, -25, 111, 25))
+        c.pos = Vector(200, 0)
+        self.assertEqual(p.get_bounds(), (-25, -25, 211, 25))
+        p.pos = Vector(0, 100)
+        self.assertEqual(c.get_bounds(), (189, 89, 211, 111))
+
+    def test_label_follows_text(self):
+        label = Label('label', text='Hola', pos=(300, 200))
+        left, top, right, bottom = label.get_bounds()
+        label.text = 'Hola, mundo'
+        self.assertLess(label.get_bounds()[0], left)
+        self.assertGreater(label.get_bounds()[2], right)
 
 
 if __name__ == '__main__':
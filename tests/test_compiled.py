@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+import language
+import compiled
+from studio import Stage, load_script
+from engines.base_engine import BaseEngine
+
+
+def describe():
+    """Actores y acciones que han quedado en las tablas de `language`.
+    """
+    cast = [
+        (name, type(actor).__name__, actor.pos, actor.color.as_svg())
+        for name, actor in language.table_of_symbols.items()
+        ]
+    return cast, [repr(_) for _ in language.get_actions()]
+
+
+class TestCompiled(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='tmp_compiled')
+        self.script = os.path.join(self.tmp_dir, 'casting.grafel')
+        shutil.copy('test_casting.grafel', self.script)
+        self.compiled = os.path.join(self.tmp_dir, 'casting.grafelc')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_compiled_filename(self):
+        self.assertEqual(
+            compiled.get_compiled_filename(self.script), self.compiled,
+            )
+
+    def test_same_result_as_parsing(self):
+        self.assertFalse(compiled.load(self.script))
+        self.assertTrue(os.path.exists(self.compiled))
+        parsed = describe()
+        self.assertTrue(compiled.load(self.script))
+        self.assertEqual(describe(), parsed)
+        self.assertEqual(
+            language.get_actor('t').points,
+            [(30, 30), (-38, 10)],
+            )
+
+    def test_changes_in_source(self):
+        compiled.load(self.script)
+        with open(self.script, 'a') as f:
+            f.write('    200-210 FadeOut bob\n')
+        self.assertFalse(compiled.load(self.script))
+        self.assertEqual(language.get_actions()[-1][1:], ('FadeOut', 'bob'))
+        self.assertTrue(compiled.load(self.script))
+
+    def test_changes_in_grammar(self):
+        compiled.load(self.script)
+        version = language.GRAMMAR_VERSION
+        language.GRAMMAR_VERSION = version + 1
+        try:
+            self.assertFalse(compiled.load(self.script))
+        finally:
+            language.GRAMMAR_VERSION = version
+
+    def test_damaged_file_is_ignored(self):
+        with open(self.compiled, 'wb') as f:
+            f.write(b'\x80\x04not json')
+        self.assertFalse(compiled.load(self.script))
+        self.assertTrue(compiled.load(self.script))
+
+    def test_compiled_is_plain_data(self):
+        compiled.load(self.script)
+        with open(self.compiled) as f:
+            scene = json.load(f)
+        self.assertEqual(
+            sorted(scene), ['actions', 'cast', 'key'],
+            )
+
+    def test_invalid_scene_is_ignored(self):
+        compiled.load(self.script)
+        with open(self.compiled) as f:
+            scene = json.load(f)
+        invalid = (
+            ('cast', 0, 1, 'os'),
+            ('cast', 0, 2, {'__class__': 1}),
+            ('cast', 0, 0, '__import__("os")'),
+            ('actions', 0, 1, 'system'),
+            ('actions', 0, 3, {'pickle': 'x'}),
+            )
+        for table, line, field, value in invalid:
+            with self.subTest(table=table, field=field):
+                damaged = json.loads(json.dumps(scene))
+                damaged[table][line][field] = value
+                with open(self.compiled, 'w') as f:
+                    json.dump(damaged, f)
+                self.assertFalse(compiled.load(self.script))
+                self.assertEqual(describe(), self.parsed())
+
+    def parsed(self):
+        with open(self.script) as f:
+            language.parse(f.read())
+        return describe()
+
+    def test_without_cache(self):
+        self.assertFalse(compiled.load(self.script, cache=False))
+        self.assertFalse(os.path.exists(self.compiled))
+
+    def test_load_script(self):
+        stages = [
+            load_script(Stage(BaseEngine()), self.script) for i in range(2)
+            ]
+        self.assertTrue(os.path.exists(self.compiled))
+        for stage in stages:
+            stage.seek(50)
+        self.assertEqual(
+            [(a.name, a.pos) for a in stages[0].actors],
+            [(a.name, a.pos) for a in stages[1].actors],
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
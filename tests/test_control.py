@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import os
 import sys
+import random
+import tempfile
 import unittest
 
 import control
 
 from actors import Square
-from actions import Fall, Move
+from actions import Action, Fall, Move, Land, Colorize, FadeOut, Exit
 import logs
 
 logger = logs.create('__name__')
@@ -98,5 +101,119 @@ class TestScheduler(unittest.TestCase):
         self.assertEqual(charles.pos, (100, 300))
         self.assertEqual(dorothy.pos, (100, 100))
 
+    def test_many_actors(self):
+        scheduler = control.Scheduler()
+        intervals = []
+        for i in range(500):
+            bob = Square('Bob{}'.format(i), pos=(0, 0))
+            from_frame = random.randrange(0, 90)
+            to_frame = from_frame + random.randrange(1, 20)
+            intervals.append((from_frame, to_frame))
+            scheduler.add_action(Move(bob, from_frame, to_frame, (50, 50)))
+        for frame in range(120):
+            scheduler.next()
+            expected = sum(1 for a, b in intervals if a <= frame < b)
+            self.assertEqual(len(scheduler.active_actions), expected)
+            self.assertEqual(len(scheduler.ends), expected)
+
+
+class Grow(Action):
+    """Acción que no admite evaluación directa.
+    """
+    def step(self, frame):
+        self.actor.scale = self.actor.scale + (0.1, 0.1)
+
+
+def create_scheduler(checkpoint_interval=None):
+    sch = control.Scheduler(checkpoint_interval=checkpoint_interval)
+    bob = Square('Bob', pos=(0, 0), color='red')
+    sch.add_action(Move(bob, 0, 30, (300, 0)))
+    sch.add_action(Land(bob, 30, 60, (300, 300)))
+    sch.add_action(Colorize(bob, 10, 50, 'blue'))
+    sch.add_action(FadeOut(bob, 40, 70))
+    sch.add_action(Fall(bob, 45, 55, (0, 0)))
+    sch.add_action(Exit(bob, 65))
+    return sch, bob
+
+
+def get_state(actor):
+    return (
+        round(actor.pos.x, 6), round(actor.pos.y, 6),
+        str(actor.color), round(actor.alpha, 6),
+        actor.level, round(actor.scale.x, 6),
+        )
+
+
+class TestSeek(unittest.TestCase):
+
+    def setUp(self):
+        sch, bob = create_scheduler()
+        self.expected = {}
+        for frame in range(80):
+            self.expected[frame] = get_state(bob)
+            sch.next()
+
+    def test_seek_forward_without_checkpoints(self):
+        sch, bob = create_scheduler()
+        self.assertEqual(sch.seek(45), 45)
+        self.assertEqual(get_state(bob), self.expected[45])
+
+    def test_state_at(self):
+        sch, bob = create_scheduler()
+        self.assertTrue(sch.is_closed_form())
+        for frame in range(1, 80):
+            sch.reset()
+            sch.apply(frame - 1)
+            self.assertEqual(get_state(bob), self.expected[frame])
+
+    def test_seek_backward(self):
+        sch, bob = create_scheduler(checkpoint_interval=10)
+        sch.add_action(Grow(bob, 20, 40))
+        self.assertFalse(sch.is_closed_form())
+        expected = {}
+        for frame in range(75):
+            expected[frame] = get_state(bob)
+            sch.next()
+        self.assertEqual(sorted(sch.checkpoints), [10, 20, 30, 40, 50, 60, 70])
+        for frame in (33, 5, 61, 0, 74, 40):
+            sch.seek(frame)
+            self.assertEqual(sch.frame, frame)
+            self.assertEqual(get_state(bob), expected[frame])
+
+    def test_no_checkpoints_if_closed_form(self):
+        sch, bob = create_scheduler(checkpoint_interval=10)
+        for frame in range(75):
+            sch.next()
+        self.assertEqual(sch.checkpoints, {})
+
+    def test_jump_then_continue(self):
+        for start in (0, 12, 30, 47, 65):
+            sch, bob = create_scheduler()
+            sch.seek(start)
+            for frame in range(start, 80):
+                self.assertEqual(get_state(bob), self.expected[frame])
+                sch.next()
+
+    def test_checkpoints_on_disk(self):
+        sch, bob = create_scheduler(checkpoint_interval=25)
+        sch.add_action(Grow(bob, 20, 40))
+        expected = {}
+        for frame in range(80):
+            expected[frame] = get_state(bob)
+            sch.next()
+        fd, filename = tempfile.mkstemp(prefix='tmp_checkpoints')
+        os.close(fd)
+        try:
+            sch.save_checkpoints(filename)
+            other_sch, other_bob = create_scheduler(checkpoint_interval=25)
+            other_sch.add_action(Grow(other_bob, 20, 40))
+            other_sch.load_checkpoints(filename)
+        finally:
+            os.unlink(filename)
+        self.assertEqual(sorted(other_sch.checkpoints), [25, 50, 75])
+        other_sch.seek(52)
+        self.assertEqual(get_state(other_bob), expected[52])
+
+
 if __name__ == '__main__':
     unittest.main()
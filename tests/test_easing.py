@@ -23,7 +23,7 @@ def test_easing():
     sch.add_action(actions.EaseIn(ease_in, 5, 70, (700, 700)))
     sch.add_action(actions.EaseOut(ease_out, 5, 70, (900, 700)))
     sch.add_action(actions.Swing(swing, 5, 70, (1100, 700)))
-    engine = PyGameEngine()
+    engine = PyGameEngine(pacing='uncapped')
     stage = Stage(engine)
     stage.add_actors(move, fall, land, ease_in, ease_out, swing)
     for frame in range(75):
@@ -11,6 +11,8 @@ import vectors
 import colors
 import random
 
+import pytest
+
 class TestBaseEngine(unittest.TestCase):
 
     def test_calls(self):
@@ -19,6 +21,35 @@ class TestBaseEngine(unittest.TestCase):
         eng.polygon(0, 0, [(50, 0), (50, 50), (0, 50)], color=colors.white)
         eng.end()
 
+class TestTrace(unittest.TestCase):
+
+    class Color:
+        formatted = 0
+
+        def __str__(self):
+            TestTrace.Color.formatted += 1
+            return 'color'
+
+    def draw(self, trace):
+        from engines import base_engine
+        old_trace, base_engine.TRACE = base_engine.TRACE, trace
+        try:
+            self.Color.formatted = 0
+            eng = base_engine.BaseEngine()
+            eng.line(0, 0, 10, 10, color=self.Color())
+            eng.rect(0, 0, 10, 10, color=self.Color())
+            eng.text(0, 0, 'hola', color=self.Color())
+        finally:
+            base_engine.TRACE = old_trace
+        return self.Color.formatted
+
+    def test_no_formatting_without_trace(self):
+        self.assertEqual(self.draw(trace=False), 0)
+
+    def test_no_formatting_if_level_disabled(self):
+        self.assertEqual(self.draw(trace=True), 0)
+
+
 class TestCreation(unittest.TestCase):
     
     def test_create_base_engine_without_params(self):
@@ -42,7 +73,7 @@ class TestCreation(unittest.TestCase):
             os.rmdir(d)
 
     def test_create_pygame_engine(self):
-        engine = engines.PyGameEngine()
+        engine = engines.PyGameEngine(pacing='uncapped')
         engine.clear(0)
         for i in range(120):
             x = random.randint(0, engine.width)
@@ -209,27 +240,365 @@ def draw_all(engine):
 class TestPyGameEngine(unittest.TestCase):
 
      def test_draw_methods(self):
-        engine = engines.PyGameEngine()
+        engine = engines.PyGameEngine(pacing='uncapped')
         engine.clear(0)
         engine.grid()
         draw_all(engine)
         engine.end()
         time.sleep(4)
 
+     def test_polygon_uses_small_surfaces(self):
+        import pygame
+        engine = engines.PyGameEngine(pacing='uncapped')
+        engine.clear(0)
+        points = [(60, 30), (-20, 50), (-60, -40), (10, -70)]
+        engine.polygon(-10, 40, points, color='gold', alpha=0.7)
+        engine.polygon(300, 200, points, color='red')
+        sizes = list(engine.surfaces.surfaces)
+        self.assertNotIn((engine.width, engine.height), sizes)
+        # El resultado es el mismo que en una superficie de toda la pantalla
+        expected = pygame.Surface((engine.width, engine.height))
+        expected.fill(engine.bg_color.as_rgb())
+        polygons = [(-10, 40, (255, 215, 0, 178)), (300, 200, (255, 0, 0, 255))]
+        for x, y, color in polygons:
+            s = engine.get_surface()
+            vertices = [(x, y)]
+            for dx, dy in points:
+                x += dx
+                y += dy
+                vertices.append((x, y))
+            pygame.draw.polygon(s, color, vertices, 0)
+            expected.blit(s, (0, 0))
+        self.assertEqual(
+            pygame.image.tostring(engine.screen, 'RGB'),
+            pygame.image.tostring(expected, 'RGB'),
+            )
+
 class TestSVGEngine(unittest.TestCase):
 
     
     def test_draw_methods(self):
-        engine = engines.SVGEngine(output_dir='./tmp')
+        with tempfile.TemporaryDirectory(prefix='tmp_test') as output_dir:
+            engine = engines.SVGEngine(output_dir=output_dir)
+            engine.clear(0)
+            draw_all(engine)
+            engine.end()
+       
+
+class TestSurfacePool(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        from engines.surface_pool import SurfacePool
+        pool = SurfacePool(max_bytes=1024*1024)
+        a = pool.get(10, 20)
+        self.assertIs(pool.get(10, 20), a)
+        pool.get(20, 10)
+        self.assertEqual((pool.hits, pool.misses), (1, 2))
+        self.assertEqual(pool.size_in_bytes, 2 * 10 * 20 * 4)
+
+    def test_surfaces_are_cleared(self):
+        from engines.surface_pool import SurfacePool
+        pool = SurfacePool(max_bytes=1024*1024)
+        pool.get(10, 10).fill((255, 0, 0, 255))
+        self.assertEqual(tuple(pool.get(10, 10).get_at((5, 5))), (0, 0, 0, 0))
+
+    def test_lru_eviction(self):
+        from engines.surface_pool import SurfacePool
+        pool = SurfacePool(max_bytes=3 * 100 * 4)
+        pool.get(10, 10)
+        pool.get(5, 20)
+        pool.get(10, 10)
+        pool.get(20, 5)
+        pool.get(25, 4)  # Supera el límite: se descarta (5, 20)
+        self.assertNotIn((5, 20), pool)
+        self.assertIn((10, 10), pool)
+        self.assertEqual(pool.evictions, 1)
+        self.assertLessEqual(pool.size_in_bytes, pool.max_bytes)
+
+    def test_steady_state_does_not_allocate(self):
+        engine = engines.PyGameEngine(pacing='uncapped')
+        for frame in range(2):
+            engine.clear(frame)
+            draw_rects(engine)
+            draw_circles(engine)
+            draw_polygons(engine)
+            engine.end()
+            if frame == 0:
+                misses = engine.surfaces.misses
+        self.assertEqual(engine.surfaces.misses, misses)
+        self.assertGreater(engine.surfaces.hits, 0)
+
+
+class TestFontCache(unittest.TestCase):
+
+    def setUp(self):
+        import pygame
+        pygame.font.init()
+
+    def test_fonts_are_reused(self):
+        from engines.font_cache import FontCache
+        fonts = FontCache()
+        f = fonts.get('Delicious', 32)
+        self.assertIs(fonts.get('Delicious', 32), f)
+        self.assertIsNot(fonts.get('Delicious', 48), f)
+        self.assertIsNot(fonts.get('Delicious', 32, bold=True), f)
+        self.assertEqual((fonts.hits, fonts.misses), (1, 3))
+        self.assertEqual(fonts.hit_rate(), 0.25)
+
+    def test_unknown_family_uses_system_fonts(self):
+        from engines.font_cache import FontCache
+        fonts = FontCache()
+        self.assertIsNotNone(fonts.get('No existe', 20))
+
+    def test_engine_hit_rate(self):
+        engine = engines.PyGameEngine(pacing='uncapped')
         engine.clear(0)
-        draw_all(engine)
+        draw_texts(engine)
         engine.end()
-       
+        self.assertEqual(len(engine.fonts), 2)
+        self.assertGreater(engine.fonts.hit_rate(), 0.5)
+
+
+class TestTextCache(unittest.TestCase):
+
+    def test_alpha_does_not_render_again(self):
+        engine = engines.PyGameEngine(pacing='uncapped')
+        engine.clear(0)
+        for alpha in (1.0, 0.75, 0.5, 0.25):
+            engine.text(200, 200, 'Hola', color='white', alpha=alpha)
+        self.assertEqual(engine.texts.misses, 1)
+        self.assertEqual(engine.texts.hits, 3)
+        # La transparencia se aplica una sola vez
+        row = [engine.screen.get_at((x, 200))[0] for x in range(150, 250)]
+        self.assertEqual(max(row), 255)
+        engine.clear(1)
+        engine.text(200, 200, 'Hola', color='white', alpha=0.5)
+        row = [engine.screen.get_at((x, 200))[0] for x in range(150, 250)]
+        self.assertEqual(max(row), 128)
+
+    def test_new_text_or_color_renders_again(self):
+        engine = engines.PyGameEngine(pacing='uncapped')
+        engine.clear(0)
+        engine.text(200, 200, 'Hola', color='white')
+        engine.text(200, 200, 'Adios', color='white')
+        engine.text(200, 200, 'Hola', color='red')
+        engine.text(200, 200, 'Hola', color='red', font_size=48)
+        self.assertEqual(engine.texts.misses, 4)
+
+    def test_memory_cap(self):
+        engine = engines.PyGameEngine(
+            text_cache_size=64*1024, pacing='uncapped',
+            )
+        engine.clear(0)
+        for i in range(50):
+            engine.text(200, 200, 'Texto {}'.format(i), font_size=48)
+        self.assertGreater(engine.texts.evictions, 0)
+        self.assertLessEqual(engine.texts.size_in_bytes, 64*1024)
+
+
+class TestImageCache(unittest.TestCase):
+
+    def test_images_are_decoded_once(self):
+        engine = engines.PyGameEngine(pacing='uncapped')
+        for frame in range(5):
+            engine.clear(frame)
+            engine.bitmap(300, 300, 'xwing.png', alpha=1.0 - frame / 10)
+            engine.end()
+        self.assertEqual(engine.images.misses, 1)
+        self.assertEqual(engine.images.hits, 4)
+
+    def test_shared_image_with_different_alpha(self):
+        import pygame
+
+        def draw(*bitmaps):
+            engine = engines.PyGameEngine(pacing='uncapped')
+            engine.clear(0)
+            for x, alpha in bitmaps:
+                engine.bitmap(x, 300, 'xwing.png', alpha=alpha)
+            engine.end()
+            return engine
+
+        engine = draw((900, 1.0), (300, 0.3))
+        alone = draw((900, 1.0))
+        area = pygame.Rect(600, 0, 680, 720)
+        self.assertEqual(
+            pygame.image.tostring(engine.screen.subsurface(area), 'RGB'),
+            pygame.image.tostring(alone.screen.subsurface(area), 'RGB'),
+            )
+        self.assertIn(
+            engine.load_image('xwing.png').get_alpha(), (None, 255),
+            )
+
+    def test_scaled_variants(self):
+        engine = engines.PyGameEngine(pacing='uncapped')
+        small = engine.load_image('xwing.png', size=(100, 50))
+        self.assertEqual(small.get_size(), (100, 50))
+        self.assertIs(engine.load_image('xwing.png', size=(100, 50)), small)
+        self.assertIn(('xwing.png', None), engine.images)
+        self.assertEqual(len(engine.images), 2)
+
+
+class TestSVGImages(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp(prefix='tmp_svg')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.output_dir)
+
+    def draw_frame(self, engine):
+        engine.clear(0)
+        engine.bitmap(300, 300, 'xwing.png')
+        engine.end()
+        filename = os.path.join(self.output_dir, 'frame_00000.svg')
+        with open(filename) as f:
+            return f.read()
+
+    def test_embedded_images(self):
+        engine = engines.SVGEngine(output_dir=self.output_dir)
+        svg = self.draw_frame(engine)
+        self.assertIn('data:image/png;base64,', svg)
+
+    def test_linked_images(self):
+        engine = engines.SVGEngine(
+            output_dir=self.output_dir, link_images=True,
+            )
+        svg = self.draw_frame(engine)
+        self.assertNotIn('base64', svg)
+        self.assertIn('xlink:href="xwing.png"', svg)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.output_dir, 'xwing.png'))
+            )
+        self.assertLess(len(svg), 1024)
+
+
+class TestPacing(unittest.TestCase):
+
+    def test_unknown_pacing(self):
+        with self.assertRaises(ValueError):
+            engines.PyGameEngine(pacing='slow')
+
+    def test_uncapped(self):
+        engine = engines.PyGameEngine(fps=5, pacing='uncapped')
+        start = time.perf_counter()
+        for frame in range(20):
+            self.assertFalse(engine.skip_frame(frame))
+            engine.clear(frame)
+            engine.end()
+        self.assertLess(time.perf_counter() - start, 2.0)
+        stats = engine.stats()
+        self.assertEqual(stats['frames'], 20)
+        self.assertEqual(stats['skipped'], 0)
+        self.assertGreater(stats['fps'], 10)
+
+    def test_fixed_waits_for_each_frame(self):
+        engine = engines.PyGameEngine(fps=20, pacing='fixed')
+        start = time.perf_counter()
+        for frame in range(4):
+            self.assertFalse(engine.skip_frame(frame))
+            engine.clear(frame)
+            engine.end()
+        self.assertGreaterEqual(time.perf_counter() - start, 0.19)
+
+    def test_fixed_skips_frames_when_late(self):
+        engine = engines.PyGameEngine(fps=100, pacing='fixed')
+        self.assertFalse(engine.skip_frame(0))
+        time.sleep(0.2)
+        skipped = [engine.skip_frame(frame) for frame in range(1, 8)]
+        max_skip = engines.pygame_engine.MAX_FRAME_SKIP
+        self.assertEqual(skipped[:max_skip], [True] * max_skip)
+        self.assertFalse(skipped[max_skip])
+        self.assertEqual(engine.stats()['skipped'], max_skip + 1)
+        self.assertFalse(engine.skip_frame(500))  # Tras un salto
+
+
+class TestRasterEngine(unittest.TestCase):
+
+    def draw_frame(self, engine, bg_color=colors.black):
+        engine.bg_color = bg_color
+        engine.clear(0, grid=True)
+        engine.rect(20, 30, 100, 50, color='navy', alpha=0.5)
+        engine.box(20, 30, 100, 50, color=colors.yellow)
+        engine.roundrect(200, 30, 100, 50, 10)
+        engine.circle(400, 300, 40, color=colors.green, alpha=0.5)
+        engine.polygon(500, 500, [(50, 0), (0, 50), (-50, 0)])
+        engine.text(640, 360, 'Grafel', font_size=48)
+        engine.bitmap(300, 300, 'xwing.png', alpha=0.75)
+        engine.end()
+
+    def test_same_pixels_as_pygame_engine(self):
+        import pygame
+        screen = engines.PyGameEngine(fps=0)
+        self.draw_frame(screen)
+        raster = engines.RasterEngine()
+        self.draw_frame(raster)
+        self.assertEqual(
+            pygame.image.tostring(raster.screen, 'RGB'),
+            pygame.image.tostring(screen.screen, 'RGB'),
+            )
+
+    def test_frame_is_a_view(self):
+        engine = engines.RasterEngine(width=64, height=32)
+        frame = engine.get_frame()
+        self.assertEqual(len(frame), 64 * 32 * 4)
+        self.assertTrue(frame.readonly)
+        self.draw_frame(engine, bg_color=colors.red)
+        self.assertEqual(bytes(frame[:4]), bytes([0, 0, 255, 255]))
+        self.draw_frame(engine, bg_color=colors.blue)
+        self.assertEqual(bytes(frame[:4]), bytes([255, 0, 0, 255]))
+
+    def test_as_array(self):
+        pytest.importorskip('numpy')
+        engine = engines.RasterEngine(width=64, height=32)
+        self.draw_frame(engine, bg_color=colors.red)
+        pixels = engine.as_array()
+        self.assertEqual(pixels.shape, (32, 64, 3))
+        self.assertEqual(list(pixels[0, 0]), [255, 0, 0])
+        engine.bg_color = colors.blue
+        engine.clear(1)
+        self.assertEqual(list(pixels[0, 0]), [0, 0, 255])
+
+
+class TestSVGStream(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp(prefix='tmp_svg')
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.output_dir)
+
+    def draw_frame(self, engine):
+        engine.clear(0, grid=True)
+        engine.line(10, 10, 200.5, 300, color=colors.red)
+        engine.rect(20, 30, 100, 50, color='navy', alpha=0.5)
+        engine.box(20, 30, 100, 50, color=colors.yellow)
+        engine.roundrect(200, 30, 100, 50, 10, alpha=1e-07)
+        engine.circle(400.25, 300, 40, color=colors.green, alpha=0)
+        engine.polygon(500, 500, [(50, 0), (0.5, 50), (-50, 0)])
+        engine.text(640, 360, 'a < b && "c"', font_size=48)
+        engine.bitmap(300, 300, 'xwing.png', alpha=0.75)
+        engine.end()
+        filename = os.path.join(self.output_dir, 'frame_00000.svg')
+        with open(filename, 'rb') as f:
+            return f.read()
+
+    def test_same_output_as_svgwrite(self):
+        for link_images in (False, True):
+            expected = self.draw_frame(engines.SVGEngine(
+                output_dir=self.output_dir, link_images=link_images,
+                ))
+            svg = self.draw_frame(engines.SVGStreamEngine(
+                output_dir=self.output_dir, link_images=link_images,
+                ))
+            self.assertEqual(svg, expected)
+
 
 class TestGrid(unittest.TestCase):
     
     def test_show_grid(self):
-        engine = engines.PyGameEngine()
+        engine = engines.PyGameEngine(pacing='uncapped')
         engine.clear(0)
         engine.grid()
         engine.end()
@@ -239,7 +608,7 @@ class TestGrid(unittest.TestCase):
 class TestWithActors(unittest.TestCase):
 
     def test_pygame(self):
-        engine = engines.PyGameEngine()
+        engine = engines.PyGameEngine(pacing='uncapped')
         engine.clear(0)
         engine.grid()
         bob = actors.Square('Bob', alpha=0.5)
@@ -280,7 +649,7 @@ class TestBitmap(unittest.TestCase):
     def get_engine(self):
         from engines import PyGameEngine, SVGEngine
         #return SVGEngine(output_dir='./tmp')
-        return  PyGameEngine()
+        return  PyGameEngine(pacing='uncapped')
 
 
     def test(self):
@@ -296,7 +665,7 @@ class TestText(unittest.TestCase):
     def get_engine(self):
         from engines import PyGameEngine, SVGEngine
         # return SVGEngine(output_dir='./tmp')
-        return  PyGameEngine()
+        return  PyGameEngine(pacing='uncapped')
 
 
     def test(self):
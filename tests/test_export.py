@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+import argparse
+
+import defaults
+import export
+
+
+def get_options(output_dir, jobs=1, num_frames=40):
+    return argparse.Namespace(
+        script='pong.grafel',
+        grid=False,
+        num_frames=num_frames,
+        background=defaults.BACKGROUND,
+        foreground=defaults.FOREGROUND,
+        fps=defaults.FPS,
+        size='{}x{}'.format(defaults.WIDTH, defaults.HEIGHT),
+        output_dir=output_dir,
+        jobs=jobs,
+        checkpoint_interval=defaults.CHECKPOINT_INTERVAL,
+        incremental=defaults.INCREMENTAL,
+        cache=False,  # Sin dejar .grafelc junto a los scripts
+        parser=defaults.PARSER,
+        culling=defaults.CULLING,
+        vectorized=defaults.VECTORIZED,
+        pacing=defaults.PACING,
+        link_images=defaults.LINK_IMAGES,
+        svg_engine=defaults.SVG_ENGINE,
+        movie=defaults.MOVIE,
+        encoder=None,
+        profile=None,
+        profile_format=defaults.PROFILE_FORMAT,
+        )
+
+
+class TestChunks(unittest.TestCase):
+
+    def test_chunks_cover_all_frames(self):
+        chunks = list(export.get_chunks(10, 3))
+        self.assertEqual(chunks, [(0, 4), (4, 7), (7, 10)])
+
+    def test_more_jobs_than_frames(self):
+        chunks = list(export.get_chunks(2, 4))
+        self.assertEqual(chunks, [(0, 1), (1, 2)])
+
+
+class TestParallelExport(unittest.TestCase):
+
+    def setUp(self):
+        self.serial_dir = tempfile.mkdtemp(prefix='tmp_serial')
+        self.parallel_dir = tempfile.mkdtemp(prefix='tmp_parallel')
+
+    def tearDown(self):
+        shutil.rmtree(self.serial_dir)
+        shutil.rmtree(self.parallel_dir)
+
+    def test_same_output_as_serial(self):
+        opts = get_options(self.serial_dir)
+        stage = export.build_stage(opts)
+        for frame in range(stage.num_frames):
+            stage.draw(frame)
+        self.assertTrue(export.export_parallel(
+            get_options(self.parallel_dir, jobs=3)
+            ))
+        filenames = sorted(os.listdir(self.serial_dir))
+        self.assertEqual(filenames, sorted(os.listdir(self.parallel_dir)))
+        for filename in filenames:
+            with open(os.path.join(self.serial_dir, filename), 'rb') as f:
+                serial = f.read()
+            with open(os.path.join(self.parallel_dir, filename), 'rb') as f:
+                parallel = f.read()
+            self.assertEqual(serial, parallel, filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
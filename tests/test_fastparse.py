@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import glob
+import unittest
+
+import language
+import fastparse
+
+test_script = '''
+Cast:
+    bob = Square pos 10x-20 color red // comentario
+    txt = Text text "hola" fontsize 12 alpha .5
+    path = Path points (1x2, 3x4,-5x6) color #aaBB00
+    die = Dice num 3 side 40
+
+Actions:
+    1-5 Move bob 30x40
+    7 FadeOut txt
+    2+3 Colorize path gold
+    0 Foreground die
+'''
+
+# Scripts con errores: en cada uno falla un elemento distinto
+broken_scripts = (
+    '',
+    'Cast bob = Square',
+    'Casting: bob = Square Actions: 1 Exit bob',
+    'Cast: 3bob = Square Actions: 1 Exit bob',
+    'Cast: bob = Sqare Actions: 1 Exit bob',
+    'Cast: bob Square Actions: 1 Exit bob',
+    'Cast: bob = Square pos 10 Actions: 1 Exit bob',
+    'Cast: bob = Square Actions: 1 Exits bob',
+    'Cast: bob = Square Actions: x Exit bob',
+    'Cast: bob = Square Actions: 1-x Exit bob',
+    'Cast: bob = Square Actions: 1 Move bob 10*10',
+    'Cast: bob = Square Actions: 1 Colorize bob pink',
+    'Cast: bob = Square Actions: 1 Exit bob 2 Exit',
+    'Cast: bob = Square Actions: 1 Exit bob\n 1-- Exit bob',
+    'Cast: bob = Square Actions: 1Exit bob',
+    'Cast: bob = Path points (1x2, 3x4)) Actions: 1 Exit bob',
+    'Cast: bob = Label text "hola Actions: 1 Exit bob',
+    'Cast: bob = Square text Actions: 1 Exit bob',
+    )
+
+
+def parse(func, source):
+    """Resultado de analizar el script: tablas de `language` o error.
+    """
+    try:
+        func(source)
+    except language.ParseException as err:
+        return err.loc, err.msg, err.lineno, err.col
+    return repr(language.get_cast()), repr(language.get_actions())
+
+
+class TestFastParse(unittest.TestCase):
+
+    def assertSameAsPyparsing(self, source):
+        self.assertEqual(
+            parse(fastparse.parse, source),
+            parse(language.parse, source),
+            )
+
+    def test_cast_and_actions(self):
+        fastparse.parse(test_script)
+        cast = language.get_cast()
+        self.assertEqual([_[0] for _ in cast], ['bob', 'txt', 'path', 'die'])
+        self.assertEqual(cast[1][2], {'text': 'hola', 'fontsize': 12,
+                                      'alpha': 0.5})
+        self.assertEqual(len(cast[2][2]['points']), 3)
+        self.assertEqual(
+            [_[:3] for _ in language.get_actions()], [
+                ((1, 5), 'Move', 'bob'),
+                ((7, 8), 'FadeOut', 'txt'),
+                ((2, 5), 'Colorize', 'path'),
+                ((0, 1), 'Foreground', 'die'),
+                ])
+        self.assertEqual(
+            sorted(language.actors_list()), ['bob', 'die', 'path', 'txt'],
+            )
+
+    def test_same_result_as_pyparsing(self):
+        self.assertSameAsPyparsing(test_script)
+
+    def test_sample_scripts(self):
+        for filename in glob.glob('*.grafel'):
+            with self.subTest(filename=filename):
+                with open(filename, encoding='utf-8') as f:
+                    self.assertSameAsPyparsing(f.read())
+
+    def test_same_errors_as_pyparsing(self):
+        for source in broken_scripts:
+            with self.subTest(source=source):
+                self.assertSameAsPyparsing(source)
+
+    def test_error_is_parse_exception(self):
+        with self.assertRaises(language.ParseException) as cm:
+            fastparse.parse('Cast: bob = Square\nActions:\n 1 Move bob')
+        self.assertEqual(cm.exception.lineno, 3)
+        self.assertEqual(cm.exception.col, 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
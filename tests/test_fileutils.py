@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+
+import pytest
+import pygame
+
+import fileutils
+
+
+@pytest.mark.parametrize('filename', [
+    'mf.png', 'xwing.png', 'disney-logo.png', 'lexer-machine.png',
+    ])
+def test_png_size_from_header(filename):
+    expected = pygame.image.load(filename).get_size()
+    assert fileutils.get_image_size(filename) == expected
+
+
+def test_jpeg_size_from_header():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, 'image.jpg')
+        pygame.image.save(pygame.Surface((37, 21)), filename)
+        with open(filename, 'rb') as f:
+            assert fileutils.read_jpeg_size(f) == (37, 21)
+
+
+def test_missing_file():
+    with pytest.raises(ValueError):
+        fileutils.get_image_size('no-existe.png')
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+import create_movie
+import movie
+from test_export import get_options
+
+# Codificador falso: guarda en el fichero de salida lo que recibe
+FAKE_ENCODER = '''#!{}
+import sys
+with open(sys.argv[-1], 'wb') as f:
+    f.write(sys.stdin.buffer.read())
+'''.format(sys.executable)
+
+
+class TestMovieWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp(prefix='tmp_movie')
+        self.encoder = os.path.join(self.output_dir, 'encoder')
+        with open(self.encoder, 'w') as f:
+            f.write(FAKE_ENCODER)
+        os.chmod(self.encoder, 0o755)
+        self.filename = os.path.join(self.output_dir, 'out.mp4')
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def read_output(self):
+        with open(self.filename, 'rb') as f:
+            return f.read()
+
+    def test_frames_are_piped(self):
+        writer = movie.MovieWriter(
+            self.filename, 4, 2, 25, encoder=self.encoder,
+            )
+        with writer:
+            writer.write(bytes(24))
+            writer.write(b'\xff' * 24)
+        self.assertEqual(writer.returncode, 0)
+        self.assertEqual(writer.num_frames, 2)
+        self.assertEqual(self.read_output(), bytes(24) + b'\xff' * 24)
+
+    def test_wrong_frame_size(self):
+        writer = movie.MovieWriter(
+            self.filename, 4, 2, 25, encoder=self.encoder,
+            )
+        with writer:
+            with self.assertRaises(ValueError):
+                writer.write(bytes(23))
+
+    def test_create_movie(self):
+        opts = get_options(self.output_dir, num_frames=10)
+        stage = create_movie.build_stage(opts)
+        writer = movie.MovieWriter(
+            self.filename, stage.width, stage.height, stage.fps,
+            encoder=self.encoder, pix_fmt=stage.engine.pix_fmt,
+            )
+        create_movie.create_movie(stage, writer)
+        self.assertEqual(writer.returncode, 0)
+        data = self.read_output()
+        self.assertEqual(len(data), 10 * stage.width * stage.height * 4)
+        self.assertNotEqual(data.count(0), len(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
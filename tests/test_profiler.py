@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from profiler import Profiler
+from studio import Stage
+from engines import PyGameEngine
+from test_studio import create_incremental_scene
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_section(self):
+        profiler = Profiler()
+        for i in range(3):
+            with profiler.section('work', category='test'):
+                pass
+        stats = profiler.summary()['test']['work']
+        self.assertEqual(stats['calls'], 3)
+        self.assertGreaterEqual(stats['max'], stats['mean'])
+        self.assertEqual(len(profiler.events), 3)
+
+    def test_instrument(self):
+
+        class Counter:
+            total = 0
+
+            def add(self, value):
+                self.total += value
+                return self.total
+
+        profiler = Profiler()
+        counter = Counter()
+        profiler.instrument(counter, ['add', 'missing'])
+        self.assertEqual(counter.add(1), 1)
+        self.assertEqual(counter.add(2), 3)
+        self.assertEqual(profiler.summary()['Counter']['add']['calls'], 2)
+        self.assertEqual(Counter().add(5), 5)
+        self.assertEqual(profiler.summary()['Counter']['add']['calls'], 2)
+
+    def test_max_events(self):
+        profiler = Profiler(max_events=2)
+        for i in range(5):
+            profiler.call('test', 'abs', abs, -i)
+        self.assertEqual(len(profiler.events), 2)
+        self.assertEqual(profiler.dropped, 3)
+        self.assertEqual(profiler.summary()['test']['abs']['calls'], 5)
+
+
+class TestStageProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp(prefix='tmp_profile')
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def profile_scene(self, num_frames=30, **kwargs):
+        stage = create_incremental_scene(
+            PyGameEngine(pacing='uncapped', **kwargs),
+            )
+        stage.set_profiler(Profiler())
+        for frame in range(num_frames):
+            stage.draw(frame)
+        return stage.profiler
+
+    def test_stage_phases(self):
+        summary = self.profile_scene().summary()
+        for name in ('frame', 'clear', 'levels', 'draw on_stage', 'end'):
+            self.assertEqual(summary['stage'][name]['calls'], 30, name)
+        self.assertEqual(summary['PyGameEngine']['end']['calls'], 30)
+        self.assertIn('rect', summary['PyGameEngine'])
+        self.assertIn('Land', summary['actions'])
+        self.assertIn('FadeOut', summary['actions'])
+
+    def test_incremental_phases(self):
+        summary = self.profile_scene(incremental=True).summary()
+        self.assertIn('damage', summary['stage'])
+        self.assertIn('redraw', summary['stage'])
+
+    def test_save(self):
+        profiler = self.profile_scene(num_frames=5)
+        filename = os.path.join(self.output_dir, 'profile.json')
+        profiler.save(filename)
+        with open(filename) as f:
+            self.assertEqual(json.load(f)['stage']['frame']['calls'], 5)
+        profiler.save(filename, format='trace')
+        with open(filename) as f:
+            events = json.load(f)['traceEvents']
+        self.assertEqual(len(events), len(profiler.events))
+        self.assertEqual({event['ph'] for event in events}, {'X'})
+        with self.assertRaises(ValueError):
+            profiler.save(filename, format='xml')
+
+    def test_disabled_by_default(self):
+        stage = Stage(PyGameEngine(pacing='uncapped'))
+        self.assertIsNone(stage.profiler)
+        self.assertIsNone(stage.scheduler.profiler)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import unittest
+
+from spatial import UNBOUNDED, EMPTY, GridIndex, union, overlaps, centered
+
+
+class TestRects(unittest.TestCase):
+
+    def test_union(self):
+        self.assertEqual(
+            union((0, 0, 10, 10), (5, -5, 20, 5)), (0, -5, 20, 10),
+            )
+        self.assertEqual(union(EMPTY, (1, 2, 3, 4)), (1, 2, 3, 4))
+
+    def test_overlaps(self):
+        self.assertTrue(overlaps((0, 0, 10, 10), (5, 5, 20, 20)))
+        self.assertFalse(overlaps((0, 0, 10, 10), (10, 0, 20, 10)))
+        self.assertTrue(overlaps(UNBOUNDED, (0, 0, 1, 1)))
+        self.assertFalse(overlaps(EMPTY, (0, 0, 1, 1)))
+
+    def test_centered(self):
+        self.assertEqual(centered(10, 20, 6, 4), (7, 18, 13, 22))
+
+
+class TestGridIndex(unittest.TestCase):
+
+    def test_query(self):
+        index = GridIndex(1280, 720, cell_size=100)
+        index.insert('a', (10, 10, 50, 50))
+        index.insert('b', (150, 10, 350, 50))
+        index.insert('c', (600, 600, 700, 700))
+        self.assertEqual(index.query((0, 0, 100, 100)), {'a'})
+        self.assertEqual(index.query((0, 0, 200, 100)), {'a', 'b'})
+        self.assertEqual(index.query((320, 20, 330, 30)), {'b'})
+        self.assertEqual(index.query((900, 0, 1000, 100)), set())
+
+    def test_move_and_remove(self):
+        index = GridIndex(1280, 720, cell_size=100)
+        index.insert('a', (10, 10, 50, 50))
+        index.insert('a', (510, 10, 550, 50))
+        self.assertEqual(index.query((0, 0, 100, 100)), set())
+        self.assertEqual(index.query((500, 0, 600, 100)), {'a'})
+        index.remove('a')
+        self.assertNotIn('a', index)
+        self.assertEqual(index.cells, {})
+
+    def test_only_inside_the_area(self):
+        index = GridIndex(1280, 720, cell_size=100)
+        index.insert('a', UNBOUNDED)
+        index.insert('b', (-500, -500, -100, -100))
+        self.assertEqual(len(index.cells), 13 * 8)
+        self.assertEqual(index.query((0, 0, 1, 1)), {'a'})
+        self.assertEqual(len(index), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,22 +1,33 @@
 #!/usr/bin/env python3
 
+import tempfile
 import unittest
 import vectors
 from vectors import Vector
+import studio
 from studio import Stage
 from engines import SVGEngine, PyGameEngine
 from actors import Square, Star, Dice, Label, Bitmap
-from actions import Move, Land, Fall, Swing
+from actions import Move, Land, Fall, Swing, FadeOut, Exit, Colorize
+from actions import Background, Foreground
 from control import Scheduler
 import logs
 
 logger = logs.create(__name__)
 
 
+def create_svg_engine(test):
+    """SVGEngine que escribe en un directorio temporal del test.
+    """
+    output_dir = tempfile.TemporaryDirectory(prefix='tmp_test')
+    test.addCleanup(output_dir.cleanup)
+    return SVGEngine(output_dir=output_dir.name)
+
+
 class TestSVGEngine(unittest.TestCase):
 
     def test_create_frame(self):
-        s = Stage(SVGEngine(output_dir='./tmp'))
+        s = Stage(create_svg_engine(self))
         star = Star('star', color='red', pos=(0, 0))
         s.add_actor(star)
         s.add_actor(Square('bob'))
@@ -38,10 +49,10 @@ class TestSVGEngine(unittest.TestCase):
 class TestPyGameEngine(unittest.TestCase):
 
     def test_create(self):
-        Stage(PyGameEngine())
+        Stage(PyGameEngine(pacing='uncapped'))
 
     def test_create_sequence(self):
-        s = Stage(PyGameEngine())
+        s = Stage(PyGameEngine(pacing='uncapped'))
         s.num_frames = 100
         star = Star('star', color='gold', pos=(1280, 720), radius=20)
         s.add_actor(star)
@@ -65,12 +76,104 @@ class TestPyGameEngine(unittest.TestCase):
             sch.next()
 
 
+def create_incremental_scene(engine):
+    s = Stage(engine)
+    for i in range(10):
+        s.add_actor(Square('static{}'.format(i), pos=(100 + 100*i, 600)))
+    bob = Square('bob', pos=(0, 100))
+    s.add_actor(bob)
+    s.add_action(Land(bob, 5, 25, Vector(600, 300)))
+    label = Label('label', text='Hola', pos=(900, 200))
+    s.add_actor(label)
+    s.add_action(FadeOut(label, 10, 20))
+    s.add_action(Exit(label, 20, 21))
+    dice = Dice('D1', num=5, pos=(300, 400))
+    s.add_actor(dice)
+    s.add_action(Colorize(dice, 15, 30, 'red'))
+    ship = Star('ship', radius=30, pos=(-100, 500))
+    s.add_actor(ship)
+    s.add_action(Move(ship, 10, 30, Vector(200, 500)))
+    return s
+
+
+class TestIncremental(unittest.TestCase):
+
+    def test_same_pixels_as_full_redraw(self):
+        import pygame
+        full = create_incremental_scene(PyGameEngine(pacing='uncapped'))
+        screens = []
+        for frame in range(40):
+            full.draw(frame)
+            screens.append(pygame.image.tostring(full.engine.screen, 'RGB'))
+        incremental = create_incremental_scene(
+            PyGameEngine(incremental=True, pacing='uncapped'),
+            )
+        for frame in range(40):
+            incremental.draw(frame)
+            screen = pygame.image.tostring(incremental.engine.screen, 'RGB')
+            self.assertEqual(screen, screens[frame], frame)
+
+    def test_same_pixels_with_spatial_index(self):
+        min_actors = studio.INDEX_MIN_ACTORS
+        studio.INDEX_MIN_ACTORS = 0
+        try:
+            self.test_same_pixels_as_full_redraw()
+        finally:
+            studio.INDEX_MIN_ACTORS = min_actors
+
+    def test_only_changed_actors_are_dirty(self):
+        s = create_incremental_scene(
+            PyGameEngine(incremental=True, pacing='uncapped'),
+            )
+        for frame in range(6):
+            s.draw(frame)
+        dirty = [actor.name for actor in s.actors if actor.dirty]
+        self.assertEqual(dirty, ['bob'])
+
+
+class TestCulling(unittest.TestCase):
+
+    def create_stage(self):
+        s = Stage(PyGameEngine(pacing='uncapped'))
+        self.drawn = []
+        for name, pos in (
+                ('inside', (640, 360)),
+                ('border', (-20, 100)),
+                ('outside', (-200, 100)),
+                ('below', (640, 800)),
+                ):
+            actor = Square(name, pos=pos)
+            actor.draw = lambda engine, name=name: self.drawn.append(name)
+            s.add_actor(actor)
+        return s
+
+    def test_off_screen_actors_are_not_drawn(self):
+        s = self.create_stage()
+        s.draw(0)
+        self.assertEqual(self.drawn, ['inside', 'border'])
+
+    def test_without_culling(self):
+        s = self.create_stage()
+        s.culling = False
+        s.draw(0)
+        self.assertEqual(self.drawn, ['inside', 'border', 'outside', 'below'])
+
+    def test_actors_entering_the_screen(self):
+        s = self.create_stage()
+        s.add_action(Move(s.actors[2], 0, 10, Vector(100, 100)))
+        for frame in range(10):
+            s.draw(frame)
+        self.drawn = []
+        s.draw(10)
+        self.assertEqual(self.drawn, ['inside', 'border', 'outside'])
+
+
 class TestDices(unittest.TestCase):
 
     def test_sequence(self):
 
         sch = Scheduler()
-        s = Stage(PyGameEngine())
+        s = Stage(PyGameEngine(pacing='uncapped'))
         s.num_frames = 80
         middle = s.height // 2
         dice1 = Dice('D1', num=1)
@@ -131,5 +234,62 @@ class TestDices(unittest.TestCase):
             sch.next()
 
 
+class TestLevelBuckets(unittest.TestCase):
+
+    def create_stage(self):
+        s = Stage(create_svg_engine(self))
+        self.actors = [
+            Square('sq{}'.format(i), pos=(100 * i, 100)) for i in range(6)
+            ]
+        s.add_actors(*self.actors)
+        s.add_action(Background(self.actors[3], 2, 3))
+        s.add_action(Foreground(self.actors[0], 4, 5))
+        s.add_action(Exit(self.actors[1], 6, 7))
+        return s
+
+    def names(self, stage):
+        return [actor.name for actor in stage.get_visible_actors()]
+
+    def test_order_by_level(self):
+        s = self.create_stage()
+        for frame in range(8):
+            s.scheduler.next()
+        self.assertEqual(self.names(s), ['sq3', 'sq2', 'sq4', 'sq5', 'sq0'])
+
+    def test_buckets_only_change_with_levels(self):
+        s = self.create_stage()
+        buckets = s.get_level_buckets()
+        self.assertIs(s.get_level_buckets(), buckets)
+        s.scheduler.next()
+        s.scheduler.next()
+        self.assertIs(s.get_level_buckets(), buckets)
+        s.scheduler.next()  # Background en el frame 2
+        self.assertIsNot(s.get_level_buckets(), buckets)
+        self.assertEqual(self.names(s)[0], 'sq3')
+
+    def test_levels_of_other_stages_are_ignored(self):
+        s = self.create_stage()
+        buckets = s.get_level_buckets()
+        other = self.create_stage()
+        other.scheduler.next()
+        other.scheduler.next()
+        other.scheduler.next()  # Background en el frame 2
+        self.assertEqual(self.names(other)[0], 'sq3')
+        self.assertIs(s.get_level_buckets(), buckets)
+
+    def test_add_actor(self):
+        s = self.create_stage()
+        self.assertEqual(len(s.get_visible_actors()), 6)
+        s.add_actor(Square('new', pos=(50, 50)))
+        self.assertEqual(self.names(s)[-1], 'new')
+
+    def test_seek_back(self):
+        s = self.create_stage()
+        for frame in range(8):
+            s.draw(frame)
+        s.seek(0)
+        self.assertEqual(self.names(s), ['sq{}'.format(i) for i in range(6)])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -135,6 +135,26 @@ def test_access_by_index():
     assert v[1] == 4.0
 
 
+def test_nested_iteration():
+    v = Vector(3, 4)
+    pairs = [(a, b) for a in v for b in v]
+    assert pairs == [(3, 3), (3, 4), (4, 3), (4, 4)]
+
+
+def test_no_instance_dict():
+    v = Vector(3, 4)
+    with pytest.raises(AttributeError):
+        v.z = 5
+
+
+def test_copy_and_pickle():
+    import copy
+    import pickle
+    v = Vector(3, 4)
+    assert copy.copy(v) == v and copy.copy(v) is not v
+    assert pickle.loads(pickle.dumps(v)) == v
+
+
 if __name__ == '__main__':
     unittest.main()
 
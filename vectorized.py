@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# vectorized.py
+
+"""Evaluación vectorizada de la línea de tiempo.
+
+Compila las acciones de un `Scheduler` en arrays de NumPy (frames
+de inicio y fin, valores iniciales y finales, tipo de curva) para
+calcular la posición, transparencia y color de todos los actores
+en uno o varios frames con unas pocas operaciones sobre arrays.
+
+Las pistas que incluyen acciones sin equivalente vectorizado
+(`Blink`, `Timer`, acciones propias...) se evalúan con el código
+escalar de `control.evaluate_track`.
+
+Se activa con `Scheduler(vectorized=True)` (la opción --vectorized):
+`Scheduler.jump` lo usa entonces para calcular el estado del frame al
+que se salta, por ejemplo al empezar cada bloque de una exportación
+en paralelo.
+"""
+
+from copy import copy
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import actions
+from control import evaluate_track
+from vectors import Vector
+from colors import Color
+
+EASINGS = {
+    actions.Move: 0,
+    actions.Fall: 1,
+    actions.Land: 2,
+    actions.EaseIn: 3,
+    actions.EaseOut: 4,
+    actions.Swing: 5,
+    actions.Enter: 6,
+    }
+
+FADES = {
+    actions.FadeOut: 0,
+    actions.FadeIn: 1,
+    }
+
+
+def ease(kind, t):
+    """Versión vectorizada de `MoveAction.ease` para cada tipo de curva.
+    """
+    t2 = t * 2
+    swing = numpy.where(t2 < 1, t2**3 / 2, ((t2 - 2)**3 + 2) / 2)
+    return numpy.select(
+        [kind == 0, kind == 1, kind == 2, kind == 3, kind == 4, kind == 5],
+        [t, t**2, -t * (t-2), t**3, (t-1)**3 + 1, swing],
+        default=1.0,
+        )
+
+
+class Track:
+    """Conjunto de pistas (actor, propiedad) de un mismo tipo.
+
+    Las filas de los arrays son las acciones, agrupadas por pista y,
+    dentro de cada pista, en el orden en que empiezan.
+    """
+
+    def __init__(self, keys, tracks, bases):
+        self.keys = keys
+        rows = [action for track in tracks for action in track]
+        self.rows = rows
+        self.size = len(rows)
+        self.group_starts = numpy.cumsum(
+            [0] + [len(track) for track in tracks[:-1]]
+            )
+        self.lower = numpy.array([a.lower_bound for a in rows], dtype=float)
+        self.upper = numpy.array([a.upper_bound for a in rows], dtype=float)
+        self.num_steps = self.upper - self.lower
+        self.order = numpy.arange(self.size)
+        self.max_frame = (self.upper.max() + 1) if rows else 0
+        self.bases = bases
+
+    def select(self, frames):
+        """Fila que fija el valor de cada pista en cada frame.
+
+        Sigue las mismas reglas que `control.evaluate_track`: la
+        última acción en curso en el frame o, si no hay ninguna, la
+        última de las que terminaron más tarde. Devuelve la fila
+        elegida (-1 si ninguna) y si hay que interpolar o usar el
+        valor final, con forma (frames, pistas).
+        """
+        f = frames[:, numpy.newaxis]
+        n = self.size
+        writing = (self.lower <= f) & (f <= self.upper)
+        ended = self.upper < f
+        offset = (self.max_frame + 1) * n
+        key = numpy.where(
+            writing,
+            offset + self.order,
+            numpy.where(ended, self.upper * n + self.order, -1),
+            )
+        key = numpy.maximum.reduceat(key, self.group_starts, axis=1)
+        in_course = key >= offset
+        row = numpy.where(
+            in_course,
+            key - offset,
+            numpy.where(key >= 0, key % n, -1),
+            ).astype(int)
+        # En su último frame la acción fija el valor final
+        in_course &= f < self.upper[row]
+        return row, in_course
+
+    def relative_time(self, frames):
+        f = frames[:, numpy.newaxis]
+        return (f - self.lower + 1) / self.num_steps
+
+
+class PositionTrack(Track):
+
+    def __init__(self, keys, tracks, bases, initials):
+        super().__init__(keys, tracks, bases)
+        self.kind = numpy.array([EASINGS[type(a)] for a in self.rows])
+        self.initial = numpy.array(
+            [(initials[a].x, initials[a].y) for a in self.rows],
+            dtype=float,
+            ).reshape(-1, 2)
+        self.target = numpy.array(
+            [(a.new_position.x, a.new_position.y) for a in self.rows],
+            dtype=float,
+            ).reshape(-1, 2)
+        self.base = numpy.array(
+            [(b.x, b.y) for b in bases], dtype=float,
+            ).reshape(-1, 2)
+
+    def evaluate(self, frames):
+        row, in_course = self.select(frames)
+        k = ease(self.kind, self.relative_time(frames))
+        change = self.target - self.initial
+        values = change[numpy.newaxis] * k[..., numpy.newaxis] \
+            + self.initial[numpy.newaxis]
+        picked = numpy.take_along_axis(
+            values, numpy.maximum(row, 0)[..., numpy.newaxis], axis=1,
+            )
+        final = self.target[numpy.maximum(row, 0)]
+        result = numpy.where(in_course[..., numpy.newaxis], picked, final)
+        return numpy.where(
+            (row >= 0)[..., numpy.newaxis],
+            result,
+            self.base[numpy.newaxis],
+            )
+
+
+class AlphaTrack(Track):
+
+    def __init__(self, keys, tracks, bases, initials):
+        super().__init__(keys, tracks, bases)
+        self.kind = numpy.array([FADES[type(a)] for a in self.rows])
+        self.initial = numpy.array(
+            [initials[a] for a in self.rows], dtype=float,
+            )
+        self.target = self.kind.astype(float)  # FadeOut: 0, FadeIn: 1
+        self.base = numpy.array(bases, dtype=float)
+
+    def evaluate(self, frames):
+        row, in_course = self.select(frames)
+        t = self.relative_time(frames)
+        values = numpy.where(
+            self.kind == 1,
+            numpy.minimum(self.initial + t, 1.0),
+            self.initial * (1.0 - t),
+            )
+        picked = numpy.take_along_axis(values, numpy.maximum(row, 0), axis=1)
+        final = self.target[numpy.maximum(row, 0)]
+        result = numpy.where(in_course, picked, final)
+        return numpy.where(row >= 0, result, self.base)
+
+
+class ColorTrack(Track):
+
+    def __init__(self, keys, tracks, bases, initials):
+        super().__init__(keys, tracks, bases)
+        self.initial = numpy.array(
+            [initials[a].as_rgb() for a in self.rows], dtype=float,
+            ).reshape(-1, 3)
+        self.target = numpy.array(
+            [a.new_color.as_rgb() for a in self.rows], dtype=float,
+            ).reshape(-1, 3)
+        self.base = numpy.array(
+            [b.as_rgb() for b in bases], dtype=float,
+            ).reshape(-1, 3)
+
+    def evaluate(self, frames):
+        row, in_course = self.select(frames)
+        f = frames[:, numpy.newaxis]
+        relative_frame = (f - self.lower + 1)[..., numpy.newaxis]
+        delta = (self.target - self.initial)[numpy.newaxis]
+        values = self.initial[numpy.newaxis] + numpy.round(
+            delta * relative_frame / self.num_steps[:, numpy.newaxis]
+            )
+        picked = numpy.take_along_axis(
+            values, numpy.maximum(row, 0)[..., numpy.newaxis], axis=1,
+            )
+        final = self.target[numpy.maximum(row, 0)]
+        result = numpy.where(in_course[..., numpy.newaxis], picked, final)
+        return numpy.where(
+            (row >= 0)[..., numpy.newaxis],
+            result,
+            self.base[numpy.newaxis],
+            ).astype(int)
+
+
+class VectorizedTimeline:
+    """Evaluador de la línea de tiempo de un `Scheduler` con NumPy.
+
+    Necesita que el paquete `numpy` esté instalado.
+    """
+
+    def __init__(self, scheduler):
+        if numpy is None:
+            raise ImportError(
+                'La evaluación vectorizada necesita el paquete numpy'
+                )
+        self.scheduler = scheduler
+        if scheduler.tracks is None:
+            scheduler.compile()
+        groups = {'pos': [], 'alpha': [], 'color': []}
+        self.fallback = []
+        for (actor, attribute), track in scheduler.tracks.items():
+            if self.is_supported(attribute, track):
+                groups[attribute].append((actor, track))
+            else:
+                self.fallback.append((actor, attribute, track))
+        self.pos = self.build(PositionTrack, 'pos', groups['pos'])
+        self.alpha = self.build(AlphaTrack, 'alpha', groups['alpha'])
+        self.color = self.build(ColorTrack, 'color', groups['color'])
+
+    def is_supported(self, attribute, track):
+        supported = {
+            'pos': EASINGS,
+            'alpha': FADES,
+            'color': (actions.Colorize,),
+            }.get(attribute, ())
+        return all(type(action) in supported for action in track)
+
+    def build(self, Klass, attribute, group):
+        if not group:
+            return None
+        return Klass(
+            [actor for actor, track in group],
+            [track for actor, track in group],
+            [actor.initial_state[attribute] for actor, track in group],
+            self.scheduler.initials,
+            )
+
+    def evaluate(self, frames):
+        """Valores de posición, transparencia y color en los frames.
+
+        Devuelve un diccionario con una entrada por propiedad:
+        la lista de actores y un array con la forma (frames, actores)
+        o (frames, actores, componentes).
+        """
+        frames = numpy.atleast_1d(numpy.asarray(frames, dtype=float))
+        result = {}
+        for attribute, track in (
+                ('pos', self.pos),
+                ('alpha', self.alpha),
+                ('color', self.color),
+                ):
+            if track:
+                result[attribute] = (track.keys, track.evaluate(frames))
+        return result
+
+    def state_at(self, frame):
+        """Equivalente a `Scheduler.state_at`, con la misma estructura.
+        """
+        result = {}
+        for attribute, (keys, values) in self.evaluate(frame).items():
+            for actor, value in zip(keys, values[0]):
+                if attribute == 'pos':
+                    value = Vector(value[0], value[1])
+                elif attribute == 'color':
+                    value = Color(*(int(_) for _ in value))
+                else:
+                    value = float(value)
+                result.setdefault(actor, {})[attribute] = value
+        initials = self.scheduler.initials
+        for actor, attribute, track in self.fallback:
+            base = actor.initial_state[attribute]
+            value = evaluate_track(track, initials, base, frame)
+            result.setdefault(actor, {})[attribute] = copy(value)
+        for actor, track in self.scheduler.level_tracks.items():
+            level = actor.initial_state['level']
+            for action in track:
+                if action.lower_bound <= frame:
+                    level = action.target_level
+            result.setdefault(actor, {})['level'] = level
+        return result
+
+    def apply(self, frame):
+        for actor, state in self.state_at(frame).items():
+            for attribute in state:
+                setattr(actor, attribute, state[attribute])
@@ -16,21 +16,28 @@ MSG_VECTOR_ARGS_WRONG = (
 
 
 class Vector(object):
+    """Vector (o punto) en el plano.
+
+    Usa `__slots__` para no crear un diccionario por instancia: se crean
+    miles de vectores por frame al mover y dibujar los actores.
+    """
+
+    __slots__ = ('x', 'y')
 
     def __init__(self, *args):
         argc = len(args)
-        if argc == 0:
+        if argc == 2:
+            self.x, self.y = float(args[0]), float(args[1])
+        elif argc == 0:
             self.x = self.y = 0
         elif argc == 1:
             arg = args[0]
             if isinstance(arg, tuple):
                 self.x, self.y = arg
-            elif isinstance(arg, self.__class__):
+            elif isinstance(arg, Vector):
                 self.x, self.y = arg.x, arg.y
             else:
                 raise ValueError(MSG_VECTOR_ARGS_WRONG.format(arg))
-        elif argc == 2:
-            self.x, self.y = float(args[0]), float(args[1])
         else:
             raise ValueError(MSG_VECTOR_ARGS_WRONG.format(args))
 
@@ -70,26 +77,25 @@ class Vector(object):
 
     def __add__(self, op2):
         if isinstance(op2, tuple):
-            op2 = Vector(op2[0], op2[1])
-        return Vector(self.x + op2.x, self.y + op2.y)
+            return _new(self.x + op2[0], self.y + op2[1])
+        return _new(self.x + op2.x, self.y + op2.y)
 
     def __sub__(self, op2):
         if isinstance(op2, tuple):
-            op2 = Vector(op2[0], op2[1])
-        return Vector(self.x - op2.x, self.y - op2.y)
-
+            return _new(self.x - op2[0], self.y - op2[1])
+        return _new(self.x - op2.x, self.y - op2.y)
 
     def __mul__(self, op2):
-        return Vector(self.x * op2, self.y * op2)
+        return _new(self.x * op2, self.y * op2)
 
     def __truediv__(self, op2):
-        return Vector(self.x / op2, self.y / op2)
+        return _new(self.x / op2, self.y / op2)
 
     def __div__(self, op2): # Python 2 campatibility
         return type(self).__truediv__(self, op2) 
 
     def __floordiv__(self, op2):
-        return Vector(self.x // op2, self.y // op2)
+        return _new(self.x // op2, self.y // op2)
 
     def __eq__(self, op2):
         if isinstance(op2, tuple):
@@ -101,18 +107,8 @@ class Vector(object):
            and round(self.y, 6) == round(y, 6)
 
     def __iter__(self):
-        self._index = 0
-        return self
-
-    def __next__(self):
-        if self._index == 0:
-            self._index = 1
-            return int(round(self.x))
-        elif self._index == 1:
-            self._index = 2
-            return int(round(self.y))
-        else:
-            raise StopIteration
+        yield int(round(self.x))
+        yield int(round(self.y))
 
     def __getitem__(self, index):
         if index == 0:
@@ -126,8 +122,25 @@ class Vector(object):
         return 2
 
     def __copy__(self):
-        return Vector(self.x, self.y)
+        return _new(self.x, self.y)
+
+    def __getstate__(self):
+        return (self.x, self.y)
+
+    def __setstate__(self, state):
+        self.x, self.y = state
+
+
+def _new(x, y):
+    """Crea un vector sin pasar por la comprobación de argumentos.
+    """
+    v = _alloc(Vector)
+    v.x = float(x)
+    v.y = float(y)
+    return v
+
 
+_alloc = object.__new__
 
 
 def get_random_position_vector(width=100, height=100):
@@ -140,6 +153,7 @@ def get_random_unitary_vector():
     angle = random.uniform(0, 2* pi)
     return Vector(cos(angle), sin(angle))
 
+# Compartidos: no modificarlos ni usarlos como valores por defecto
 zero = origin = Vector(0, 0)
 up = Vector(0, -1)
 down = Vector(0, 1)